@@ -0,0 +1,179 @@
+import argparse  # Import argparse for the command line options
+import multiprocessing  # Import multiprocessing to run the clients in their own processes
+import os  # Import os for the path of the socket
+import random  # Import random to generate the messages and pick the keys
+import signal  # Import signal to stop the daemon
+import string  # Import string for the letters
+import subprocess  # Import subprocess to run the daemon and the short lived workers
+import sys  # Import sys for the Python interpreter
+import tempfile  # Import tempfile for the directory of the socket
+import time  # Import time to measure the latencies
+
+from common import percentile
+
+from classical_ciphers import get_cipher
+from classical_ciphers.daemon import CipherClient
+
+LETTERS = string.ascii_uppercase.replace("J", "")  # the letters of the messages (the Playfair matrix has no J)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # the directory of the package
+
+
+def generate_key(rng: random.Random, cipher: str):
+    """
+    Generates a random key of a cipher.
+
+    Args:
+    -   rng (random.Random): The random generator.
+    -   cipher (str): The name of the cipher.
+
+    Returns:
+    -   The key.
+    """
+
+    if cipher == "hill":
+        while True:  # a key matrix that can be inverted modulo 26
+            key = "".join(rng.choice(LETTERS) for _ in range(9))
+
+            try:
+                get_cipher("hill", key).decrypt("AAA")
+                return key
+            except ValueError:
+                continue
+
+    if cipher == "affine":
+        return (rng.choice((1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25)), rng.randrange(26))
+
+    if cipher in ("additive", "rail_fence"):
+        return rng.randrange(2, 26)
+
+    if cipher == "atbash":
+        return None
+
+    return "".join(rng.choice(LETTERS) for _ in range(8))
+
+
+def run_client(task: tuple):
+    """
+    Sends requests to the daemon one at a time, like a worker process, and checks every result.
+
+    Args:
+    -   task (tuple): The socket path, cipher, keys, number of requests, message size, large size, the
+        number of requests between two large ones, and the seed.
+
+    Returns:
+    -   tuple: The latencies of the small and of the large requests, and the start and end times, in seconds.
+    """
+
+    path, cipher, keys, requests, size, large_size, large_every, seed = task
+    rng = random.Random(seed)
+    small, large = [], []
+
+    with CipherClient(path) as client:
+        started = time.perf_counter()  # the clock is shared by the processes, and excludes their start up
+
+        for index in range(requests):
+            is_large = large_every and index % large_every == large_every - 1
+            length = large_size if is_large else size
+            message = "".join(rng.choices(LETTERS, k=length - length % 6 or 6))
+            key = rng.choice(keys)
+
+            start = time.perf_counter()
+            result = client.encrypt(cipher, key, message)
+            (large if is_large else small).append(time.perf_counter() - start)
+
+            if index % 50 == 0 and result != get_cipher(cipher, key).encrypt(message):
+                raise AssertionError(f"the daemon returned a wrong result for key {key!r}")
+
+    return small, large, started, time.perf_counter()
+
+
+def time_cold_worker(cipher: str, key, runs: int):
+    """
+    Measures a short lived worker process that imports the package, compiles the key and encrypts once.
+
+    Args:
+    -   cipher (str): The name of the cipher.
+    -   key: The key.
+    -   runs (int): The number of workers started.
+
+    Returns:
+    -   float: The fastest time of a worker, in seconds.
+    """
+
+    code = f"from classical_ciphers import get_cipher; get_cipher({cipher!r}, {key!r}).encrypt('ACTACT')"
+    best = float("inf")
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load tests the cipher daemon with many client processes, each sending small requests one "
+        "at a time, and compares it with starting a worker process per request."
+    )
+    parser.add_argument("--cipher", default="hill", help="the cipher (default hill)")
+    parser.add_argument("--clients", type=int, default=8, help="the number of client processes")
+    parser.add_argument("--requests", type=int, default=500, help="the number of requests of each client")
+    parser.add_argument("--keys", type=int, default=4, help="the number of distinct keys shared by the clients")
+    parser.add_argument("--size", type=int, default=96, help="the letters of a small request")
+    parser.add_argument("--large-size", type=int, default=4 << 20, help="the letters of a large request (shared memory)")
+    parser.add_argument("--large-every", type=int, default=0, help="send a large request every N requests (0 for none)")
+    parser.add_argument("--batch-window", default="0.5", help="the batch window of the daemon, in milliseconds")
+    parser.add_argument("--cold-runs", type=int, default=3, help="the number of short lived workers timed")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    keys = [generate_key(rng, args.cipher) for _ in range(args.keys)]
+    path = os.path.join(tempfile.mkdtemp(), "ciphers.sock")
+
+    daemon = subprocess.Popen(
+        [sys.executable, "-m", "classical_ciphers", "daemon", path, "--batch-window", args.batch_window],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    try:
+        while not os.path.exists(path):
+            if daemon.poll() is not None:
+                raise SystemExit(daemon.stderr.read())
+
+            time.sleep(0.01)
+
+        tasks = [
+            (path, args.cipher, keys, args.requests, args.size, args.large_size, args.large_every, seed)
+            for seed in range(args.clients)
+        ]
+
+        with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+            results = pool.map(run_client, tasks)
+    finally:
+        daemon.send_signal(signal.SIGINT)
+        statistics = daemon.communicate(timeout=10)[1].strip().splitlines()[-1]
+
+    small = [latency for result in results for latency in result[0]]
+    large = [latency for result in results for latency in result[1]]
+    total = len(small) + len(large)
+    elapsed = max(result[3] for result in results) - min(result[2] for result in results)
+
+    print(f"{args.clients} clients, {total:,} {args.cipher} requests in {elapsed:.2f}s ({total / elapsed:,.0f} requests/s)")
+    print(f"small requests  p50 {percentile(small, 50) * 1e3:8.3f} ms  p99 {percentile(small, 99) * 1e3:8.3f} ms")
+
+    if large:
+        print(f"large requests  p50 {percentile(large, 50) * 1e3:8.3f} ms  ({len(large)} of {args.large_size:,} letters)")
+
+    print(f"daemon: {statistics}")
+
+    if args.cold_runs:
+        cold = time_cold_worker(args.cipher, keys[0], args.cold_runs)
+        print(f"short lived worker per request (interpreter, import, key setup): {cold * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
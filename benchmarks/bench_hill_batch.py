@@ -0,0 +1,50 @@
+import argparse  # Import argparse for the command line options
+import random  # Import random to generate the records
+import string  # Import string for the letters
+
+from common import best_time
+
+from classical_ciphers import hill
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares hill_encrypt_batch() with one hill_encrypt() call per record."
+    )
+    parser.add_argument("--records", type=int, default=100000, help="number of records")
+    parser.add_argument("--length", type=int, default=24, help="letters per record")
+    parser.add_argument("--key", default="GYBNQKURP", help="the Hill key text")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs")
+    args = parser.parse_args()
+
+    # Round the record length down to a multiple of the matrix size
+    matrix_size = hill.compile_hill_cipher(args.key).matrix_size
+    length = args.length - args.length % matrix_size
+
+    rng = random.Random(0)
+    records = [
+        "".join(rng.choice(string.ascii_uppercase) for _ in range(length))
+        for _ in range(args.records)
+    ]
+
+    # Both paths must give the same cipher texts
+    assert hill.hill_encrypt_batch(args.key, records[:1000]) == [
+        hill.hill_encrypt(args.key, record)[0] for record in records[:1000]
+    ]
+
+    per_call = best_time(
+        lambda: [hill.hill_encrypt(args.key, record)[0] for record in records],
+        args.repeat,
+    )
+    batched = best_time(lambda: hill.hill_encrypt_batch(args.key, records), args.repeat)
+
+    megabytes = args.records * length / 1e6
+
+    print(f"records: {args.records} x {length} letters, key size {matrix_size}x{matrix_size}")
+    print(f"per call: {per_call:.3f} s  {args.records / per_call:12,.0f} records/s  {megabytes / per_call:8.2f} MB/s")
+    print(f"batched:  {batched:.3f} s  {args.records / batched:12,.0f} records/s  {megabytes / batched:8.2f} MB/s")
+    print(f"speedup:  {per_call / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse  # Import argparse for the command line options
+import json  # Import json to read the results of the child process
+import subprocess  # Import subprocess to import the package in a fresh interpreter
+import sys  # Import sys to run the same interpreter
+
+from common import REPO_DIR
+
+# Imports the package in a fresh interpreter, uses the ciphers that do not need NumPy on short texts
+# and reports the import time and whether NumPy was loaded
+CHILD_CODE = """
+import json, sys, time
+
+start = time.perf_counter()
+import classical_ciphers
+import_time = time.perf_counter() - start
+
+numpy_after_import = "numpy" in sys.modules
+
+classical_ciphers.get_cipher("atbash").encrypt("Hello World")
+classical_ciphers.get_cipher("additive", 3).encrypt("Hello World")
+classical_ciphers.get_cipher("affine", (5, 8)).encrypt("Hello World")
+classical_ciphers.get_cipher("vigenere", "KEY").encrypt("Hello World")
+classical_ciphers.get_cipher("playfair", "KEY").encrypt("HelloWorld")
+classical_ciphers.get_cipher("rail_fence", 3).encrypt("Hello World")
+
+print(json.dumps({
+    "import_time": import_time,
+    "numpy_after_import": numpy_after_import,
+    "numpy_after_short_texts": "numpy" in sys.modules,
+}))
+"""
+
+
+def measure_import():
+    """
+    Imports the package in a fresh interpreter.
+
+    Returns:
+    -   dict: The import time in seconds and whether NumPy was loaded after the import and after the short texts.
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        cwd=REPO_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Checks that importing classical_ciphers is cheap and does not load NumPy."
+    )
+    parser.add_argument(
+        "--budget", type=float, default=20.0, help="import time budget in milliseconds"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of fresh interpreters"
+    )
+    args = parser.parse_args()
+
+    results = [measure_import() for _ in range(args.repeat)]
+    import_time = min(result["import_time"] for result in results) * 1000
+
+    print(f"import classical_ciphers: {import_time:.2f} ms (budget {args.budget:.2f} ms)")
+
+    failures = []
+
+    if import_time > args.budget:
+        failures.append("the import time is over the budget")
+
+    if any(result["numpy_after_import"] for result in results):
+        failures.append("NumPy was loaded by the import")
+
+    if any(result["numpy_after_short_texts"] for result in results):
+        failures.append("NumPy was loaded by the ciphers on short texts")
+
+    for failure in failures:
+        print("FAIL:", failure)
+
+    # Exit with a non zero status so the check can be used in scripts
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse  # Import argparse for the command line options
+import time  # Import time to measure the calls
+
+import common  # noqa: F401, makes the classical_ciphers package importable
+
+from classical_ciphers import additive, hill, vigenere
+from classical_ciphers.metrics import disable_metrics, enable_metrics, metrics_snapshot
+
+# The calls measured, with short texts so the fixed cost of a call dominates
+CALLS = {
+    "additive_encrypt/64": lambda: additive.additive_encrypt("Attack at dawn, hold the line! " * 2 + "ab", 7),
+    "vigenere_encrypt/64": lambda: vigenere.vigenere_encrypt("Attack at dawn, hold the line! " * 2 + "ab", "LEMON"),
+    "hill_encrypt/63": lambda: hill.hill_encrypt("GYBNQKURP", "ACT" * 21),
+}
+
+
+def time_per_call(function, calls: int, repeat: int):
+    """
+    Measures the fastest time of a call, over a number of timed loops.
+
+    Args:
+    -   function (function): Called without arguments.
+    -   calls (int): The number of calls in each loop.
+    -   repeat (int): The number of loops.
+
+    Returns:
+    -   float: The fastest time of a call, in nanoseconds.
+    """
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+
+        for _ in range(calls):
+            function()
+
+        best = min(best, (time.perf_counter_ns() - start) / calls)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures the overhead of the metrics on short calls: never enabled, enabled, and disabled again."
+    )
+    parser.add_argument("--calls", type=int, default=20000, help="the number of calls in each timed loop")
+    parser.add_argument("--repeat", type=int, default=7, help="the number of timed loops")
+    args = parser.parse_args()
+
+    print(f"{'call':24s} {'original ns':>12s} {'enabled ns':>12s} {'disabled ns':>12s} {'enabled':>9s} {'disabled':>9s}")
+
+    original_functions = [additive.additive_encrypt, vigenere.vigenere_encrypt, hill.hill_encrypt]
+
+    for name, function in CALLS.items():
+        original = time_per_call(function, args.calls, args.repeat)
+
+        enable_metrics()
+        enabled = time_per_call(function, args.calls, args.repeat)
+        disable_metrics()
+
+        disabled = time_per_call(function, args.calls, args.repeat)
+
+        print(
+            f"{name:24s} {original:12.0f} {enabled:12.0f} {disabled:12.0f} "
+            f"{enabled / original - 1:+9.1%} {disabled / original - 1:+9.1%}"
+        )
+
+    # Disabled metrics leave the original functions in place, so the disabled column only differs by noise
+    restored = original_functions == [additive.additive_encrypt, vigenere.vigenere_encrypt, hill.hill_encrypt]
+    recorded = sum(call["calls"] for call in metrics_snapshot()["calls"])
+    print(f"recorded calls: {recorded:,}, original functions restored: {restored}")
+
+
+if __name__ == "__main__":
+    main()
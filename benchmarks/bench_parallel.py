@@ -0,0 +1,71 @@
+import argparse  # Import argparse for the command line options
+import os  # Import os to find the number of cores
+import random  # Import random to generate the text
+import string  # Import string for the letters
+
+from common import best_time
+
+from classical_ciphers import get_cipher
+from classical_ciphers.parallel import DEFAULT_SHARD_SIZE, parallel_encrypt
+
+# The key of each cipher used by the benchmark
+KEYS = {
+    "additive": 7,
+    "affine": (5, 8),
+    "atbash": None,
+    "vigenere": "LEMON",
+    "hill": "GYBNQKURP",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures how the throughput of parallel_encrypt() scales with the number of workers."
+    )
+    parser.add_argument("--cipher", default="vigenere", choices=sorted(KEYS), help="the cipher")
+    parser.add_argument("--size", type=int, default=64, help="size of the text in MB")
+    parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="number of bytes in each shard"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+        help="the worker counts to measure",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs")
+    args = parser.parse_args()
+
+    key = KEYS[args.cipher]
+    rng = random.Random(0)
+
+    # Repeat a random block of letters and spaces (letters only for Hill) up to the size
+    letters = string.ascii_letters if args.cipher == "hill" else string.ascii_letters + "  "
+    block = "".join(rng.choice(letters) for _ in range(1 << 16)).encode("ascii")
+    data = (block * (args.size * 10**6 // len(block) + 1))[: args.size * 10**6]
+    data = data[: len(data) - len(data) % 36]  # a multiple of every small Hill matrix size
+
+    # The sharded output must be the same as the output of the compiled cipher
+    sample = data[: 36 << 15]
+    assert parallel_encrypt(args.cipher, key, sample, 1 << 16, max(args.workers)) == get_cipher(
+        args.cipher, key
+    ).encrypt(sample.decode("ascii")).encode("ascii")
+
+    print(f"cipher: {args.cipher}, {len(data) / 1e6:.0f} MB, shards of {args.shard_size:,} bytes, {os.cpu_count()} cores")
+
+    single = None  # the time of a single worker
+
+    for workers in args.workers:
+        elapsed = best_time(
+            lambda: parallel_encrypt(args.cipher, key, data, args.shard_size, workers), args.repeat
+        )
+        single = single or elapsed
+
+        print(
+            f"workers: {workers:3d}  {elapsed:.3f} s  {len(data) / 1e6 / elapsed:8.1f} MB/s  speedup {single / elapsed:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse  # Import argparse for the command line options
+import random  # Import random to generate the text
+
+from common import best_time
+
+from classical_ciphers import playfair
+
+
+def quadratic_initialize_text(text: str):
+    """
+    The previous version of initialize_text(), which rebuilds the text for every filler character.
+    It is kept here as the baseline of the benchmark.
+
+    Args:
+    -   text (str): The plain text to be encrypted.
+
+    Returns:
+    -   list: A list of pairs of two characters representing the initialized plain text.
+    """
+
+    text = text.upper()
+
+    for i in range(len(text)):
+        if i % 2 == 0:
+            char_1 = text[i]
+        if i % 2 == 1:
+            char_2 = text[i]
+
+            if char_1 == char_2:
+                text = text[:i] + "X" + text[i:]
+
+    if len(text) % 2 == 1:
+        text += "X"
+
+    return [text[i : i + 2] for i in range(0, len(text), 2)]
+
+
+def generate_text(size: int):
+    """
+    Generates letters with doubled letters about as often as in English text.
+
+    Args:
+    -   size (int): The number of characters.
+
+    Returns:
+    -   str: The generated text.
+    """
+
+    rng = random.Random(0)
+    words = ["BALLOON", "COFFEE", "LETTER", "ACCESS", "PLAYFAIR", "MATRIX", "CIPHER", "KEYWORD", "THE", "ATTACK"]
+    text = []
+    length = 0
+
+    while length < size:
+        word = rng.choice(words)
+        text.append(word)
+        length += len(word)
+
+    return "".join(text)[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares the single pass initialize_text() with the previous quadratic version."
+    )
+    parser.add_argument(
+        "--size", type=float, default=10, help="input size in MB for the single pass version"
+    )
+    parser.add_argument(
+        "--baseline-size",
+        type=float,
+        default=1,
+        help="input size in MB for the quadratic version (10 MB takes over ten minutes)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="number of timed runs")
+    args = parser.parse_args()
+
+    size = int(args.size * 1e6)
+    baseline_size = int(args.baseline_size * 1e6)
+    text = generate_text(max(size, baseline_size))
+
+    # Both versions must give the same pairs
+    sample = text[:200000]
+    assert playfair.initialize_text(sample) == quadratic_initialize_text(sample)
+
+    single_pass = best_time(lambda: playfair.initialize_text(text[:size]), args.repeat)
+    quadratic = best_time(lambda: quadratic_initialize_text(text[:baseline_size]), args.repeat)
+
+    print(f"single pass: {size / 1e6:6.2f} MB in {single_pass:8.3f} s  {size / 1e6 / single_pass:8.2f} MB/s")
+    print(f"quadratic:   {baseline_size / 1e6:6.2f} MB in {quadratic:8.3f} s  {baseline_size / 1e6 / quadratic:8.2f} MB/s")
+
+    if size == baseline_size:
+        print(f"speedup:     {quadratic / single_pass:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
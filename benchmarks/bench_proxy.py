@@ -0,0 +1,192 @@
+import argparse  # Import argparse for the command line options
+import asyncio  # Import asyncio for the echo server, the proxy and the clients
+import multiprocessing  # Import multiprocessing to start the worker processes without forking the event loop
+import random  # Import random to generate the messages
+import string  # Import string for the letters
+import time  # Import time to measure the latencies
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # Import the executors of the long lines
+
+from common import percentile
+
+from classical_ciphers import get_cipher
+from classical_ciphers.aio import MAX_LINE_LENGTH, OFFLOAD_THRESHOLD, start_proxy
+
+# The key of each cipher used by the benchmark
+KEYS = {
+    "additive": 7,
+    "affine": (5, 8),
+    "atbash": None,
+    "vigenere": "LEMON",
+    "hill": "GYBNQKURP",
+    "playfair": "PLAYFAIREXAMPLE",
+    "rail_fence": 3,
+}
+
+LETTERS = string.ascii_uppercase.replace("J", "")  # the letters of the messages
+
+
+async def handle_echo(reader, writer):
+    """
+    Sends every line back to the client, until the client closes its write end.
+    """
+
+    while True:
+        line = await reader.readline()
+
+        if not line:
+            break
+
+        writer.write(line)
+        await writer.drain()
+
+    writer.close()
+
+
+def generate_message(rng: random.Random, size: int):
+    """
+    Generates a message of random letters, a multiple of 6 letters long so every Hill key used here fits.
+    There is no J, which the Playfair matrix does not have.
+
+    Args:
+    -   rng (random.Random): The random generator.
+    -   size (int): The approximate number of letters.
+
+    Returns:
+    -   str: The message.
+    """
+
+    return "".join(rng.choice(LETTERS) for _ in range(max(size - size % 6, 6)))
+
+
+async def run_connection(address, messages: list, expected: list, latencies: list):
+    """
+    Sends each message through the proxy, waits for its echo and records the round trip time.
+    """
+
+    reader, writer = await asyncio.open_connection(*address, limit=MAX_LINE_LENGTH)
+
+    for message, reply in zip(messages, expected):
+        start = time.perf_counter()
+        writer.write(message.encode("ascii") + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+        latencies.append(time.perf_counter() - start)
+
+        # The echo was encrypted and decrypted again by the proxy
+        assert line == reply.encode("ascii") + b"\n", "the proxy returned a different message"
+
+    writer.write_eof()
+    await reader.read()
+    writer.close()
+
+
+async def run_load(args, executor):
+    """
+    Starts the echo server and the proxy, and runs the client connections with a bounded concurrency.
+
+    Returns:
+    -   tuple: The wall time, the latencies of the small messages and the latencies of the large ones.
+    """
+
+    key = KEYS[args.cipher]
+    cipher = get_cipher(args.cipher, key)
+    rng = random.Random(0)
+
+    echo_server = await asyncio.start_server(handle_echo, "127.0.0.1", 0, limit=MAX_LINE_LENGTH)
+    proxy_server = await start_proxy(
+        args.cipher,
+        key,
+        *echo_server.sockets[0].getsockname()[:2],
+        offload_threshold=args.offload_threshold,
+        executor=executor,
+    )
+    address = proxy_server.sockets[0].getsockname()[:2]
+
+    # A few distinct messages are enough, and their expected echoes are computed before the clock starts
+    small_messages = [generate_message(rng, args.message_size) for _ in range(16)]
+    large_message = generate_message(rng, args.large_size)
+    expected = {
+        message: cipher.decrypt(cipher.encrypt(message)) for message in small_messages + [large_message]
+    }
+
+    small_latencies, large_latencies = [], []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def client(index: int):
+        async with semaphore:
+            messages = [small_messages[(index + i) % len(small_messages)] for i in range(args.messages)]
+
+            # Every large_every-th connection sends a large message first, which used to stall the others
+            if args.large_every and index % args.large_every == 0:
+                await run_connection(address, [large_message], [expected[large_message]], large_latencies)
+
+            await run_connection(address, messages, [expected[message] for message in messages], small_latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    for server in (proxy_server, echo_server):
+        server.close()
+        await server.wait_closed()
+
+    return elapsed, small_latencies, large_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load tests the asyncio cipher proxy against a local echo server, reporting the connections "
+        "per second and the round trip latency percentiles."
+    )
+    parser.add_argument("--cipher", default="vigenere", choices=sorted(KEYS), help="the cipher")
+    parser.add_argument("--connections", type=int, default=500, help="the total number of connections")
+    parser.add_argument("--concurrency", type=int, default=50, help="the number of connections open at once")
+    parser.add_argument("--messages", type=int, default=10, help="the number of lines sent on each connection")
+    parser.add_argument("--message-size", type=int, default=120, help="the number of letters in each line")
+    parser.add_argument("--large-size", type=int, default=1 << 20, help="the number of letters in a large line")
+    parser.add_argument(
+        "--large-every", type=int, default=0, help="send a large line on every n-th connection (0 for never)"
+    )
+    parser.add_argument(
+        "--offload-threshold",
+        type=int,
+        default=OFFLOAD_THRESHOLD,
+        help="the length of the shortest line transformed in the executor (Hill, Playfair and Rail Fence)",
+    )
+    parser.add_argument(
+        "--executor", choices=("thread", "process"), default="thread", help="the executor of the long lines"
+    )
+    args = parser.parse_args()
+
+    if args.executor == "thread":
+        executor = ThreadPoolExecutor()
+    else:
+        executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+    with executor:
+        elapsed, small_latencies, large_latencies = asyncio.run(run_load(args, executor))
+
+    message_count = len(small_latencies) + len(large_latencies)
+
+    print(
+        f"cipher: {args.cipher}, {args.connections} connections ({args.concurrency} at once), "
+        f"{args.messages} lines of {args.message_size} letters each"
+    )
+    print(
+        f"{args.connections / elapsed:10.1f} connections/s  {message_count / elapsed:10.1f} lines/s  "
+        f"({elapsed:.2f} s)"
+    )
+    print(
+        f"small lines  p50 {percentile(small_latencies, 50) * 1e3:8.2f} ms  "
+        f"p99 {percentile(small_latencies, 99) * 1e3:8.2f} ms  max {max(small_latencies) * 1e3:8.2f} ms"
+    )
+
+    if large_latencies:
+        print(
+            f"large lines  p50 {percentile(large_latencies, 50) * 1e3:8.2f} ms  "
+            f"p99 {percentile(large_latencies, 99) * 1e3:8.2f} ms  ({len(large_latencies)} of {args.large_size:,} letters)"
+        )
+
+
+if __name__ == "__main__":
+    main()
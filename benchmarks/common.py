@@ -0,0 +1,51 @@
+import os  # Import os to find the repository
+import sys  # Import sys to make the package importable
+import time  # Import time to measure the wall time
+
+# The classical_ciphers package is in the parent directory of the benchmarks
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def best_time(function, repeat: int = 5):
+    """
+    Calls the function a number of times and returns the fastest wall time.
+
+    Args:
+    -   function (function): The function to be timed, called without arguments.
+    -   repeat (int): The number of calls.
+
+    Returns:
+    -   float: The fastest wall time in seconds.
+    """
+
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def percentile(values: list, q: float):
+    """
+    Calculates a percentile of the values with linear interpolation.
+
+    Args:
+    -   values (list): The values.
+    -   q (float): The percentile, from 0 to 100.
+
+    Returns:
+    -   float: The percentile.
+    """
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -0,0 +1,564 @@
+import argparse  # Import argparse for the command line options
+import json  # Import json to save and load the baselines
+import platform  # Import platform to record the machine in the baselines
+import random  # Import random to generate the texts and keys
+import string  # Import string for the letters
+import sys  # Import sys to set the exit status
+import time  # Import time to measure the latency
+import tracemalloc  # Import tracemalloc to measure the peak memory
+
+from common import percentile
+
+from classical_ciphers import additive, affine, atbash, chain, hill, playfair, rail_fence, vigenere
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+STREAM_CHUNK_SIZE = 65536  # the number of characters in each chunk of the stream benchmarks
+
+# The characters of the generated texts
+MIXED_ALPHABET = string.ascii_letters + "    ,.!"
+UPPER_ALPHABET = string.ascii_uppercase
+PLAYFAIR_ALPHABET = string.ascii_uppercase.replace("J", "")  # the Playfair matrix has no J
+
+generated_texts = {}  # the generated texts, reused by every case of the same size and alphabet
+
+
+def parse_size(size_text: str):
+    """
+    Parses a size such as "1KB", "64MB" or "1GB".
+
+    Args:
+    -   size_text (str): The size with an optional unit (B, KB, MB or GB, in powers of 1024).
+
+    Returns:
+    -   int: The size in bytes.
+
+    Raises:
+    -   argparse.ArgumentTypeError: If the size cannot be parsed.
+    """
+
+    size_text = size_text.strip().upper()
+
+    # Try the longest units first, so "MB" is not read as "B"
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if size_text.endswith(unit):
+            number = size_text[: -len(unit)] or "1"
+            break
+    else:
+        unit, number = "B", size_text
+
+    try:
+        return int(float(number) * SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {size_text!r}")
+
+
+def format_size(size: int):
+    """
+    Formats a size in bytes with the largest unit that divides it.
+
+    Args:
+    -   size (int): The size in bytes.
+
+    Returns:
+    -   str: The formatted size, e.g. "64KB".
+    """
+
+    for unit in ("GB", "MB", "KB"):
+        if size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+
+    return f"{size}B"
+
+
+def generate_text(size: int, alphabet: str, multiple: int = 1):
+    """
+    Generates a random text by repeating a random 64 KB block, so even 1 GB texts are generated quickly.
+
+    Args:
+    -   size (int): The length of the text.
+    -   alphabet (str): The characters of the text.
+    -   multiple (int): The length is rounded down to a multiple of this number (the Hill matrix size).
+
+    Returns:
+    -   str: The text.
+    """
+
+    size -= size % multiple
+
+    if (size, alphabet) not in generated_texts:
+        rng = random.Random(size)
+        block = "".join(rng.choice(alphabet) for _ in range(min(size, 65536)))
+        generated_texts[size, alphabet] = (block * (size // max(len(block), 1) + 1))[:size]
+
+    return generated_texts[size, alphabet]
+
+
+def generate_hill_key(matrix_size: int):
+    """
+    Generates a random Hill key whose matrix can be inverted modulo 26.
+
+    Args:
+    -   matrix_size (int): The size of the key matrix.
+
+    Returns:
+    -   str: The key text.
+    """
+
+    rng = random.Random(matrix_size)
+
+    while True:
+        key_text = "".join(rng.choice(UPPER_ALPHABET) for _ in range(matrix_size**2))
+
+        try:
+            hill.compile_hill_cipher(key_text).key_matrix_inv
+            return key_text
+        except ValueError:
+            pass  # the key matrix cannot be inverted, try another key
+
+
+def split_chunks(text: str):
+    """
+    Splits a text into the chunks used by the stream benchmarks.
+
+    Args:
+    -   text (str): The text.
+
+    Returns:
+    -   list: The chunks of the text.
+    """
+
+    return [text[i : i + STREAM_CHUNK_SIZE] for i in range(0, len(text), STREAM_CHUNK_SIZE)]
+
+
+def text_case(case_id, function, alphabet, multiple=1, key_size=None, encrypt=None):
+    """
+    Describes a benchmark of a function that takes a text.
+
+    Args:
+    -   case_id (str): The name of the case, e.g. "vigenere_encrypt/key=16".
+    -   function (function): Called with the input text.
+    -   alphabet (str): The characters of the plain text.
+    -   multiple (int): The length of the plain text is a multiple of this number.
+    -   key_size (int): The key length, matrix size or depth, recorded in the results.
+    -   encrypt (function): For the decrypt functions, encrypts the plain text into the input text.
+
+    Returns:
+    -   dict: The case.
+    """
+
+    def prepare(size):
+        text = generate_text(size, alphabet, multiple)
+        return encrypt(text) if encrypt else text
+
+    return {"id": case_id, "prepare": prepare, "run": function, "key_size": key_size}
+
+
+def stream_case(case_id, function, alphabet, multiple=1, key_size=None, encrypt=None):
+    """
+    Describes a benchmark of a stream function, fed with chunks of STREAM_CHUNK_SIZE characters.
+
+    Args:
+    -   case_id (str): The name of the case.
+    -   function (function): Called with the list of chunks, returns the output chunks.
+    -   alphabet (str): The characters of the plain text.
+    -   multiple (int): The length of the plain text is a multiple of this number.
+    -   key_size (int): The key length, matrix size or depth, recorded in the results.
+    -   encrypt (function): For the decrypt functions, encrypts the plain text into the input text.
+
+    Returns:
+    -   dict: The case.
+    """
+
+    case = text_case(case_id, None, alphabet, multiple, key_size, encrypt)
+    prepare = case["prepare"]
+
+    case["prepare"] = lambda size: split_chunks(prepare(size))
+    case["run"] = lambda chunks: "".join(function(chunks))
+
+    return case
+
+
+def buffer_case(case_id, function, alphabet, key_size=None):
+    """
+    Describes a benchmark of a buffer function, which transforms a bytearray of the text in place.
+    Each run transforms the output of the previous run, which takes the same time.
+
+    Args:
+    -   case_id (str): The name of the case.
+    -   function (function): Called with the bytearray and the output buffer (the same bytearray).
+    -   alphabet (str): The characters of the plain text.
+    -   key_size (int): The key length, recorded in the results.
+
+    Returns:
+    -   dict: The case.
+    """
+
+    case = text_case(case_id, None, alphabet, key_size=key_size)
+    prepare = case["prepare"]
+
+    case["prepare"] = lambda size: bytearray(prepare(size).encode("ascii"))
+    case["run"] = lambda data: function(data, data)
+
+    return case
+
+
+def build_cases(vigenere_key_lengths, hill_matrix_sizes, rail_depths):
+    """
+    Builds the benchmark cases of every public encrypt and decrypt function.
+
+    Args:
+    -   vigenere_key_lengths (list): The Vigenere key lengths.
+    -   hill_matrix_sizes (list): The Hill matrix sizes.
+    -   rail_depths (list): The Rail Fence depths.
+
+    Returns:
+    -   list: The cases.
+    """
+
+    cases = [
+        text_case("additive_encrypt", lambda text: additive.additive_encrypt(text, 7), MIXED_ALPHABET),
+        text_case(
+            "additive_decrypt",
+            lambda text: additive.additive_decrypt(text, 7),
+            MIXED_ALPHABET,
+            encrypt=lambda text: additive.additive_encrypt(text, 7),
+        ),
+        text_case("rot13_encrypt", additive.rot13_encrypt, MIXED_ALPHABET),
+        text_case("rot13_decrypt", additive.rot13_decrypt, MIXED_ALPHABET, encrypt=additive.rot13_encrypt),
+        stream_case("additive_encrypt_stream", lambda chunks: additive.additive_encrypt_stream(chunks, 7), MIXED_ALPHABET),
+        stream_case(
+            "additive_decrypt_stream",
+            lambda chunks: additive.additive_decrypt_stream(chunks, 7),
+            MIXED_ALPHABET,
+            encrypt=lambda text: additive.additive_encrypt(text, 7),
+        ),
+        text_case("affine_encrypt", lambda text: affine.affine_encrypt(text, (5, 8)), MIXED_ALPHABET),
+        text_case(
+            "affine_decrypt",
+            lambda text: affine.affine_decrypt(text, (5, 8)),
+            MIXED_ALPHABET,
+            encrypt=lambda text: affine.affine_encrypt(text, (5, 8)),
+        ),
+        text_case("multiplicative_encrypt", lambda text: affine.multiplicative_encrypt(text, 5), MIXED_ALPHABET),
+        text_case(
+            "multiplicative_decrypt",
+            lambda text: affine.multiplicative_decrypt(text, 5),
+            MIXED_ALPHABET,
+            encrypt=lambda text: affine.multiplicative_encrypt(text, 5),
+        ),
+        stream_case("affine_encrypt_stream", lambda chunks: affine.affine_encrypt_stream(chunks, (5, 8)), MIXED_ALPHABET),
+        stream_case(
+            "affine_decrypt_stream",
+            lambda chunks: affine.affine_decrypt_stream(chunks, (5, 8)),
+            MIXED_ALPHABET,
+            encrypt=lambda text: affine.affine_encrypt(text, (5, 8)),
+        ),
+        text_case("atbash_encrypt", atbash.atbash_encrypt, MIXED_ALPHABET),
+        text_case("atbash_decrypt", atbash.atbash_decrypt, MIXED_ALPHABET, encrypt=atbash.atbash_encrypt),
+        stream_case("atbash_encrypt_stream", atbash.atbash_encrypt_stream, MIXED_ALPHABET),
+        buffer_case("additive_encrypt_buffer", lambda data, out: additive.additive_encrypt_buffer(data, 7, out), MIXED_ALPHABET),
+        buffer_case("affine_encrypt_buffer", lambda data, out: affine.affine_encrypt_buffer(data, (5, 8), out), MIXED_ALPHABET),
+        buffer_case("atbash_encrypt_buffer", atbash.atbash_encrypt_buffer, MIXED_ALPHABET),
+        stream_case(
+            "atbash_decrypt_stream", atbash.atbash_decrypt_stream, MIXED_ALPHABET, encrypt=atbash.atbash_encrypt
+        ),
+        # The same three stages, one pass each and fused into a single table
+        text_case(
+            "chain_staged_encrypt",
+            lambda text: atbash.atbash_encrypt(affine.affine_encrypt(additive.additive_encrypt(text, 7), (5, 8))),
+            MIXED_ALPHABET,
+        ),
+        text_case(
+            "chain_encrypt",
+            lambda text: chain.chain_encrypt(text, [("additive", 7), ("affine", (5, 8)), "atbash"]),
+            MIXED_ALPHABET,
+        ),
+        text_case("playfair_encrypt", lambda text: playfair.playfair_encrypt(text, "KEYWORD"), PLAYFAIR_ALPHABET),
+        text_case(
+            "playfair_decrypt",
+            lambda text: playfair.playfair_decrypt(text, "KEYWORD"),
+            PLAYFAIR_ALPHABET,
+            encrypt=lambda text: playfair.playfair_encrypt(text, "KEYWORD"),
+        ),
+        stream_case(
+            "playfair_encrypt_stream",
+            lambda chunks: playfair.playfair_encrypt_stream(chunks, "KEYWORD"),
+            PLAYFAIR_ALPHABET,
+        ),
+        stream_case(
+            "playfair_decrypt_stream",
+            lambda chunks: playfair.playfair_decrypt_stream(chunks, "KEYWORD"),
+            PLAYFAIR_ALPHABET,
+            encrypt=lambda text: playfair.playfair_encrypt(text, "KEYWORD"),
+        ),
+    ]
+
+    # The Vigenere key is repeated over the text, so its length changes the key lookups
+    for key_length in vigenere_key_lengths:
+        key_text = "".join(random.Random(key_length).choice(UPPER_ALPHABET) for _ in range(key_length))
+        encrypt = lambda text, key_text=key_text: vigenere.vigenere_encrypt(text, key_text)
+
+        cases += [
+            text_case(f"vigenere_encrypt/key={key_length}", encrypt, MIXED_ALPHABET, key_size=key_length),
+            text_case(
+                f"vigenere_decrypt/key={key_length}",
+                lambda text, key_text=key_text: vigenere.vigenere_decrypt(text, key_text),
+                MIXED_ALPHABET,
+                key_size=key_length,
+                encrypt=encrypt,
+            ),
+            stream_case(
+                f"vigenere_encrypt_stream/key={key_length}",
+                lambda chunks, key_text=key_text: vigenere.vigenere_encrypt_stream(chunks, key_text),
+                MIXED_ALPHABET,
+                key_size=key_length,
+            ),
+            stream_case(
+                f"vigenere_decrypt_stream/key={key_length}",
+                lambda chunks, key_text=key_text: vigenere.vigenere_decrypt_stream(chunks, key_text),
+                MIXED_ALPHABET,
+                key_size=key_length,
+                encrypt=encrypt,
+            ),
+            buffer_case(
+                f"vigenere_encrypt_buffer/key={key_length}",
+                lambda data, out, key_text=key_text: vigenere.vigenere_encrypt_buffer(data, key_text, out),
+                MIXED_ALPHABET,
+                key_size=key_length,
+            ),
+        ]
+
+    # The Hill text length must be a multiple of the matrix size
+    for matrix_size in hill_matrix_sizes:
+        key_text = generate_hill_key(matrix_size)
+        encrypt = lambda text, key_text=key_text: hill.hill_encrypt(key_text, text)[0]
+
+        cases += [
+            text_case(f"hill_encrypt/n={matrix_size}", encrypt, UPPER_ALPHABET, matrix_size, matrix_size),
+            text_case(
+                f"hill_decrypt/n={matrix_size}",
+                lambda text, key_text=key_text: hill.hill_decrypt(key_text, text)[0],
+                UPPER_ALPHABET,
+                matrix_size,
+                matrix_size,
+                encrypt,
+            ),
+            stream_case(
+                f"hill_encrypt_stream/n={matrix_size}",
+                lambda chunks, key_text=key_text: hill.hill_encrypt_stream(key_text, chunks),
+                UPPER_ALPHABET,
+                matrix_size,
+                matrix_size,
+            ),
+            stream_case(
+                f"hill_decrypt_stream/n={matrix_size}",
+                lambda chunks, key_text=key_text: hill.hill_decrypt_stream(key_text, chunks),
+                UPPER_ALPHABET,
+                matrix_size,
+                matrix_size,
+                encrypt,
+            ),
+        ]
+
+    # The Rail Fence depth changes the permutation
+    for depth in rail_depths:
+        encrypt = lambda text, depth=depth: rail_fence.rail_encrypt(text, depth)
+
+        cases += [
+            text_case(f"rail_encrypt/depth={depth}", encrypt, UPPER_ALPHABET, key_size=depth),
+            text_case(
+                f"rail_decrypt/depth={depth}",
+                lambda text, depth=depth: rail_fence.rail_decrypt(text, depth),
+                UPPER_ALPHABET,
+                key_size=depth,
+                encrypt=encrypt,
+            ),
+            stream_case(
+                f"rail_encrypt_stream/depth={depth}",
+                lambda chunks, depth=depth: rail_fence.rail_encrypt_stream(chunks, depth),
+                UPPER_ALPHABET,
+                key_size=depth,
+            ),
+            stream_case(
+                f"rail_decrypt_stream/depth={depth}",
+                lambda chunks, depth=depth: rail_fence.rail_decrypt_stream(chunks, depth),
+                UPPER_ALPHABET,
+                key_size=depth,
+                encrypt=encrypt,
+            ),
+        ]
+
+    return cases
+
+
+def measure_case(case: dict, size: int, repeat: int, min_time: float):
+    """
+    Measures the throughput, latency and peak memory of a case.
+
+    The function is called at least repeat times and until min_time seconds have passed.
+    The peak memory is measured in one more call with tracemalloc, so tracing does not slow down the timed calls.
+
+    Args:
+    -   case (dict): The case.
+    -   size (int): The size of the plain text in bytes.
+    -   repeat (int): The least number of timed calls.
+    -   min_time (float): The least total time of the timed calls, in seconds.
+
+    Returns:
+    -   dict: The result.
+    """
+
+    data = case["prepare"](size)
+    run = case["run"]
+    latencies = []
+    total_time = 0.0
+
+    # Small inputs are called many times, so the percentiles are not just noise
+    while len(latencies) < repeat or (total_time < min_time and len(latencies) < 10000):
+        start = time.perf_counter()
+        run(data)
+        latency = time.perf_counter() - start
+
+        latencies.append(latency)
+        total_time += latency
+
+    tracemalloc.start()
+    baseline_memory, _ = tracemalloc.get_traced_memory()
+    run(data)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = percentile(latencies, 50)
+
+    return {
+        "case": case["id"],
+        "size": size,
+        "key_size": case["key_size"],
+        "calls": len(latencies),
+        "mb_per_s": size / 1e6 / median if median else float("inf"),
+        "latency_ms": {
+            f"p{q}": percentile(latencies, q) * 1000 for q in (50, 90, 99)
+        },
+        "peak_memory_bytes": peak_memory - baseline_memory,
+    }
+
+
+def compare_results(results: dict, baseline: dict, threshold: float):
+    """
+    Compares the results with a baseline and finds the regressions.
+
+    A case regresses when its throughput is lower than the baseline, or its peak memory is higher
+    than the baseline, by more than the threshold.
+
+    Args:
+    -   results (dict): The results by key ("case@size").
+    -   baseline (dict): The baseline results by key.
+    -   threshold (float): The allowed relative change, e.g. 0.1 for 10%.
+
+    Returns:
+    -   list: A message for each regression.
+    """
+
+    regressions = []
+
+    for key, result in results.items():
+        if key not in baseline:
+            continue  # the case was not in the baseline
+
+        old = baseline[key]
+        speed_ratio = result["mb_per_s"] / old["mb_per_s"] if old["mb_per_s"] else 1.0
+
+        if speed_ratio < 1 - threshold:
+            regressions.append(
+                f"{key}: throughput {result['mb_per_s']:.2f} MB/s, baseline {old['mb_per_s']:.2f} MB/s ({speed_ratio - 1:+.1%})"
+            )
+
+        # Ignore the changes of a few kilobytes, which are noise for the small sizes
+        old_memory, memory = old["peak_memory_bytes"], result["peak_memory_bytes"]
+
+        if memory > old_memory * (1 + threshold) and memory - old_memory > 65536:
+            regressions.append(
+                f"{key}: peak memory {memory / 1e6:.2f} MB, baseline {old_memory / 1e6:.2f} MB"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures the throughput, latency and peak memory of every encrypt and decrypt function."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_size,
+        nargs="+",
+        default=[parse_size(size) for size in ("1KB", "64KB", "1MB")],
+        help="input sizes, e.g. 1KB 1MB 64MB 1GB",
+    )
+    parser.add_argument("--vigenere-keys", type=int, nargs="+", default=[3, 16, 256], help="Vigenere key lengths")
+    parser.add_argument("--hill-sizes", type=int, nargs="+", default=[2, 3, 4], help="Hill matrix sizes")
+    parser.add_argument("--rail-depths", type=int, nargs="+", default=[2, 8, 64], help="Rail Fence depths")
+    parser.add_argument("--filter", default="", help="only run the cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="least number of timed calls")
+    parser.add_argument("--min-time", type=float, default=0.2, help="least total time of each case in seconds")
+    parser.add_argument("--save", help="save the results as a JSON baseline")
+    parser.add_argument("--compare", help="compare the results with a JSON baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed relative regression in compare mode"
+    )
+    args = parser.parse_args()
+
+    cases = [
+        case
+        for case in build_cases(args.vigenere_keys, args.hill_sizes, args.rail_depths)
+        if args.filter in case["id"]
+    ]
+    results = {}
+
+    print(f"{'case':40} {'size':>6} {'MB/s':>10} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'peak MB':>9}")
+
+    for size in args.sizes:
+        for case in cases:
+            result = measure_case(case, size, args.repeat, args.min_time)
+            results[f"{case['id']}@{format_size(size)}"] = result
+
+            latency = result["latency_ms"]
+            print(
+                f"{case['id']:40} {format_size(size):>6} {result['mb_per_s']:10.2f} {latency['p50']:10.3f} "
+                f"{latency['p90']:10.3f} {latency['p99']:10.3f} {result['peak_memory_bytes'] / 1e6:9.2f}"
+            )
+
+        generated_texts.clear()  # free the texts of this size before the next one
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+        print(f"saved the baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+        regressions = compare_results(results, baseline, args.threshold)
+
+        for regression in regressions:
+            print("REGRESSION:", regression)
+
+        print(f"{len(regressions)} regressions beyond {args.threshold:.0%} compared with {args.compare}")
+
+        # Exit with a non zero status so the comparison can be used in scripts
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
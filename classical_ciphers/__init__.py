@@ -0,0 +1,99 @@
+"""
+Classical encryption algorithms.
+
+The cipher modules are only imported when they are first used, so importing the package is cheap
+and NumPy is not loaded unless a cipher needs it (Hill) or a long text takes a vectorized path.
+
+Example:
+    >>> from classical_ciphers import get_cipher
+    >>> get_cipher("vigenere", "KEY").encrypt("Hello World")
+    'RIJVS UYVJN'
+    >>> from classical_ciphers import playfair
+    >>> playfair.playfair_encrypt("Hello", "KEY")
+    'DBNVMI'
+"""
+
+import importlib  # Import importlib to load the cipher modules on first use
+
+# The module and the factory function of each cipher in the registry
+CIPHERS = {
+    "additive": ("additive", "compile_additive_cipher"),
+    "affine": ("affine", "compile_affine_cipher"),
+    "atbash": ("atbash", "compile_atbash_cipher"),
+    "vigenere": ("vigenere", "compile_vigenere_cipher"),
+    "hill": ("hill", "compile_hill_cipher"),
+    "playfair": ("playfair", "compile_playfair_cipher"),
+    "rail_fence": ("rail_fence", "compile_rail_fence_cipher"),
+}
+
+MODULES = frozenset(module_name for module_name, _ in CIPHERS.values()) | {
+    "aio",
+    "analysis",
+    "batch",
+    "chain",
+    "cli",
+    "common",
+    "daemon",
+    "inplace",
+    "keycache",
+    "metrics",
+    "parallel",
+}
+
+__all__ = ["CIPHERS", "available_ciphers", "get_cipher", *sorted(MODULES)]
+
+
+def available_ciphers():
+    """
+    Lists the names of the ciphers in the registry.
+
+    Returns:
+    -   list: The cipher names, in the order they were registered.
+    """
+
+    return list(CIPHERS)
+
+
+def get_cipher(name: str, key=None, **options):
+    """
+    Returns the compiled cipher with the given name and key.
+
+    Every cipher has encrypt(), decrypt(), encrypt_stream() and decrypt_stream() methods.
+    The cipher module is imported the first time one of its ciphers is requested.
+
+    Args:
+    -   name (str): The name of the cipher, e.g. "vigenere" or "Rail Fence".
+    -   key: The key of the cipher. Atbash has no key, and the Rail Fence key is the depth.
+    -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+    Returns:
+    -   object: The compiled cipher.
+
+    Raises:
+    -   ValueError: If there is no cipher with the given name, or the key is not valid.
+    """
+
+    # Accept "Rail Fence", "rail-fence" and "rail_fence"
+    normalized_name = name.strip().lower().replace(" ", "_").replace("-", "_")
+
+    if normalized_name not in CIPHERS:
+        raise ValueError(
+            f"Unknown cipher {name!r}, expected one of: {', '.join(CIPHERS)}"
+        )
+
+    module_name, factory_name = CIPHERS[normalized_name]
+    factory = getattr(importlib.import_module(f".{module_name}", __name__), factory_name)
+
+    # Atbash has no key
+    if key is None:
+        return factory(**options)
+
+    return factory(key, **options)
+
+
+def __getattr__(name: str):
+    # Import the cipher modules lazily, the first time they are accessed as attributes
+    if name in MODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
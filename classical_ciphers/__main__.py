@@ -0,0 +1,6 @@
+import sys  # Import sys for the exit status
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
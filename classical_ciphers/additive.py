@@ -0,0 +1,291 @@
+
+from .common import TranslationTable, build_byte_table, iterate_chunks, translate_buffer, translate_text
+from .keycache import cached_key_schedule
+
+
+class AdditiveCipher:
+    """
+    A compiled additive cipher for a single key.
+
+    The substitution tables are built once for the key, so whole strings are encrypted with
+    str.translate() instead of a loop over each character.
+
+    Args:
+    -   key (int): The encryption key.
+    """
+
+    def __init__(self, key: int):
+        self.key = key
+
+        # The same formula as the character loop, once for encryption and once for decryption
+        def encrypt_char(char):
+            return chr((((ord(char.upper()) - 65) + key) % 26) + 65)
+
+        def decrypt_char(char):
+            return chr((((ord(char.upper()) - 65) - key) % 26) + 65)
+
+        self.encrypt_table = TranslationTable(encrypt_char)
+        self.decrypt_table = TranslationTable(decrypt_char)
+        self.encrypt_byte_table = build_byte_table(encrypt_char)
+        self.decrypt_byte_table = build_byte_table(decrypt_char)
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted cipher text.
+        """
+
+        return translate_text(plain_text, self.encrypt_table, self.encrypt_byte_table)
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text.
+
+        Args:
+        -   cipher_text (str): The cipher text to be decrypted.
+
+        Returns:
+        -   str: The decrypted plain text.
+        """
+
+        return translate_text(cipher_text, self.decrypt_table, self.decrypt_byte_table)
+
+    def encrypt_bytes(self, plain_bytes: bytes):
+        """
+        Encrypts the given ASCII bytes.
+
+        Args:
+        -   plain_bytes (bytes): The plain bytes to be encrypted.
+
+        Returns:
+        -   bytes: The encrypted bytes.
+        """
+
+        return plain_bytes.translate(self.encrypt_byte_table)
+
+    def decrypt_bytes(self, cipher_bytes: bytes):
+        """
+        Decrypts the given ASCII bytes.
+
+        Args:
+        -   cipher_bytes (bytes): The cipher bytes to be decrypted.
+
+        Returns:
+        -   bytes: The decrypted bytes.
+        """
+
+        return cipher_bytes.translate(self.decrypt_byte_table)
+
+    def encrypt_buffer(self, plain_data, out=None):
+        """
+        Encrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        return translate_buffer(plain_data, self.encrypt_byte_table, out)
+
+    def decrypt_buffer(self, cipher_data, out=None):
+        """
+        Decrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        return translate_buffer(cipher_data, self.decrypt_byte_table, out)
+
+    def encrypt_stream(self, plain_chunks):
+        """
+        Encrypts a stream of plain text chunks. Only one chunk is held in memory at a time.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        for chunk in iterate_chunks(plain_chunks):
+            yield self.encrypt(chunk)
+
+    def decrypt_stream(self, cipher_chunks):
+        """
+        Decrypts a stream of cipher text chunks. Only one chunk is held in memory at a time.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        for chunk in iterate_chunks(cipher_chunks):
+            yield self.decrypt(chunk)
+
+
+@cached_key_schedule("additive")
+def compile_additive_cipher(key: int):
+    """
+    Returns the compiled additive cipher for the given key.
+    The most recently used ciphers are cached, so repeated calls with the same key skip the build step.
+
+    Args:
+    -   key (int): The encryption key.
+
+    Returns:
+    -   AdditiveCipher: The compiled cipher.
+    """
+
+    return AdditiveCipher(key)
+
+
+def additive_encrypt(plain_text: str, key: int):
+    """
+    Encrypts the given plain text using the additive cipher algorithm.
+
+    Args:
+    -   plain_text (str): The plain text to be encrypted.
+    -   key (int): The encryption key.
+
+    Returns:
+    -   str: The encrypted cipher text.
+    """
+
+    # Translate the whole text at once using the compiled cipher for the key
+    return compile_additive_cipher(key).encrypt(plain_text)
+
+
+def additive_decrypt(cipher_text, key):
+    """
+    Decrypts a given cipher text using the additive cipher algorithm.
+
+    Parameters:
+    -   cipher_text (str): The cipher text to be decrypted.
+    -   key (int): The key used for decryption.
+
+    Returns:
+    -   str: The decrypted plain text.
+    """
+
+    return additive_encrypt(cipher_text, -key)  # -key is used to shift backwards
+
+
+def rot13_encrypt(plain_text):
+    """
+    Encrypts the given plain text using the ROT13 encryption algorithm.
+
+    Parameters:
+    -   plain_text (str): The plain text to be encrypted.
+
+    Returns:
+    -   str: The encrypted text.
+    """
+
+    return additive_encrypt(plain_text, 13)  # 13 is the key for rot13 encryption
+
+
+def rot13_decrypt(cipher_text):
+    """
+    Decrypts the given cipher text using the ROT13 algorithm.
+
+    Parameters:
+    -   cipher_text (str): The text to be decrypted.
+
+    Returns:
+    -   str: The decrypted text.
+    """
+
+    return additive_decrypt(cipher_text, 13)  # -13 is the key for rot13 decryption
+
+
+def additive_encrypt_stream(plain_chunks, key: int):
+    """
+    Encrypts a stream of plain text chunks using the additive cipher algorithm.
+    Only one chunk is held in memory at a time, and the output is the same as encrypting the whole text at once.
+
+    Args:
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+    -   key (int): The encryption key.
+
+    Yields:
+    -   str: The encrypted chunks.
+    """
+
+    # The tables are built once for the whole stream
+    yield from compile_additive_cipher(key).encrypt_stream(plain_chunks)
+
+
+def additive_decrypt_stream(cipher_chunks, key: int):
+    """
+    Decrypts a stream of cipher text chunks using the additive cipher algorithm.
+    Only one chunk is held in memory at a time, and the output is the same as decrypting the whole text at once.
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+    -   key (int): The encryption key.
+
+    Yields:
+    -   str: The decrypted chunks.
+    """
+
+    # The tables are built once for the whole stream
+    yield from compile_additive_cipher(key).decrypt_stream(cipher_chunks)
+
+
+def additive_encrypt_buffer(plain_data, key: int, out=None):
+    """
+    Encrypts a buffer of ASCII bytes using the additive cipher algorithm, into an output buffer or in place.
+
+    Args:
+    -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key (int): The encryption key.
+    -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_additive_cipher(key).encrypt_buffer(plain_data, out)
+
+
+def additive_decrypt_buffer(cipher_data, key: int, out=None):
+    """
+    Decrypts a buffer of ASCII bytes using the additive cipher algorithm, into an output buffer or in place.
+
+    Args:
+    -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key (int): The encryption key.
+    -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_additive_cipher(key).decrypt_buffer(cipher_data, out)
@@ -0,0 +1,367 @@
+from .common import TranslationTable, build_byte_table, iterate_chunks, translate_buffer, translate_text
+from .keycache import cached_key_schedule
+
+
+class AffineCipher:
+    """
+    A compiled affine cipher for a single key.
+
+    The substitution tables and the modular inverse of the multiplicative key are computed once
+    for the key, so whole strings are encrypted with str.translate() instead of a loop over each character.
+
+    Args:
+    -   key (tuple): The key consisting of two integers (a, b).
+    """
+
+    def __init__(self, key):
+        self.key = (key[0], key[1])
+        self.m_dash = mod_inverse(key[0], 26)  # the inverse is only searched once per key
+
+        # The same formulas as the character loops, once for encryption and once for decryption
+        def encrypt_char(char):
+            return chr(((key[0] * (ord(char.upper()) - 65) + key[1]) % 26) + 65)
+
+        def decrypt_char(char):
+            if self.m_dash == -1:
+                raise ValueError(
+                    "The modular inverse of {} does not exist.".format(key[0])
+                )
+
+            return chr(((((ord(char.upper()) - 65) - key[1]) * self.m_dash) % 26) + 65)
+
+        self.encrypt_table = TranslationTable(encrypt_char)
+        self.encrypt_byte_table = build_byte_table(encrypt_char)
+
+        # If the modular inverse does not exist, the error is raised as soon as a letter is decrypted
+        self.decrypt_table = TranslationTable(decrypt_char, prefill=self.m_dash != -1)
+        self.decrypt_byte_table = (
+            build_byte_table(decrypt_char) if self.m_dash != -1 else None
+        )
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text.
+        """
+
+        return translate_text(plain_text, self.encrypt_table, self.encrypt_byte_table)
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text.
+
+        Args:
+        -   cipher_text (str): The encrypted text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text.
+
+        Raises:
+        -   ValueError: If the modular inverse of the key does not exist.
+        """
+
+        return translate_text(cipher_text, self.decrypt_table, self.decrypt_byte_table)
+
+    def encrypt_bytes(self, plain_bytes: bytes):
+        """
+        Encrypts the given ASCII bytes.
+
+        Args:
+        -   plain_bytes (bytes): The plain bytes to be encrypted.
+
+        Returns:
+        -   bytes: The encrypted bytes.
+        """
+
+        return plain_bytes.translate(self.encrypt_byte_table)
+
+    def decrypt_bytes(self, cipher_bytes: bytes):
+        """
+        Decrypts the given ASCII bytes.
+
+        Args:
+        -   cipher_bytes (bytes): The cipher bytes to be decrypted.
+
+        Returns:
+        -   bytes: The decrypted bytes.
+
+        Raises:
+        -   ValueError: If the modular inverse of the key does not exist.
+        """
+
+        if self.decrypt_byte_table is None:
+            raise ValueError(
+                "The modular inverse of {} does not exist.".format(self.key[0])
+            )
+
+        return cipher_bytes.translate(self.decrypt_byte_table)
+
+    def encrypt_buffer(self, plain_data, out=None):
+        """
+        Encrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        return translate_buffer(plain_data, self.encrypt_byte_table, out)
+
+    def decrypt_buffer(self, cipher_data, out=None):
+        """
+        Decrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        -   ValueError: If the modular inverse of the key does not exist.
+        """
+
+        if self.decrypt_byte_table is None:
+            raise ValueError(
+                "The modular inverse of {} does not exist.".format(self.key[0])
+            )
+
+        return translate_buffer(cipher_data, self.decrypt_byte_table, out)
+
+    def encrypt_stream(self, plain_chunks):
+        """
+        Encrypts a stream of plain text chunks. Only one chunk is held in memory at a time.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        for chunk in iterate_chunks(plain_chunks):
+            yield self.encrypt(chunk)
+
+    def decrypt_stream(self, cipher_chunks):
+        """
+        Decrypts a stream of cipher text chunks. Only one chunk is held in memory at a time.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        for chunk in iterate_chunks(cipher_chunks):
+            yield self.decrypt(chunk)
+
+
+def compile_affine_cipher(key):
+    """
+    Returns the compiled affine cipher for the given key.
+    The most recently used ciphers are cached, so repeated calls with the same key skip the build step.
+
+    Args:
+    -   key (tuple): The key consisting of two integers (a, b).
+
+    Returns:
+    -   AffineCipher: The compiled cipher.
+    """
+
+    return cached_affine_cipher(key[0], key[1])  # lists are accepted as keys too
+
+
+@cached_key_schedule("affine")
+def cached_affine_cipher(m: int, k: int):
+    """
+    Builds the compiled affine cipher for the multiplicative key m and the additive key k, in the shared key schedule cache.
+
+    Args:
+    -   m (int): The multiplicative key.
+    -   k (int): The additive key.
+
+    Returns:
+    -   AffineCipher: The compiled cipher.
+    """
+
+    return AffineCipher((m, k))
+
+
+def affine_encrypt(plain_text: str, key: int):
+    """
+    Encrypts the given plain text using the Affine Cipher algorithm.
+
+    Args:
+    -   plain_text (str): The text to be encrypted.
+    -   key (int): The encryption key consisting of two integers (a, b).
+
+    Returns:
+    -   str: The encrypted text.
+    """
+
+    # Translate the whole text at once using the compiled cipher for the key
+    return compile_affine_cipher(key).encrypt(plain_text)
+
+
+def affine_decrypt(cipher_text, key):
+    """
+    Decrypts the given cipher text using the Affine Cipher algorithm.
+
+    Parameters:
+    -   cipher_text (str): The encrypted text to be decrypted.
+    -   key (tuple): The key used for decryption, consisting of two integers (a, b).
+
+    Returns:
+    -   plain_text (str): The decrypted text.
+
+    Raises:
+    -   ValueError: If the modular inverse of the key does not exist.
+    """
+
+    # Translate the whole text at once using the compiled cipher for the key
+    return compile_affine_cipher(key).decrypt(cipher_text)
+
+
+def mod_inverse(m, n):
+    """
+    Calculates the modular inverse of a number 'n' with respect to a modulus 'm', if it exists.
+    GCD(m, n) must be equal to 1 for the modular inverse to exist.
+
+    Parameters:
+    -   m (int): The modulus.
+    -   n (int): The number for which the modular inverse is to be calculated.
+
+    Returns:
+    -   int: The modular inverse of 'n' with respect to 'm'. Returns -1 if the modular inverse does not exist.
+    """
+
+    # Loop through all the numbers from 1 to n
+    for i in range(1, n):
+        # If the modular inverse exists, return it
+        if (m * i) % n == 1:
+            return i
+
+    return -1  # Return -1 if the modular inverse does not exist
+
+
+def multiplicative_encrypt(plain_text, key):
+    """
+    Encrypts the given plain text using the multiplicative cipher algorithm.
+
+    Parameters:
+    -   plain_text (str): The plain text to be encrypted.
+    -   key (int): The key used for encryption.
+
+    Returns:
+    -   str: The encrypted text.
+    """
+
+    return affine_encrypt(
+        plain_text, (key, 0)
+    )  # 0 is the value of k in multiplicative cipher
+
+
+def multiplicative_decrypt(cipher_text, key):
+    """
+    Decrypts a given cipher text using the multiplicative cipher algorithm.
+
+    Parameters:
+    -   cipher_text (str): The cipher text to be decrypted.
+    -   key (int): The key used for decryption.
+
+    Returns:
+    -   str: The decrypted plain text.
+    """
+
+    return affine_decrypt(
+        cipher_text, (key, 0)
+    )  # 0 is the value of k in multiplicative cipher
+
+
+def affine_encrypt_stream(plain_chunks, key):
+    """
+    Encrypts a stream of plain text chunks using the Affine Cipher algorithm.
+    Only one chunk is held in memory at a time, and the output is the same as encrypting the whole text at once.
+
+    Args:
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+    -   key (tuple): The key consisting of two integers (a, b).
+
+    Yields:
+    -   str: The encrypted chunks.
+    """
+
+    # The tables are built once for the whole stream
+    yield from compile_affine_cipher(key).encrypt_stream(plain_chunks)
+
+
+def affine_decrypt_stream(cipher_chunks, key):
+    """
+    Decrypts a stream of cipher text chunks using the Affine Cipher algorithm.
+    Only one chunk is held in memory at a time, and the output is the same as decrypting the whole text at once.
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+    -   key (tuple): The key consisting of two integers (a, b).
+
+    Yields:
+    -   str: The decrypted chunks.
+    """
+
+    # The tables are built once for the whole stream
+    yield from compile_affine_cipher(key).decrypt_stream(cipher_chunks)
+
+
+def affine_encrypt_buffer(plain_data, key, out=None):
+    """
+    Encrypts a buffer of ASCII bytes using the affine cipher algorithm, into an output buffer or in place.
+
+    Args:
+    -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key (tuple): The key consisting of two integers (a, b).
+    -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_affine_cipher(key).encrypt_buffer(plain_data, out)
+
+
+def affine_decrypt_buffer(cipher_data, key, out=None):
+    """
+    Decrypts a buffer of ASCII bytes using the affine cipher algorithm, into an output buffer or in place.
+
+    Args:
+    -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key (tuple): The key consisting of two integers (a, b).
+    -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+
+    Raises:
+    -   ValueError: If the modular inverse of the key does not exist.
+    """
+
+    return compile_affine_cipher(key).decrypt_buffer(cipher_data, out)
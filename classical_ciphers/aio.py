@@ -0,0 +1,397 @@
+import asyncio  # Import asyncio for the stream wrappers and the proxy
+import functools  # Import functools to pass the cipher options to the executor
+
+from . import get_cipher
+from .common import BUFFER_CHUNK_SIZE
+
+# The ciphers that transform each byte on its own, so a stream can be transformed in chunks of any size
+STREAMING_CIPHERS = ("additive", "affine", "atbash", "vigenere")
+
+OFFLOAD_THRESHOLD = 16384  # lines of the other ciphers at least this long are transformed in the executor
+
+MAX_LINE_LENGTH = 1 << 22  # the longest line read by the proxy (the limit of its stream readers)
+
+
+def transform_message(name: str, key, direction: int, message: bytes, options: tuple = ()):
+    """
+    Encrypts or decrypts a whole message with a compiled cipher.
+
+    This is a module level function, so it can be run in a thread or a process pool executor.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   message (bytes): The message, without its line ending.
+    -   options (tuple): The (name, value) pairs of the extra options of the cipher.
+
+    Returns:
+    -   bytes: The transformed message.
+    """
+
+    cipher = get_cipher(name, key, **dict(options))
+    text = message.decode("utf-8", "surrogateescape")
+    text = cipher.encrypt(text) if direction == 1 else cipher.decrypt(text)
+
+    return text.encode("utf-8", "surrogateescape")
+
+
+class CipherTransform:
+    """
+    The cipher state of one direction of one connection.
+
+    The Additive, Affine, Atbash and Vigenere ciphers transform the bytes as they arrive, with the buffer
+    kernels, and the Vigenere key position is carried from one chunk to the next. The other ciphers
+    (Hill, Playfair and Rail Fence) transform each line as a whole message, and lines of at least
+    offload_threshold bytes are transformed in the executor so they do not stall the event loop.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   offload_threshold (int): The length of the shortest line transformed in the executor.
+    -   executor (concurrent.futures.Executor): The executor, or None for the default executor of the loop.
+        A ProcessPoolExecutor keeps the long lines from holding the GIL of the loop, and should use the
+        "spawn" or "forkserver" context, since forking a process with a running event loop can hang.
+    -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+    Raises:
+    -   ValueError: If there is no cipher with the given name, or the key is not valid.
+    """
+
+    def __init__(
+        self, name: str, key=None, direction: int = 1, offload_threshold: int = OFFLOAD_THRESHOLD, executor=None, **options
+    ):
+        self.name = name.strip().lower().replace(" ", "_").replace("-", "_")
+        self.key = key
+        self.direction = direction
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+        self.options = tuple(sorted(options.items()))
+        self.cipher = get_cipher(self.name, key, **options)  # raises the key errors before any data is read
+        self.streaming = self.name in STREAMING_CIPHERS
+        self.phase = 0  # the number of letters transformed so far (Vigenere only)
+
+    def transform_bytes(self, data: bytes):
+        """
+        Transforms the next chunk of a byte stream.
+
+        Args:
+        -   data (bytes-like): The next chunk, of any length.
+
+        Returns:
+        -   bytearray: The transformed chunk.
+
+        Raises:
+        -   ValueError: If the cipher does not transform each byte on its own.
+        """
+
+        if not self.streaming:
+            raise ValueError(f"The {self.name} cipher transforms whole lines, not chunks of bytes")
+
+        if self.name == "vigenere":
+            out, self.phase = self.cipher.shift_buffer(data, self.direction, self.phase)
+            return out
+
+        if self.direction == 1:
+            return self.cipher.encrypt_buffer(data)
+
+        return self.cipher.decrypt_buffer(data)
+
+    async def transform_line(self, line: bytes):
+        """
+        Transforms the next line of a stream. The line ending is kept as it is.
+
+        Args:
+        -   line (bytes): The line, with its line ending if it has one.
+
+        Returns:
+        -   bytes: The transformed line.
+        """
+
+        if self.streaming:
+            return bytes(self.transform_bytes(line))
+
+        message = line.rstrip(b"\r\n")
+        ending = line[len(message):]
+
+        if len(message) < self.offload_threshold:
+            return transform_message(self.name, self.key, self.direction, message, self.options) + ending
+
+        loop = asyncio.get_running_loop()
+        transformed = await loop.run_in_executor(
+            self.executor,
+            functools.partial(transform_message, self.name, self.key, self.direction, message, self.options),
+        )
+
+        return transformed + ending
+
+
+class CipherStreamReader:
+    """
+    Wraps an asyncio.StreamReader, encrypting or decrypting what is read from it.
+
+    Iterating over the reader yields chunks of up to BUFFER_CHUNK_SIZE bytes for the byte ciphers, and
+    whole lines for the other ciphers.
+
+    Args:
+    -   reader (asyncio.StreamReader): The wrapped reader.
+    -   transform (CipherTransform): The cipher state of the stream.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, transform: CipherTransform):
+        self.reader = reader
+        self.transform = transform
+
+    async def read(self, n: int = -1):
+        """
+        Reads and transforms up to n bytes, or everything up to the end of the stream if n is -1.
+
+        Args:
+        -   n (int): The number of bytes.
+
+        Returns:
+        -   bytes: The transformed bytes, empty at the end of the stream.
+
+        Raises:
+        -   ValueError: If the cipher transforms whole lines, and n is not -1.
+        """
+
+        if not self.transform.streaming and n != -1:
+            raise ValueError(f"The {self.transform.name} cipher transforms whole lines, use readline()")
+
+        data = await self.reader.read(n)
+
+        if not data:
+            return b""
+
+        return await self.transform.transform_line(data)
+
+    async def readline(self):
+        """
+        Reads and transforms the next line.
+
+        Returns:
+        -   bytes: The transformed line, empty at the end of the stream.
+        """
+
+        line = await self.reader.readline()
+
+        if not line:
+            return b""
+
+        return await self.transform.transform_line(line)
+
+    def at_eof(self):
+        """
+        Returns whether the end of the wrapped stream was reached.
+
+        Returns:
+        -   bool: Whether the end of the stream was reached.
+        """
+
+        return self.reader.at_eof()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        data = await (self.read(BUFFER_CHUNK_SIZE) if self.transform.streaming else self.readline())
+
+        if not data:
+            raise StopAsyncIteration
+
+        return data
+
+
+class CipherStreamWriter:
+    """
+    Wraps an asyncio.StreamWriter, encrypting or decrypting what is written to it.
+
+    The byte ciphers transform the data as soon as it is written. The other ciphers keep the data until a
+    line is complete, and the complete lines are transformed (in the executor when they are long) and
+    written by drain(), so write() never blocks the event loop.
+
+    Args:
+    -   writer (asyncio.StreamWriter): The wrapped writer.
+    -   transform (CipherTransform): The cipher state of the stream.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, transform: CipherTransform):
+        self.writer = writer
+        self.transform = transform
+        self.pending = bytearray()  # the data written since the last complete line (line ciphers only)
+
+    def write(self, data: bytes):
+        """
+        Writes data to the stream. Call drain() to transform and send the complete lines.
+
+        Args:
+        -   data (bytes-like): The data.
+        """
+
+        if self.transform.streaming:
+            self.writer.write(self.transform.transform_bytes(data))
+        else:
+            self.pending += data
+
+    def writelines(self, lines):
+        """
+        Writes a list of lines to the stream.
+
+        Args:
+        -   lines (iterable): The lines, with their line endings.
+        """
+
+        for line in lines:
+            self.write(line)
+
+    async def drain(self):
+        """
+        Transforms and writes the complete lines, and waits until the wrapped writer can take more data.
+        """
+
+        end = self.pending.rfind(b"\n") + 1
+
+        if end:
+            complete = bytes(self.pending[:end])
+            del self.pending[:end]
+
+            for line in complete.splitlines(keepends=True):
+                self.writer.write(await self.transform.transform_line(line))
+
+        await self.writer.drain()
+
+    async def write_eof(self):
+        """
+        Transforms and writes the last line, even if it has no line ending, and closes the write end of
+        the stream.
+        """
+
+        await self.drain()
+
+        if self.pending:
+            self.writer.write(await self.transform.transform_line(bytes(self.pending)))
+            self.pending.clear()
+
+        if self.writer.can_write_eof():
+            self.writer.write_eof()
+
+        await self.writer.drain()
+
+    def close(self):
+        """
+        Closes the wrapped writer. Data that is not a complete line yet is discarded, call write_eof() first.
+        """
+
+        self.writer.close()
+
+    async def wait_closed(self):
+        """
+        Waits until the wrapped writer is closed.
+        """
+
+        await self.writer.wait_closed()
+
+    def get_extra_info(self, name: str, default=None):
+        """
+        Returns information about the transport of the wrapped writer, e.g. "peername".
+
+        Args:
+        -   name (str): The name of the information.
+        -   default: The value returned if the information is not available.
+
+        Returns:
+        -   The information.
+        """
+
+        return self.writer.get_extra_info(name, default)
+
+
+async def pipe(reader: CipherStreamReader, writer: asyncio.StreamWriter):
+    """
+    Copies a transformed stream to a writer until the end of the stream, then closes the write end.
+
+    Args:
+    -   reader (CipherStreamReader): The transformed stream.
+    -   writer (asyncio.StreamWriter): The writer.
+    """
+
+    async for data in reader:
+        writer.write(data)
+        await writer.drain()
+
+    if writer.can_write_eof():
+        writer.write_eof()
+
+
+async def start_proxy(
+    name: str,
+    key,
+    upstream_host: str,
+    upstream_port: int,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    direction: int = 1,
+    offload_threshold: int = OFFLOAD_THRESHOLD,
+    executor=None,
+    **options,
+):
+    """
+    Starts a TCP proxy that encrypts the traffic sent upstream and decrypts the traffic sent back.
+
+    Each connection has its own cipher state in each direction, so the Vigenere key position of one
+    connection does not depend on the others. With direction=-1, the traffic sent upstream is decrypted
+    and the traffic sent back is encrypted, e.g. for the proxy in front of the server.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   upstream_host (str): The host of the upstream server.
+    -   upstream_port (int): The port of the upstream server.
+    -   host (str): The host to listen on.
+    -   port (int): The port to listen on, 0 for any free port.
+    -   direction (int): 1 to encrypt the traffic sent upstream, -1 to decrypt it.
+    -   offload_threshold (int): The length of the shortest line transformed in the executor.
+    -   executor (concurrent.futures.Executor): The executor, or None for the default executor of the loop.
+    -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+    Returns:
+    -   asyncio.Server: The listening server (server.sockets[0].getsockname() is its address).
+
+    Raises:
+    -   ValueError: If there is no cipher with the given name, or the key is not valid.
+    """
+
+    def new_transform(transform_direction):
+        return CipherTransform(name, key, transform_direction, offload_threshold, executor, **options)
+
+    new_transform(direction)  # raises the key errors before the proxy starts listening
+
+    async def handle_connection(client_reader, client_writer):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                upstream_host, upstream_port, limit=MAX_LINE_LENGTH
+            )
+        except OSError:
+            client_writer.close()
+            return
+
+        tasks = [
+            asyncio.ensure_future(pipe(CipherStreamReader(client_reader, new_transform(direction)), upstream_writer)),
+            asyncio.ensure_future(pipe(CipherStreamReader(upstream_reader, new_transform(-direction)), client_writer)),
+        ]
+
+        # If a connection is reset or a line cannot be transformed, the other direction is stopped too
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            for writer in (upstream_writer, client_writer):
+                writer.close()
+
+    return await asyncio.start_server(handle_connection, host, port, limit=MAX_LINE_LENGTH)
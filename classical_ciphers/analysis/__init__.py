@@ -0,0 +1,8 @@
+"""
+Cryptanalysis of the classical ciphers.
+
+Each module recovers the keys of the cipher module with the same name, e.g.
+classical_ciphers.analysis.additive recovers the keys of classical_ciphers.additive.
+The letter histograms and their scoring against English are in classical_ciphers.analysis.frequency.
+NumPy is required by the analysis modules.
+"""
@@ -0,0 +1,60 @@
+from .frequency import (
+    SHIFT_INDEX,
+    PermutationScorer,
+    letter_histogram,
+    rank_scores,
+    stream_letter_histogram,
+)
+
+ADDITIVE_SCORER = PermutationScorer(SHIFT_INDEX)  # the weights of the 26 shifts, calculated once
+
+
+def rank_additive_keys(histogram, method: str = "chi_squared", top: int = 26):
+    """
+    Ranks the 26 additive keys from a single cipher letter histogram.
+    Each key is scored on the histogram rotated by the key, so the text is never decrypted.
+
+    Args:
+    -   histogram (numpy.ndarray): The 26 cipher letter counts.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return.
+
+    Returns:
+    -   list: The (key, score) pairs, best first.
+    """
+
+    scores = ADDITIVE_SCORER.score(histogram, method)
+
+    return [(int(key), float(scores[key])) for key in rank_scores(scores, method, top)]
+
+
+def crack_additive(cipher_text, method: str = "chi_squared", top: int = 26):
+    """
+    Recovers the key of an additive cipher text. A ROT13 text is recovered as the key 13.
+
+    Args:
+    -   cipher_text (str or bytes-like): The cipher text.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return.
+
+    Returns:
+    -   list: The (key, score) pairs, best first. additive_decrypt(cipher_text, key) decrypts the text.
+    """
+
+    return rank_additive_keys(letter_histogram(cipher_text), method, top)
+
+
+def crack_additive_stream(cipher_chunks, method: str = "chi_squared", top: int = 26):
+    """
+    Recovers the key of an additive cipher text stream, counting the letters one chunk at a time.
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text (or bytes) chunks, or a file object to read them from.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return.
+
+    Returns:
+    -   list: The (key, score) pairs, best first.
+    """
+
+    return rank_additive_keys(stream_letter_histogram(cipher_chunks), method, top)
@@ -0,0 +1,92 @@
+import math  # Import math for the greatest common divisor
+
+import numpy as np  # Import numpy for the key index
+
+from .frequency import PermutationScorer, letter_histogram, rank_scores, stream_letter_histogram
+
+# The 12 multipliers that have an inverse modulo 26, found once
+VALID_MULTIPLIERS = tuple(a for a in range(26) if math.gcd(a, 26) == 1)
+
+# All 12 * 26 = 312 keys, in the order of the rows of AFFINE_INDEX
+AFFINE_KEYS = tuple((a, b) for a in VALID_MULTIPLIERS for b in range(26))
+
+# The plain letter p was encrypted to the cipher letter (a * p + b) % 26 (one row per key)
+AFFINE_INDEX = np.array([[(a * p + b) % 26 for p in range(26)] for a, b in AFFINE_KEYS])
+
+AFFINE_SCORER = PermutationScorer(AFFINE_INDEX)  # the weights of the 312 keys, calculated once
+
+
+def rank_affine_keys(histogram, method: str = "chi_squared", top: int = 10):
+    """
+    Ranks the 312 affine keys from a single cipher letter histogram.
+    Each key is scored on the histogram permuted by the key, so the text is never decrypted.
+
+    Args:
+    -   histogram (numpy.ndarray): The 26 cipher letter counts.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return.
+
+    Returns:
+    -   list: The ((a, b), score) pairs, best first.
+    """
+
+    scores = AFFINE_SCORER.score(histogram, method)
+
+    return [(AFFINE_KEYS[i], float(scores[i])) for i in rank_scores(scores, method, top)]
+
+
+def crack_affine(cipher_text, method: str = "chi_squared", top: int = 10):
+    """
+    Recovers the key of an affine cipher text. Multiplicative cipher texts are recovered as the keys (a, 0).
+
+    Args:
+    -   cipher_text (str or bytes-like): The cipher text.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return.
+
+    Returns:
+    -   list: The ((a, b), score) pairs, best first. affine_decrypt(cipher_text, key) decrypts the text.
+    """
+
+    return rank_affine_keys(letter_histogram(cipher_text), method, top)
+
+
+def crack_affine_stream(cipher_chunks, method: str = "chi_squared", top: int = 10):
+    """
+    Recovers the key of an affine cipher text stream, counting the letters one chunk at a time.
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text (or bytes) chunks, or a file object to read them from.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return.
+
+    Returns:
+    -   list: The ((a, b), score) pairs, best first.
+    """
+
+    return rank_affine_keys(stream_letter_histogram(cipher_chunks), method, top)
+
+
+def crack_affine_batch(cipher_texts: list, method: str = "chi_squared", top: int = 1):
+    """
+    Recovers the keys of many affine cipher texts, scoring all their keys with a single array operation.
+
+    Args:
+    -   cipher_texts (list): The cipher texts (str or bytes-like).
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   top (int): The number of keys to return for each text.
+
+    Returns:
+    -   list: For each text, the ((a, b), score) pairs, best first.
+    """
+
+    if not cipher_texts:
+        return []
+
+    histograms = np.stack([letter_histogram(cipher_text) for cipher_text in cipher_texts])
+    scores = AFFINE_SCORER.score(histograms, method)  # one row of 312 scores per text
+
+    return [
+        [(AFFINE_KEYS[i], float(text_scores[i])) for i in rank_scores(text_scores, method, top)]
+        for text_scores in scores
+    ]
@@ -0,0 +1,196 @@
+import numpy as np  # Import numpy for the histograms
+
+from ..common import iterate_chunks
+
+# The relative frequency of each letter in English text (A to Z)
+ENGLISH_FREQUENCIES = np.array(
+    [
+        0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+        0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+        0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+        0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+    ]
+)
+ENGLISH_FREQUENCIES /= ENGLISH_FREQUENCIES.sum()
+
+ENGLISH_LOG_FREQUENCIES = np.log(ENGLISH_FREQUENCIES)
+
+# The relative frequency of the most common English bigrams (about half of all the bigrams)
+ENGLISH_BIGRAMS = {
+    "TH": 0.0356, "HE": 0.0307, "IN": 0.0243, "ER": 0.0205, "AN": 0.0199, "RE": 0.0185, "ON": 0.0176,
+    "AT": 0.0149, "EN": 0.0145, "ND": 0.0135, "TI": 0.0134, "ES": 0.0134, "OR": 0.0128, "TE": 0.0120,
+    "OF": 0.0117, "ED": 0.0117, "IS": 0.0113, "IT": 0.0112, "AL": 0.0109, "AR": 0.0107, "ST": 0.0105,
+    "TO": 0.0104, "NT": 0.0104, "NG": 0.0095, "SE": 0.0093, "HA": 0.0093, "AS": 0.0087, "OU": 0.0087,
+    "IO": 0.0083, "LE": 0.0083, "VE": 0.0083, "CO": 0.0079, "ME": 0.0079, "DE": 0.0076, "HI": 0.0076,
+    "RI": 0.0073, "RO": 0.0073, "IC": 0.0070, "NE": 0.0069, "EA": 0.0069, "RA": 0.0069, "CE": 0.0065,
+}
+
+
+def bigram_log_frequencies():
+    """
+    Builds the log frequency of every bigram, sharing the rest of the frequency evenly between the
+    bigrams that are not in ENGLISH_BIGRAMS.
+
+    Returns:
+    -   numpy.ndarray: The log frequencies, one row per first letter and one column per second letter.
+    """
+
+    other_frequency = (1 - sum(ENGLISH_BIGRAMS.values())) / (26 * 26 - len(ENGLISH_BIGRAMS))
+    frequencies = np.full((26, 26), other_frequency)
+
+    for bigram, frequency in ENGLISH_BIGRAMS.items():
+        frequencies[ord(bigram[0]) - 65, ord(bigram[1]) - 65] = frequency
+
+    return np.log(frequencies)
+
+
+ENGLISH_BIGRAM_LOG_FREQUENCIES = bigram_log_frequencies()
+
+# The plain letter p decrypted with the shift k was the cipher letter (p + k) % 26 (one row per shift)
+SHIFT_INDEX = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+
+SCORING_METHODS = ("chi_squared", "log_likelihood")
+
+STREAM_CHUNK_SIZE = 1 << 20  # the number of characters read at a time from a file object
+
+
+def letter_values(text):
+    """
+    Converts the ASCII letters of a text to their numbers (A = 0, B = 1, ...), dropping every other character.
+
+    Args:
+    -   text (str or bytes-like): The text.
+
+    Returns:
+    -   numpy.ndarray: The uint8 numbers of the letters.
+    """
+
+    if isinstance(text, str):
+        text = text.encode("utf-8")  # the non ASCII characters become bytes above 127, which are not letters
+
+    values = np.frombuffer(text, dtype=np.uint8)
+
+    # Letters are found by folding them to lower case (setting the 0x20 bit)
+    folded = values | 0x20
+    is_letter = (folded >= 97) & (folded <= 122)
+
+    return folded[is_letter] - 97
+
+
+def letter_histogram(text):
+    """
+    Counts each ASCII letter of a text, ignoring the case.
+
+    Args:
+    -   text (str or bytes-like): The text.
+
+    Returns:
+    -   numpy.ndarray: The 26 letter counts (A to Z).
+    """
+
+    if isinstance(text, str):
+        text = text.encode("utf-8")  # the non ASCII characters become bytes above 127, which are not letters
+
+    values = np.frombuffer(text, dtype=np.uint8)
+    byte_counts = np.zeros(256, dtype=np.int64)
+
+    # Count all 256 byte values, then add the lower case letters to the upper case letters.
+    # bincount() widens its input to 64 bits, so long texts are counted in slices to bound the memory
+    for start in range(0, len(values), STREAM_CHUNK_SIZE):
+        byte_counts += np.bincount(values[start : start + STREAM_CHUNK_SIZE], minlength=256)
+
+    return (byte_counts[65:91] + byte_counts[97:123]).astype(np.int64)
+
+
+def stream_letter_histogram(chunks):
+    """
+    Counts each ASCII letter of a stream of text, one chunk at a time.
+
+    Args:
+    -   chunks (iterable or file): The text (or bytes) chunks, or a file object to read them from.
+
+    Returns:
+    -   numpy.ndarray: The 26 letter counts (A to Z).
+    """
+
+    histogram = np.zeros(26, dtype=np.int64)
+
+    # Only one chunk is held in memory, so the stream can be many gigabytes long
+    for chunk in iterate_chunks(chunks, STREAM_CHUNK_SIZE):
+        histogram += letter_histogram(chunk)
+
+    return histogram
+
+
+class PermutationScorer:
+    """
+    Scores the candidate keys of a substitution cipher from cipher letter histograms.
+
+    The histogram of the text decrypted with a key is the cipher histogram read in the order of the key,
+    so the score of every key is a fixed weighted sum of the cipher letter counts. The weights of all the
+    keys are calculated once, and scoring a histogram is a single matrix product that never decrypts the text.
+
+    Args:
+    -   plain_to_cipher (numpy.ndarray): For each candidate key (row), the cipher letter of each plain letter.
+    """
+
+    def __init__(self, plain_to_cipher):
+        plain_to_cipher = np.asarray(plain_to_cipher)
+        rows = np.arange(len(plain_to_cipher))[:, None]
+
+        # The weight of a cipher letter is the weight of the plain letter it is decrypted to
+        self.inverse_frequency_weights = np.zeros(plain_to_cipher.shape)
+        self.inverse_frequency_weights[rows, plain_to_cipher] = 1 / ENGLISH_FREQUENCIES
+
+        self.log_frequency_weights = np.zeros(plain_to_cipher.shape)
+        self.log_frequency_weights[rows, plain_to_cipher] = ENGLISH_LOG_FREQUENCIES
+
+    def score(self, histograms, method: str = "chi_squared"):
+        """
+        Scores every candidate key.
+
+        Args:
+        -   histograms (numpy.ndarray): The 26 cipher letter counts, or one histogram per row for many texts.
+        -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+
+        Returns:
+        -   numpy.ndarray: The score of each key (one row of scores per text for many texts).
+
+        Raises:
+        -   ValueError: If the method is not known.
+        """
+
+        histograms = np.asarray(histograms, dtype=np.float64)
+
+        if method == "chi_squared":
+            # sum((o - n * f) ** 2 / (n * f)) is sum(o ** 2 / f) / n - n, as the counts add up to n
+            totals = histograms.sum(axis=-1, keepdims=True)
+            scores = (histograms**2 @ self.inverse_frequency_weights.T) / np.maximum(totals, 1)
+
+            return scores - totals
+
+        if method == "log_likelihood":
+            return histograms @ self.log_frequency_weights.T
+
+        raise ValueError(
+            f"Unknown scoring method {method!r}, expected one of: {', '.join(SCORING_METHODS)}"
+        )
+
+
+def rank_scores(scores, method: str = "chi_squared", top: int = None):
+    """
+    Orders the candidates from the best score to the worst.
+
+    Args:
+    -   scores (numpy.ndarray): The score of each candidate.
+    -   method (str): The method of the scores, which decides whether lower or higher is better.
+    -   top (int): The number of candidates to return, all of them by default.
+
+    Returns:
+    -   numpy.ndarray: The indices of the candidates, best first.
+    """
+
+    # A stable sort keeps the smaller keys first when the scores are equal
+    order = np.argsort(scores if method == "chi_squared" else -scores, kind="stable")
+
+    return order[:top]
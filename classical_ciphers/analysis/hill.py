@@ -0,0 +1,453 @@
+import os  # Import os to find the number of cores and the key table file
+from concurrent.futures import ProcessPoolExecutor  # Import ProcessPoolExecutor to crack many texts at once
+from functools import lru_cache, partial  # Import lru_cache to load the key table once per process
+
+import numpy as np  # Import numpy for the block matrices
+
+from .frequency import ENGLISH_BIGRAM_LOG_FREQUENCIES, PermutationScorer
+
+# The inverse of each number modulo 2 and modulo 13 (0 has no inverse and is never used as a pivot)
+PRIME_INVERSES = {
+    prime: np.array([0] + [pow(value, -1, prime) for value in range(1, prime)], dtype=np.int64)
+    for prime in (2, 13)
+}
+
+# The inverse of each determinant modulo 26 (0 when it has none)
+DETERMINANT_INVERSES = np.array([pow(value, -1, 26) if value % 2 and value != 13 else 0 for value in range(26)])
+
+LETTER_NUMBERS = np.arange(26)  # the numbers of the letters A to Z
+PRODUCTS = np.multiply.outer(LETTER_NUMBERS, LETTER_NUMBERS) % 26  # PRODUCTS[x, u] is x * u % 26
+
+# The plain letter (x * u + y * v) % 26 of the decryption row (x, y) for the cipher block (u, v), one row per
+# decryption row x * 26 + y and one column per cipher block u * 26 + v
+ROW_LETTERS_2X2 = (np.add.outer(PRODUCTS, PRODUCTS) % 26).transpose(0, 2, 1, 3).reshape(676, 676)
+
+# The same letters offset by 26 * row, so one bincount() counts the letters of every row
+ROW_BINS_2X2 = ROW_LETTERS_2X2 + np.arange(676)[:, None] * 26
+
+PLAIN_SCORER = PermutationScorer(LETTER_NUMBERS[None])  # scores plain letter histograms directly
+
+
+def text_values(text: str):
+    """
+    Converts a text to its numbers modulo 26 (A = 0), the same way as hill_encrypt() does.
+
+    Args:
+    -   text (str): The text.
+
+    Returns:
+    -   numpy.ndarray: The int64 number of each character.
+    """
+
+    codes = np.frombuffer(text.upper().encode("utf-32-le"), dtype="<u4").astype(np.int64)
+
+    return (codes - 65) % 26
+
+
+def plain_blocks(plain_text: str, matrix_size: int):
+    """
+    Splits a plain text into its blocks, one block of matrix size characters per column.
+
+    Args:
+    -   plain_text (str): The plain text, a multiple of the matrix size long.
+    -   matrix_size (int): The size of the key matrix.
+
+    Returns:
+    -   numpy.ndarray: The plain matrix (matrix_size rows, one column per block).
+    """
+
+    return text_values(plain_text).reshape(-1, matrix_size).T
+
+
+def cipher_blocks(cipher_text: str, matrix_size: int):
+    """
+    Splits a cipher text returned by hill_encrypt() into its blocks.
+    hill_encrypt() writes the encrypted matrix row by row, so row r of the cipher matrix is the r-th
+    part of the cipher text and the blocks are its columns.
+
+    Args:
+    -   cipher_text (str): The cipher text, a multiple of the matrix size long.
+    -   matrix_size (int): The size of the key matrix.
+
+    Returns:
+    -   numpy.ndarray: The cipher matrix (matrix_size rows, one column per block).
+    """
+
+    return text_values(cipher_text).reshape(matrix_size, -1)
+
+
+def solve_mod_prime(coefficients, constants, prime: int):
+    """
+    Solves many systems of linear equations modulo a prime at once with Gauss-Jordan elimination.
+
+    Each system coefficients[i] @ x = constants[i] may have more equations than unknowns. The extra
+    equations must agree with the solution, and the coefficients must have full column rank.
+
+    Args:
+    -   coefficients (numpy.ndarray): The coefficients, shape (systems, equations, unknowns).
+    -   constants (numpy.ndarray): The right hand sides, shape (systems, equations, columns).
+    -   prime (int): The prime modulus (2 or 13).
+
+    Returns:
+    -   tuple: A tuple containing the solutions, shape (systems, unknowns, columns), and a boolean array
+        telling which systems have a unique and consistent solution.
+    """
+
+    inverses = PRIME_INVERSES[prime]
+    systems_count, equations, unknowns = coefficients.shape
+
+    # With fewer equations than unknowns, no system has a unique solution
+    if equations < unknowns:
+        return (
+            np.zeros((systems_count, unknowns, constants.shape[2]), dtype=np.int64),
+            np.zeros(systems_count, dtype=bool),
+        )
+
+    # Put the constants next to the coefficients
+    rows = np.concatenate([coefficients, constants], axis=2).astype(np.int64) % prime
+    systems = np.arange(systems_count)
+    solved = np.ones(systems_count, dtype=bool)
+
+    for k in range(unknowns):
+        # Find a row at or below k with a non zero value in the column, every non zero value is invertible
+        is_nonzero = rows[:, k:, k] != 0
+        solved &= is_nonzero.any(axis=1)
+        pivot_rows = k + np.argmax(is_nonzero, axis=1)
+
+        # Swap the pivot row with row k in every system
+        pivot = rows[systems, pivot_rows].copy()
+        rows[systems, pivot_rows] = rows[systems, k]
+
+        # Scale the pivot row so the pivot becomes 1
+        pivot = pivot * inverses[pivot[:, k]][:, None] % prime
+        rows[systems, k] = pivot
+
+        # Eliminate the column from every other row
+        factors = rows[:, :, k].copy()
+        factors[:, k] = 0
+        rows = (rows - factors[:, :, None] * pivot[:, None, :]) % prime
+
+    # The extra equations are all zero on the left, so they must be zero on the right as well
+    solved &= (rows[:, unknowns:, unknowns:] == 0).all(axis=(1, 2))
+
+    return rows[:, :unknowns, unknowns:], solved
+
+
+def solve_key_matrices(plain_matrices, cipher_matrices):
+    """
+    Solves cipher_matrix = key_matrix @ plain_matrix modulo 26 for many pairs of block matrices at once.
+
+    26 = 2 * 13, so the key is solved modulo 2 and modulo 13, where every non zero pivot is invertible,
+    and the two solutions are combined with the Chinese remainder theorem. A block matrix only has to
+    have full rank modulo 2 and modulo 13, so more blocks than the matrix size can be used.
+
+    Args:
+    -   plain_matrices (numpy.ndarray): The plain block matrices, shape (systems, matrix_size, blocks).
+    -   cipher_matrices (numpy.ndarray): The cipher block matrices, shape (systems, matrix_size, blocks).
+
+    Returns:
+    -   tuple: A tuple containing the key matrices, shape (systems, matrix_size, matrix_size), and a
+        boolean array telling which key matrices are determined by their blocks.
+    """
+
+    # key @ plain = cipher is plain.T @ key.T = cipher.T, one equation per block
+    coefficients = np.swapaxes(plain_matrices, 1, 2)
+    constants = np.swapaxes(cipher_matrices, 1, 2)
+
+    key_mod_2, solved_mod_2 = solve_mod_prime(coefficients, constants, 2)
+    key_mod_13, solved_mod_13 = solve_mod_prime(coefficients, constants, 13)
+
+    # Combine them modulo 26 (13 is 1 modulo 2 and 0 modulo 13, 14 is 0 modulo 2 and 1 modulo 13)
+    key_matrices = np.swapaxes((13 * key_mod_2 + 14 * key_mod_13) % 26, 1, 2)
+
+    return key_matrices, solved_mod_2 & solved_mod_13
+
+
+def solve_block_subsets(plain_matrix, cipher_matrix, subsets):
+    """
+    Solves the key matrix from many candidate subsets of the blocks at once.
+
+    Args:
+    -   plain_matrix (numpy.ndarray): The plain block matrix returned by plain_blocks().
+    -   cipher_matrix (numpy.ndarray): The cipher block matrix returned by cipher_blocks().
+    -   subsets (numpy.ndarray): The block indices of each subset, shape (subsets, blocks per subset).
+
+    Returns:
+    -   tuple: A tuple containing the key matrix of each subset and a boolean array telling which
+        subsets determine their key matrix.
+    """
+
+    subsets = np.asarray(subsets)
+
+    # Gather the columns of each subset, shape (subsets, matrix_size, blocks per subset)
+    plain_matrices = np.swapaxes(plain_matrix.T[subsets], 1, 2)
+    cipher_matrices = np.swapaxes(cipher_matrix.T[subsets], 1, 2)
+
+    return solve_key_matrices(plain_matrices, cipher_matrices)
+
+
+def crack_hill_known_plaintext(plain_texts, cipher_texts, matrix_size: int):
+    """
+    Recovers the key of the Hill cipher from plain texts and the cipher texts returned by hill_encrypt().
+
+    The blocks of all the pairs are used together, so the key is found as long as the blocks have full
+    rank modulo 2 and modulo 13, even when no matrix size blocks are invertible modulo 26 on their own.
+
+    Args:
+    -   plain_texts (str or list): The plain text, or a list of plain texts.
+    -   cipher_texts (str or list): The cipher text, or a list of cipher texts of the same lengths.
+    -   matrix_size (int): The size of the key matrix.
+
+    Returns:
+    -   str: The key text. hill_encrypt(key_text, plain_text) returns the cipher text.
+
+    Raises:
+    -   ValueError: If the texts do not match, or their blocks do not determine the key.
+    """
+
+    if isinstance(plain_texts, str):
+        plain_texts, cipher_texts = [plain_texts], [cipher_texts]
+
+    if len(plain_texts) != len(cipher_texts):
+        raise ValueError("There must be one cipher text for each plain text")
+
+    plain_matrices = []
+    cipher_matrices = []
+
+    for plain_text, cipher_text in zip(plain_texts, cipher_texts):
+        # If the lengths do not match, the texts are not a pair
+        if len(plain_text) != len(cipher_text) or len(plain_text) % matrix_size != 0:
+            raise ValueError(
+                "Each plain text and cipher text must have the same length, a multiple of the matrix size"
+            )
+
+        plain_matrices.append(plain_blocks(plain_text, matrix_size))
+        cipher_matrices.append(cipher_blocks(cipher_text, matrix_size))
+
+    # Solve a single system with the blocks of every pair
+    key_matrices, solved = solve_key_matrices(
+        np.concatenate(plain_matrices, axis=1)[None], np.concatenate(cipher_matrices, axis=1)[None]
+    )
+
+    if not solved[0]:
+        raise ValueError(
+            "The blocks do not determine the key (they are not independent modulo 2 and 13, or do not match a key)"
+        )
+
+    return "".join(chr(value + 65) for value in key_matrices[0].reshape(-1))
+
+
+@lru_cache(maxsize=None)
+def invertible_2x2_keys(path: str = None):
+    """
+    Lists every 2x2 key matrix that has an inverse modulo 26, 157,248 of the 26 ** 4 matrices.
+
+    The table takes 4 bytes per key (614 KiB). With a path, it is saved to the file the first time and
+    memory mapped, so every process that loads it shares the same pages instead of building its own copy.
+
+    Args:
+    -   path (str): The .npy file of the table, written if it does not exist. By default the table is only
+        kept in memory.
+
+    Returns:
+    -   numpy.ndarray: The read only uint8 keys, one row (a, b, c, d) per matrix [[a, b], [c, d]], in order.
+    """
+
+    if path is not None and os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    keys = np.indices((26, 26, 26, 26), dtype=np.uint8).reshape(4, -1).T
+    a, b, c, d = keys.T.astype(np.int64)
+    table = np.ascontiguousarray(keys[DETERMINANT_INVERSES[(a * d - b * c) % 26] != 0])
+
+    if path is None:
+        table.flags.writeable = False
+        return table
+
+    # Write to a temporary file first, so another process never maps a partly written table
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "wb") as file:
+        np.save(file, table)
+
+    os.replace(temporary_path, path)
+
+    return np.load(path, mmap_mode="r")
+
+
+def invert_2x2_keys(keys):
+    """
+    Inverts many 2x2 key matrices modulo 26 at once with their adjugates.
+
+    Args:
+    -   keys (numpy.ndarray): The invertible keys, one row (a, b, c, d) per matrix [[a, b], [c, d]].
+
+    Returns:
+    -   numpy.ndarray: The inverse keys, in the same layout.
+    """
+
+    a, b, c, d = np.asarray(keys, dtype=np.int64).T
+    determinant_inverses = DETERMINANT_INVERSES[(a * d - b * c) % 26]
+
+    return np.stack([d, -b, -c, a], axis=1) * determinant_inverses[:, None] % 26
+
+
+def block_histogram_2x2(cipher_text: str):
+    """
+    Counts the 676 different cipher blocks of a cipher text returned by hill_encrypt() with a 2x2 key.
+    Every plain letter depends on its cipher block only, so the counts stand for the whole text.
+
+    Args:
+    -   cipher_text (str): The cipher text, an even number of letters long.
+
+    Returns:
+    -   numpy.ndarray: The count of each cipher block (u, v) at u * 26 + v.
+    """
+
+    cipher_matrix = cipher_blocks(cipher_text, 2)
+
+    return np.bincount(cipher_matrix[0] * 26 + cipher_matrix[1], minlength=676)
+
+
+def score_2x2_rows(block_counts, method: str = "chi_squared"):
+    """
+    Scores the 676 rows of the decryption matrix on their own.
+
+    Plain row i of a block is the dot product of row i of the decryption matrix with the cipher block, so
+    each row decrypts every other plain letter without the other row. Both rows decrypt English letters,
+    so the same 676 scores rank the candidates of the first and the second row.
+
+    Args:
+    -   block_counts (numpy.ndarray): The cipher block counts returned by block_histogram_2x2().
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+
+    Returns:
+    -   numpy.ndarray: The score of each row (x, y) at x * 26 + y.
+    """
+
+    # The plain letter histogram of every row with a single bincount()
+    weights = np.broadcast_to(block_counts, ROW_BINS_2X2.shape)
+    histograms = np.bincount(ROW_BINS_2X2.ravel(), weights.ravel(), minlength=676 * 26).reshape(676, 26)
+
+    return PLAIN_SCORER.score(histograms, method)[:, 0]
+
+
+def score_2x2_bigrams(decryption_keys, block_counts):
+    """
+    Scores whole decryption matrices on the English bigrams of their plain blocks. Unlike the letter
+    frequencies, the bigrams tell the two orders of the same pair of rows apart (TH instead of HT).
+
+    Args:
+    -   decryption_keys (numpy.ndarray): The decryption keys, one row (a, b, c, d) per matrix.
+    -   block_counts (numpy.ndarray): The cipher block counts returned by block_histogram_2x2().
+
+    Returns:
+    -   numpy.ndarray: The bigram log likelihood of each key (higher is better).
+    """
+
+    decryption_keys = np.asarray(decryption_keys, dtype=np.intp)
+
+    # The first and the second plain letter of each cipher block, one row per key
+    first_letters = ROW_LETTERS_2X2[decryption_keys[:, 0] * 26 + decryption_keys[:, 1]]
+    second_letters = ROW_LETTERS_2X2[decryption_keys[:, 2] * 26 + decryption_keys[:, 3]]
+
+    return ENGLISH_BIGRAM_LOG_FREQUENCIES[first_letters, second_letters] @ block_counts
+
+
+def crack_hill_2x2(
+    cipher_text: str, method: str = "chi_squared", top: int = 10, candidates: int = 1000, key_table_path: str = None
+):
+    """
+    Recovers a 2x2 key of the Hill cipher from a cipher text alone.
+
+    The cipher text is reduced to its 676 block counts, the 676 decryption rows are scored on the
+    letter frequencies of their plain letters, and every invertible key of the table is scored as the sum
+    of its two rows. The best candidates are ranked again on the bigrams of their plain blocks.
+
+    Args:
+    -   cipher_text (str): The cipher text returned by hill_encrypt(), an even number of letters long.
+    -   method (str): The scoring method of the rows, "chi_squared" or "log_likelihood".
+    -   top (int): The number of keys to return.
+    -   candidates (int): The number of keys ranked again on their bigrams.
+    -   key_table_path (str): The .npy file of the key table (see invertible_2x2_keys()).
+
+    Returns:
+    -   list: The (key_text, score) pairs, best first, scored by their bigram log likelihood (higher is
+        better). hill_encrypt(key_text, plain_text) returns the cipher text.
+
+    Raises:
+    -   ValueError: If the cipher text is empty or has an odd length.
+    """
+
+    if not cipher_text or len(cipher_text) % 2 != 0:
+        raise ValueError("The cipher text must be an even number of letters long (a multiple of the matrix size)")
+
+    block_counts = block_histogram_2x2(cipher_text)
+    row_scores = score_2x2_rows(block_counts, method)
+
+    # The score of a key is the score of its first row plus the score of its second row
+    table = invertible_2x2_keys(key_table_path)
+    key_scores = (
+        row_scores[table[:, 0] * np.intp(26) + table[:, 1]] + row_scores[table[:, 2] * np.intp(26) + table[:, 3]]
+    )
+
+    # Keep the best candidates without sorting the whole table
+    if method != "chi_squared":
+        key_scores = -key_scores
+
+    candidates = min(candidates, len(table))
+    shortlist = table[np.argpartition(key_scores, candidates - 1)[:candidates]]
+
+    bigram_scores = score_2x2_bigrams(shortlist, block_counts)
+    order = np.argsort(-bigram_scores, kind="stable")[:top]
+
+    # The table holds the decryption keys, the encryption keys are their inverses
+    keys = invert_2x2_keys(shortlist[order])
+
+    return [
+        ("".join(chr(value + 65) for value in key), float(score)) for key, score in zip(keys, bigram_scores[order])
+    ]
+
+
+def crack_hill_2x2_batch(
+    cipher_texts: list,
+    method: str = "chi_squared",
+    top: int = 1,
+    candidates: int = 1000,
+    workers: int = None,
+    key_table_path: str = None,
+):
+    """
+    Recovers the 2x2 keys of many Hill cipher texts across a pool of worker processes.
+
+    With a key table path, the table is written once before the workers start, and each worker memory maps
+    the same file instead of building its own copy.
+
+    Args:
+    -   cipher_texts (list): The cipher texts returned by hill_encrypt().
+    -   method (str): The scoring method of the rows, "chi_squared" or "log_likelihood".
+    -   top (int): The number of keys to return for each text.
+    -   candidates (int): The number of keys ranked again on their bigrams.
+    -   workers (int): The number of worker processes, the number of cores by default.
+    -   key_table_path (str): The .npy file of the key table (see invertible_2x2_keys()).
+
+    Returns:
+    -   list: For each text, the (key_text, score) pairs, best first.
+
+    Raises:
+    -   ValueError: If a cipher text is empty or has an odd length.
+    """
+
+    if not cipher_texts:
+        return []
+
+    invertible_2x2_keys(key_table_path)  # builds (or writes) the table once, before the workers load it
+
+    crack = partial(crack_hill_2x2, method=method, top=top, candidates=candidates, key_table_path=key_table_path)
+    workers = min(workers or os.cpu_count() or 1, len(cipher_texts))
+
+    if workers <= 1:
+        return [crack(cipher_text) for cipher_text in cipher_texts]
+
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(crack, cipher_texts, chunksize=max(len(cipher_texts) // (workers * 4), 1)))
@@ -0,0 +1,507 @@
+import math  # Import math for the acceptance probability
+import os  # Import os to find the number of cores
+import random  # Import random for the mutations of the keys
+import time  # Import time for the time budget
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # Import them to run the restarts
+
+import numpy as np  # Import numpy for the decryptions and the quadgram table
+
+from ..common import iterate_chunks
+from .frequency import STREAM_CHUNK_SIZE, letter_values
+
+QUADGRAM_COUNT = 26**4  # one entry of the flat table for each quadgram, at a * 26 ** 3 + b * 26 ** 2 + c * 26 + d
+
+# The start and end temperature of the annealing per letter of the cipher text (the scores are log10 sums)
+START_TEMPERATURE = 0.035
+END_TEMPERATURE = 0.02
+
+PLAYFAIR_LETTERS = np.array([letter for letter in range(26) if letter != 9])  # the 25 letters, J is omitted
+
+# The row, the column, the cell to the left and the cell above each of the 25 cells of the matrix
+CELLS = np.arange(25)
+CELL_ROWS = CELLS // 5
+CELL_COLUMNS = CELLS % 5
+CELL_LEFT = CELL_ROWS * 5 + (CELL_COLUMNS - 1) % 5
+CELL_ABOVE = (CELL_ROWS - 1) % 5 * 5 + CELL_COLUMNS
+
+
+def cell_permutations():
+    """
+    Lists the rearrangements of the whole matrix used as mutations: every swap of two rows, every swap of
+    two columns, flipping the rows, flipping the columns and reversing the key.
+
+    Returns:
+    -   list: The permutations, key[permutation] is the rearranged key.
+    """
+
+    grid = CELLS.reshape(5, 5)
+    permutations = []
+
+    for i in range(5):
+        for j in range(i + 1, 5):
+            rows = list(range(5))
+            rows[i], rows[j] = j, i
+            permutations.append(grid[rows].ravel())
+            permutations.append(grid[:, rows].ravel())
+
+    permutations.append(grid[::-1].ravel())
+    permutations.append(grid[:, ::-1].ravel())
+    permutations.append(CELLS[::-1])
+
+    return permutations
+
+
+CELL_PERMUTATIONS = cell_permutations()
+
+
+def plain_cell_pairs():
+    """
+    Decrypts every pair of cells of the matrix: the cells to the left of a pair in the same row, the
+    cells above a pair in the same column, or the opposite corners of the rectangle of the pair.
+
+    Returns:
+    -   tuple: The first and the second plain cell of each cipher cell pair (c1, c2), at c1 * 25 + c2.
+    """
+
+    rows_1, rows_2 = CELL_ROWS[:, None], CELL_ROWS[None, :]
+    columns_1, columns_2 = CELL_COLUMNS[:, None], CELL_COLUMNS[None, :]
+    same_row = rows_1 == rows_2
+    same_column = columns_1 == columns_2
+
+    cells_1 = np.where(
+        same_row, CELL_LEFT[:, None], np.where(same_column, CELL_ABOVE[:, None], rows_1 * 5 + columns_2)
+    )
+    cells_2 = np.where(
+        same_row, CELL_LEFT[None, :], np.where(same_column, CELL_ABOVE[None, :], rows_2 * 5 + columns_1)
+    )
+
+    return cells_1.ravel(), cells_2.ravel()
+
+
+PLAIN_CELLS_1, PLAIN_CELLS_2 = plain_cell_pairs()
+
+worker_tables = {}  # the quadgram table of a worker process, set by load_worker_table()
+
+
+def build_quadgram_table(corpus_chunks, floor: float = 0.01):
+    """
+    Counts the quadgrams of an English corpus into a flat table of log10 probabilities.
+
+    Args:
+    -   corpus_chunks (str, iterable or file): The corpus text (or bytes), its chunks, or a file object to read.
+    -   floor (float): The count given to the quadgrams that never appear in the corpus.
+
+    Returns:
+    -   numpy.ndarray: The float32 log10 probability of each quadgram (QUADGRAM_COUNT entries).
+
+    Raises:
+    -   ValueError: If the corpus has fewer than four letters.
+    """
+
+    counts = np.zeros(QUADGRAM_COUNT, dtype=np.int64)
+    tail = np.zeros(0, dtype=np.uint8)  # the last three letters of the previous chunk
+
+    for chunk in iterate_chunks(corpus_chunks, STREAM_CHUNK_SIZE):
+        values = np.concatenate([tail, letter_values(chunk)])
+
+        if len(values) >= 4:
+            counts += np.bincount(quadgram_indices(values), minlength=QUADGRAM_COUNT)
+
+        tail = values[-3:]
+
+    total = counts.sum()
+
+    if total == 0:
+        raise ValueError("The corpus must have at least four letters")
+
+    return np.log10(np.where(counts > 0, counts, floor) / total).astype(np.float32)
+
+
+def save_quadgram_table(table, path: str):
+    """
+    Saves a quadgram table to a .npy file, which load_quadgram_table() memory maps.
+
+    Args:
+    -   table (numpy.ndarray): The table returned by build_quadgram_table().
+    -   path (str): The path of the file.
+    """
+
+    with open(path, "wb") as file:
+        np.save(file, np.asarray(table, dtype=np.float32))
+
+
+def load_quadgram_table(path: str):
+    """
+    Memory maps a quadgram table saved by save_quadgram_table(), so the processes share its pages.
+
+    Args:
+    -   path (str): The path of the file.
+
+    Returns:
+    -   numpy.ndarray: The read only table.
+
+    Raises:
+    -   ValueError: If the file does not hold a quadgram table.
+    """
+
+    table = np.load(path, mmap_mode="r")
+
+    if table.shape != (QUADGRAM_COUNT,):
+        raise ValueError(f"A quadgram table must have {QUADGRAM_COUNT} entries, the file has {table.shape}")
+
+    return table
+
+
+def quadgram_indices(values):
+    """
+    Finds the index of every quadgram of a text in the flat quadgram table.
+
+    Args:
+    -   values (numpy.ndarray): The letter numbers (A = 0), at least four of them.
+
+    Returns:
+    -   numpy.ndarray: The index of each of the len(values) - 3 quadgrams.
+    """
+
+    values = values.astype(np.intp, copy=False)  # the uint8 letters would overflow
+
+    return ((values[:-3] * 26 + values[1:-2]) * 26 + values[2:-1]) * 26 + values[3:]
+
+
+def playfair_values(cipher_text):
+    """
+    Converts a Playfair cipher text to the letter pairs the solver decrypts, with J read as I.
+
+    Args:
+    -   cipher_text (str or bytes-like): The cipher text returned by playfair_encrypt().
+
+    Returns:
+    -   tuple: The first and the second letter number of each pair.
+
+    Raises:
+    -   ValueError: If the cipher text does not have an even number of at least four letters.
+    """
+
+    values = letter_values(cipher_text)
+    values[values == 9] = 8
+
+    if len(values) < 4 or len(values) % 2 != 0:
+        raise ValueError("The cipher text must have an even number of at least four letters")
+
+    return values[0::2].copy(), values[1::2].copy()
+
+
+class PlayfairKeyState:
+    """
+    A Playfair key being mutated by the solver, kept as two position arrays that are updated together:
+    the letter in each cell of the matrix, and the cell of each letter.
+
+    A swap of two letters updates two entries of each array, and a rearrangement of the whole matrix
+    updates at most 25 of them, so no mutation ever rebuilds the matrix from a key text.
+
+    Args:
+    -   key (numpy.ndarray): The letter number in each of the 25 cells, row by row.
+    """
+
+    def __init__(self, key):
+        self.key = np.array(key, dtype=np.intp)
+        self.cells = np.zeros(26, dtype=np.intp)
+        self.cells[self.key] = CELLS
+
+    def swap_letters(self, cell_1: int, cell_2: int):
+        """
+        Swaps the letters of two cells.
+
+        Args:
+        -   cell_1 (int): The first cell.
+        -   cell_2 (int): The second cell.
+        """
+
+        letter_1, letter_2 = self.key[cell_1], self.key[cell_2]
+        self.key[cell_1], self.key[cell_2] = letter_2, letter_1
+        self.cells[letter_1], self.cells[letter_2] = cell_2, cell_1
+
+    def rearrange(self, permutation):
+        """
+        Rearranges the whole matrix.
+
+        Args:
+        -   permutation (numpy.ndarray): One of CELL_PERMUTATIONS.
+        """
+
+        self.key = self.key[permutation]
+        self.cells[self.key] = CELLS
+
+    def mutate(self, rng: random.Random):
+        """
+        Applies a random mutation: a swap of two letters nine times out of ten, otherwise a swap of two
+        rows or columns, a flip of the rows or columns, or the reverse of the key.
+
+        Args:
+        -   rng (random.Random): The random number generator.
+
+        Returns:
+        -   tuple: The mutation, which undo() reverts.
+        """
+
+        if rng.random() < 0.9:
+            cell_1, cell_2 = rng.sample(range(25), 2)
+            self.swap_letters(cell_1, cell_2)
+
+            return ("swap", cell_1, cell_2)
+
+        previous_key = self.key
+        self.rearrange(CELL_PERMUTATIONS[rng.randrange(len(CELL_PERMUTATIONS))])
+
+        return ("rearrange", previous_key)
+
+    def undo(self, mutation: tuple):
+        """
+        Reverts a mutation returned by mutate().
+
+        Args:
+        -   mutation (tuple): The mutation.
+        """
+
+        if mutation[0] == "swap":
+            self.swap_letters(mutation[1], mutation[2])
+        else:
+            self.key = mutation[1]
+            self.cells[self.key] = CELLS
+
+    def decrypt(self, first_letters, second_letters):
+        """
+        Decrypts the letter pairs of a cipher text with the key.
+
+        Args:
+        -   first_letters (numpy.ndarray): The first letter number of each pair.
+        -   second_letters (numpy.ndarray): The second letter number of each pair.
+
+        Returns:
+        -   numpy.ndarray: The letter numbers of the plain text.
+        """
+
+        # The cells of each cipher pair, as a single index into the decrypted cells of the 625 cell pairs
+        cell_pairs = self.cells[first_letters] * 25 + self.cells[second_letters]
+
+        plain_values = np.empty(2 * len(cell_pairs), dtype=np.intp)
+        plain_values[0::2] = self.key[PLAIN_CELLS_1[cell_pairs]]
+        plain_values[1::2] = self.key[PLAIN_CELLS_2[cell_pairs]]
+
+        return plain_values
+
+    def key_text(self):
+        """
+        Returns the key as a 25 letter key text, which playfair_decrypt() accepts as it is.
+
+        Returns:
+        -   str: The key text.
+        """
+
+        return "".join(chr(letter + 65) for letter in self.key)
+
+
+def score_values(values, table):
+    """
+    Scores a plain text on its quadgrams.
+
+    Args:
+    -   values (numpy.ndarray): The letter numbers of the plain text.
+    -   table (numpy.ndarray): The quadgram table.
+
+    Returns:
+    -   float: The log10 probability of the text (higher is better).
+    """
+
+    return float(table[quadgram_indices(values)].sum())
+
+
+def anneal(first_letters, second_letters, table, iterations: int, seed: int, deadline: float = None):
+    """
+    Runs one simulated annealing search from a random key.
+
+    A worse key is accepted with the probability exp(change / temperature). The temperature is
+    proportional to the length of the text, and falls linearly from START_TEMPERATURE to END_TEMPERATURE
+    per letter: a Playfair key only settles in a narrow band of temperatures, below which the search
+    freezes in a local optimum.
+
+    Args:
+    -   first_letters (numpy.ndarray): The first letter number of each cipher pair.
+    -   second_letters (numpy.ndarray): The second letter number of each cipher pair.
+    -   table (numpy.ndarray): The quadgram table.
+    -   iterations (int): The number of mutations.
+    -   seed (int): The seed of the random key and mutations.
+    -   deadline (float): The time.time() at which the search stops early.
+
+    Returns:
+    -   tuple: The best score, the best key text and the number of keys scored.
+    """
+
+    rng = random.Random(seed)
+
+    state = PlayfairKeyState(rng.sample(list(PLAYFAIR_LETTERS), 25))
+    score = score_values(state.decrypt(first_letters, second_letters), table)
+    best_score, best_key = score, state.key_text()
+
+    start_temperature = START_TEMPERATURE * 2 * len(first_letters)
+    cooling = (START_TEMPERATURE - END_TEMPERATURE) * 2 * len(first_letters) / max(iterations, 1)
+    temperature = start_temperature
+
+    for iteration in range(iterations):
+        # Checking the clock every iteration would cost more than a mutation
+        if deadline is not None and iteration % 1024 == 0 and time.time() >= deadline:
+            return best_score, best_key, iteration + 1
+
+        mutation = state.mutate(rng)
+        new_score = score_values(state.decrypt(first_letters, second_letters), table)
+        change = new_score - score
+
+        if change >= 0 or rng.random() < math.exp(change / temperature):
+            score = new_score
+
+            if score > best_score:
+                best_score, best_key = score, state.key_text()
+        else:
+            state.undo(mutation)
+
+        temperature -= cooling
+
+    return best_score, best_key, iterations + 1
+
+
+def load_worker_table(table):
+    """
+    Keeps the quadgram table of a worker process, memory mapping it once if it is a path.
+
+    Args:
+    -   table (numpy.ndarray or str): The quadgram table, or the path of its .npy file.
+    """
+
+    worker_tables["quadgrams"] = load_quadgram_table(table) if isinstance(table, str) else table
+
+
+def anneal_worker(task: tuple):
+    """
+    Runs one simulated annealing restart in a worker process with its quadgram table.
+
+    Args:
+    -   task (tuple): The cipher pairs, the number of iterations, the seed and the deadline.
+
+    Returns:
+    -   tuple: The best score, the best key text and the number of keys scored.
+    """
+
+    first_letters, second_letters, iterations, seed, deadline = task
+
+    return anneal(first_letters, second_letters, worker_tables["quadgrams"], iterations, seed, deadline)
+
+
+def crack_playfair(
+    cipher_text,
+    quadgram_table,
+    restarts: int = 8,
+    iterations: int = 300000,
+    time_budget: float = None,
+    workers: int = None,
+    seed: int = None,
+    progress=None,
+):
+    """
+    Recovers a Playfair key from a cipher text with independent simulated annealing restarts, scoring
+    every candidate key on the quadgrams of its decryption.
+
+    The restarts run across a pool of worker processes. As each one finishes, the best result so far is
+    updated and passed to the progress callback. With a time budget, the running restarts stop at the
+    deadline and new restarts keep being started until then, up to the number of restarts if it is set.
+
+    Args:
+    -   cipher_text (str or bytes-like): The cipher text returned by playfair_encrypt().
+    -   quadgram_table (numpy.ndarray or str): The quadgram table, or the path of its .npy file.
+    -   restarts (int): The number of restarts, or None to restart until the time budget runs out.
+    -   iterations (int): The number of mutations of each restart.
+    -   time_budget (float): The number of seconds to search for, unlimited by default.
+    -   workers (int): The number of worker processes, the number of cores by default.
+    -   seed (int): The seed of the first restart (restart i uses seed + i), random by default.
+    -   progress (callable): Called with the result so far (the same dict as returned) after each restart.
+
+    Returns:
+    -   dict: The result, with the keys:
+        -   "key" (str): The best key text. playfair_decrypt(cipher_text, key) decrypts the text.
+        -   "score" (float): Its quadgram log10 probability (higher is better).
+        -   "plain_text" (str): The cipher text decrypted with the key.
+        -   "restarts" (int): The number of restarts that finished.
+        -   "evaluations" (int): The number of keys scored.
+        -   "elapsed" (float): The search time in seconds.
+
+    Raises:
+    -   ValueError: If the cipher text is too short, or neither a number of restarts nor a time budget is set.
+    """
+
+    if restarts is None and time_budget is None:
+        raise ValueError("Either the number of restarts or the time budget must be set")
+
+    first_letters, second_letters = playfair_values(cipher_text)
+    table = load_quadgram_table(quadgram_table) if isinstance(quadgram_table, str) else quadgram_table
+
+    start = time.time()
+    deadline = start + time_budget if time_budget is not None else None
+    seed = random.randrange(2**32) if seed is None else seed
+    workers = workers or os.cpu_count() or 1
+
+    if restarts is not None:
+        workers = min(workers, restarts)
+
+    result = {"key": None, "score": -math.inf, "plain_text": "", "restarts": 0, "evaluations": 0, "elapsed": 0.0}
+
+    def record(restart_result):
+        # Keep the best key and report the result so far
+        score, key_text, evaluations = restart_result
+        result["restarts"] += 1
+        result["evaluations"] += evaluations
+
+        if score > result["score"]:
+            plain_values = PlayfairKeyState([ord(char) - 65 for char in key_text]).decrypt(
+                first_letters, second_letters
+            )
+            result.update(
+                key=key_text, score=score, plain_text="".join(chr(value + 65) for value in plain_values)
+            )
+
+        result["elapsed"] = time.time() - start
+
+        if progress is not None:
+            progress(dict(result))
+
+    def more_restarts(started: int):
+        # Another restart is started while the count and the time budget allow it
+        return (restarts is None or started < restarts) and (deadline is None or time.time() < deadline)
+
+    started = 0
+
+    # A single worker runs the restarts in this process, without starting a pool
+    if workers <= 1:
+        while more_restarts(started):
+            record(anneal(first_letters, second_letters, table, iterations, seed + started, deadline))
+            started += 1
+
+        return result
+
+    with ProcessPoolExecutor(workers, initializer=load_worker_table, initargs=(quadgram_table,)) as executor:
+        running = set()
+
+        # Keep every worker busy with one restart until there are no more restarts to start
+        while True:
+            while len(running) < workers and more_restarts(started):
+                task = (first_letters, second_letters, iterations, seed + started, deadline)
+                running.add(executor.submit(anneal_worker, task))
+                started += 1
+
+            if not running:
+                break
+
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                record(future.result())
+
+    return result
@@ -0,0 +1,255 @@
+import time  # Import time to measure each stage
+
+import numpy as np  # Import numpy for the letter arrays
+
+from .additive import ADDITIVE_SCORER
+from .frequency import ENGLISH_FREQUENCIES, letter_values, rank_scores
+
+HISTOGRAM_BLOCK_SIZE = 1 << 20  # the number of letters counted at a time, bounding the memory of bincount()
+
+ENGLISH_IOC = float((ENGLISH_FREQUENCIES**2).sum())  # the index of coincidence of English text
+RANDOM_IOC = 1 / 26  # the index of coincidence of random letters
+
+
+def column_histograms(values, period: int):
+    """
+    Counts the letters of each column of a text written in rows of period letters.
+    Column j holds the letters n with n % period == j, the letters shifted by the same key letter.
+
+    Args:
+    -   values (numpy.ndarray): The uint8 letter numbers returned by letter_values().
+    -   period (int): The number of columns (the key length).
+
+    Returns:
+    -   numpy.ndarray: The letter counts of each column, one histogram of 26 counts per row.
+    """
+
+    # Column j of a letter is added to its number as j * 26, so one bincount() counts every column
+    offsets = np.arange(period, dtype=np.uint16) * 26
+    full_length = len(values) - len(values) % period
+    rows = values[:full_length].reshape(-1, period)  # a view of the full rows, nothing is copied
+    block_rows = max(HISTOGRAM_BLOCK_SIZE // period, 1)
+
+    counts = np.zeros(period * 26, dtype=np.int64)
+
+    for start in range(0, len(rows), block_rows):
+        counts += np.bincount((rows[start : start + block_rows] + offsets).ravel(), minlength=period * 26)
+
+    # The last partial row fills the first columns only
+    tail = values[full_length:]
+    counts += np.bincount(tail + offsets[: len(tail)], minlength=period * 26)
+
+    return counts.reshape(period, 26)
+
+
+def index_of_coincidence(values, max_period: int):
+    """
+    Calculates the average index of coincidence of the columns for every period up to max_period.
+
+    The columns of the right period (and its multiples) were each shifted by a single key letter,
+    so their index of coincidence is close to English (ENGLISH_IOC) instead of random letters (RANDOM_IOC).
+
+    Args:
+    -   values (numpy.ndarray): The uint8 letter numbers returned by letter_values().
+    -   max_period (int): The longest period to try.
+
+    Returns:
+    -   numpy.ndarray: The index of coincidence of each period (index 0 is not used).
+    """
+
+    ioc = np.zeros(max_period + 1)
+
+    for period in range(1, max_period + 1):
+        counts = column_histograms(values, period)
+        lengths = counts.sum(axis=1)
+
+        # Only the columns with at least two letters have pairs of letters
+        has_pairs = lengths > 1
+
+        if has_pairs.any():
+            pairs = (counts * (counts - 1)).sum(axis=1)[has_pairs]
+            ioc[period] = np.mean(pairs / (lengths[has_pairs] * (lengths[has_pairs] - 1)))
+
+    return ioc
+
+
+def kasiski_tallies(values, max_period: int, ngram: int = 3):
+    """
+    Tallies the periods that divide the distances between repeated n-grams (the Kasiski examination).
+
+    Each n-gram is hashed to a single integer, and a stable sort of the hashes groups the positions of
+    each n-gram in order, so the distances between the repeats are found without a Python dictionary.
+
+    Args:
+    -   values (numpy.ndarray): The uint8 letter numbers returned by letter_values().
+    -   max_period (int): The longest period to tally.
+    -   ngram (int): The length of the repeated n-grams.
+
+    Returns:
+    -   numpy.ndarray: The number of distances divisible by each period (index 0 and 1 are not used).
+    """
+
+    tallies = np.zeros(max_period + 1, dtype=np.int64)
+
+    if len(values) <= ngram:
+        return tallies
+
+    # Hash each n-gram as a number in base 26, in the smallest type that holds every hash (radix sort for 16 bits)
+    windows = np.lib.stride_tricks.sliding_window_view(values, ngram)
+    hash_type = np.uint16 if 26**ngram <= 2**16 else np.uint32 if 26**ngram <= 2**32 else np.int64
+    hashes = np.zeros(len(windows), dtype=hash_type)
+
+    for i in range(ngram):
+        hashes = hashes * hash_type(26) + windows[:, i]
+
+    # The stable sort keeps the positions of each n-gram in increasing order
+    positions = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[positions]
+    is_repeat = sorted_hashes[1:] == sorted_hashes[:-1]
+
+    # The distance from each repeat to the previous occurrence of the same n-gram.
+    # The modulo of 32 bit integers is about twice as fast as the modulo of 64 bit integers
+    distance_type = np.uint32 if len(values) < 2**32 else np.int64
+    distances = (positions[1:][is_repeat] - positions[:-1][is_repeat]).astype(distance_type)
+
+    for period in range(2, max_period + 1):
+        tallies[period] = np.count_nonzero(distances % distance_type(period) == 0)
+
+    return tallies
+
+
+def select_period(ioc, tolerance: float = 0.1):
+    """
+    Selects the key length from the index of coincidence of each period.
+
+    The multiples of the key length score as well as the key length itself, and the short columns of the
+    long periods give noisy scores, so the shortest period that looks like English is selected: the first
+    period three quarters of the way from the random to the English index of coincidence, or within the
+    tolerance of the best index of coincidence if none of the periods gets there.
+
+    Args:
+    -   ioc (numpy.ndarray): The index of coincidence of each period returned by index_of_coincidence().
+    -   tolerance (float): The relative distance from the best index of coincidence.
+
+    Returns:
+    -   int: The selected period.
+    """
+
+    threshold = min(RANDOM_IOC + 0.75 * (ENGLISH_IOC - RANDOM_IOC), ioc[1:].max() * (1 - tolerance))
+
+    return int(np.argmax(ioc[1:] >= threshold)) + 1
+
+
+def shortest_repeat(key_text: str):
+    """
+    Finds the length of the shortest part of the key that repeats to the whole key, e.g. 3 for KEYKEY.
+
+    Args:
+    -   key_text (str): The key text.
+
+    Returns:
+    -   int: The length of the repeating part.
+    """
+
+    for length in range(1, len(key_text)):
+        if len(key_text) % length == 0 and key_text == key_text[:length] * (len(key_text) // length):
+            return length
+
+    return len(key_text)
+
+
+def recover_key(values, period: int, method: str = "chi_squared"):
+    """
+    Recovers each key letter from the letters of its column, the same way as an additive key.
+
+    Args:
+    -   values (numpy.ndarray): The uint8 letter numbers returned by letter_values().
+    -   period (int): The key length.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+
+    Returns:
+    -   tuple: A tuple containing the key text and the score of each key letter.
+    """
+
+    # Score the 26 shifts of every column at once (one row of scores per column)
+    scores = ADDITIVE_SCORER.score(column_histograms(values, period), method)
+    shifts = [int(rank_scores(column_scores, method, 1)[0]) for column_scores in scores]
+
+    key_text = "".join(chr(shift + 65) for shift in shifts)
+    key_scores = [float(column_scores[shift]) for column_scores, shift in zip(scores, shifts)]
+
+    return key_text, key_scores
+
+
+def crack_vigenere(
+    cipher_text, max_period: int = 40, method: str = "chi_squared", ngram: int = 3, period: int = None
+):
+    """
+    Recovers the key of a Vigenere cipher text.
+
+    The key length is selected by the index of coincidence of the columns of each period, the Kasiski
+    tallies of the repeated n-grams are reported next to it, and each key letter is recovered from the
+    letter histogram of its column. Every stage is O(n) per period, so the whole analysis is O(n * max_period).
+
+    Args:
+    -   cipher_text (str or bytes-like): The cipher text.
+    -   max_period (int): The longest key length to try.
+    -   method (str): "chi_squared" (lower is better) or "log_likelihood" (higher is better).
+    -   ngram (int): The length of the repeated n-grams of the Kasiski examination.
+    -   period (int): The key length, if it is already known. The index of coincidence is still reported.
+
+    Returns:
+    -   dict: The analysis, with the keys:
+        -   "key" (str): The recovered key text. vigenere_decrypt(cipher_text, key) decrypts the text.
+        -   "period" (int): The key length.
+        -   "key_scores" (list): The score of each key letter.
+        -   "ioc" (dict): The index of coincidence of each period.
+        -   "kasiski" (dict): The Kasiski tally of each period.
+        -   "timings" (dict): The time of each stage in seconds.
+
+    Raises:
+    -   ValueError: If the cipher text has no letters.
+    """
+
+    timings = {}
+
+    start = time.perf_counter()
+    values = letter_values(cipher_text)
+    timings["letters"] = time.perf_counter() - start
+
+    if len(values) == 0:
+        raise ValueError("The cipher text has no letters")
+
+    # There cannot be more columns than letters
+    max_period = max(min(max_period, len(values)), 1)
+
+    start = time.perf_counter()
+    ioc = index_of_coincidence(values, max_period)
+    timings["ioc"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tallies = kasiski_tallies(values, max_period, ngram)
+    timings["kasiski"] = time.perf_counter() - start
+
+    period = period or select_period(ioc)
+
+    start = time.perf_counter()
+    key_text, key_scores = recover_key(values, period, method)
+
+    # A multiple of the key length recovers the key repeated, e.g. KEYKEY, so it is cut to its repeating part
+    repeat_length = shortest_repeat(key_text)
+
+    if repeat_length < period:
+        period = repeat_length
+        key_text, key_scores = recover_key(values, period, method)
+
+    timings["key"] = time.perf_counter() - start
+
+    return {
+        "key": key_text,
+        "period": period,
+        "key_scores": key_scores,
+        "ioc": {p: float(ioc[p]) for p in range(1, max_period + 1)},
+        "kasiski": {p: int(tallies[p]) for p in range(2, max_period + 1)},
+        "timings": timings,
+    }
@@ -0,0 +1,245 @@
+from .common import TranslationTable, build_byte_table, iterate_chunks, translate_buffer, translate_text
+from .keycache import cached_key_schedule
+
+
+class AtbashCipher:
+    """
+    A compiled Atbash cipher.
+
+    The Atbash cipher has no key, so a single table is built and shared by encryption and decryption.
+    Whole strings are encrypted with str.translate() instead of a loop over each character.
+    """
+
+    def __init__(self):
+        # The same formula as the character loop (155 = 65 + 90 = A + Z)
+        def mirror_char(char):
+            return chr(155 - ord(char.upper()))
+
+        self.table = TranslationTable(mirror_char)
+        self.byte_table = build_byte_table(mirror_char)
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text.
+        """
+
+        return translate_text(plain_text, self.table, self.byte_table)
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text. The Atbash decryption is the same as the encryption.
+
+        Args:
+        -   cipher_text (str): The encrypted text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text.
+        """
+
+        return translate_text(cipher_text, self.table, self.byte_table)
+
+    def encrypt_bytes(self, plain_bytes: bytes):
+        """
+        Encrypts the given ASCII bytes.
+
+        Args:
+        -   plain_bytes (bytes): The plain bytes to be encrypted.
+
+        Returns:
+        -   bytes: The encrypted bytes.
+        """
+
+        return plain_bytes.translate(self.byte_table)
+
+    def decrypt_bytes(self, cipher_bytes: bytes):
+        """
+        Decrypts the given ASCII bytes.
+
+        Args:
+        -   cipher_bytes (bytes): The cipher bytes to be decrypted.
+
+        Returns:
+        -   bytes: The decrypted bytes.
+        """
+
+        return cipher_bytes.translate(self.byte_table)
+
+    def encrypt_buffer(self, plain_data, out=None):
+        """
+        Encrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        return translate_buffer(plain_data, self.byte_table, out)
+
+    def decrypt_buffer(self, cipher_data, out=None):
+        """
+        Decrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        return translate_buffer(cipher_data, self.byte_table, out)
+
+    def encrypt_stream(self, plain_chunks):
+        """
+        Encrypts a stream of plain text chunks. Only one chunk is held in memory at a time.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        for chunk in iterate_chunks(plain_chunks):
+            yield self.encrypt(chunk)
+
+    def decrypt_stream(self, cipher_chunks):
+        """
+        Decrypts a stream of cipher text chunks. Only one chunk is held in memory at a time.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        for chunk in iterate_chunks(cipher_chunks):
+            yield self.decrypt(chunk)
+
+
+@cached_key_schedule("atbash")
+def compile_atbash_cipher():
+    """
+    Returns the compiled Atbash cipher. The Atbash cipher has no key, so the same cipher is returned while it
+    is in the shared key schedule cache.
+
+    Returns:
+    -   AtbashCipher: The compiled cipher.
+    """
+
+    return AtbashCipher()
+
+
+def atbash_encrypt(plain_text):
+    """
+    Encrypts the given plain text using the Atbash cipher.
+
+    The Atbash cipher is a substitution cipher where each letter in the plain text is replaced
+    with its mirror image in the alphabet. Non-alphabetic characters are left unchanged.
+
+    Args:
+    -   plain_text (str): The plain text to be encrypted.
+
+    Returns:
+    -   str: The encrypted text.
+    """
+
+    # Translate the whole text at once using the compiled cipher
+    return compile_atbash_cipher().encrypt(plain_text)
+
+
+def atbash_decrypt(cipher_text):
+    """
+    Decrypts a given cipher text using the Atbash cipher.
+
+    Parameters:
+    -   cipher_text (str): The encrypted text to be decrypted.
+
+    Returns:
+    -   str: The decrypted text.
+    """
+
+    # Translate the whole text at once using the compiled cipher
+    return compile_atbash_cipher().decrypt(cipher_text)
+
+
+def atbash_encrypt_stream(plain_chunks):
+    """
+    Encrypts a stream of plain text chunks using the Atbash cipher.
+    Only one chunk is held in memory at a time, and the output is the same as encrypting the whole text at once.
+
+    Args:
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+    Yields:
+    -   str: The encrypted chunks.
+    """
+
+    yield from compile_atbash_cipher().encrypt_stream(plain_chunks)
+
+
+def atbash_decrypt_stream(cipher_chunks):
+    """
+    Decrypts a stream of cipher text chunks using the Atbash cipher.
+    Only one chunk is held in memory at a time, and the output is the same as decrypting the whole text at once.
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+    Yields:
+    -   str: The decrypted chunks.
+    """
+
+    yield from compile_atbash_cipher().decrypt_stream(cipher_chunks)
+
+
+def atbash_encrypt_buffer(plain_data, out=None):
+    """
+    Encrypts a buffer of ASCII bytes using the Atbash cipher, into an output buffer or in place.
+
+    Args:
+    -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_atbash_cipher().encrypt_buffer(plain_data, out)
+
+
+def atbash_decrypt_buffer(cipher_data, out=None):
+    """
+    Decrypts a buffer of ASCII bytes using the Atbash cipher, into an output buffer or in place.
+
+    Args:
+    -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_atbash_cipher().decrypt_buffer(cipher_data, out)
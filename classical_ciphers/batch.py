@@ -0,0 +1,219 @@
+import os  # Import os to name the output files
+
+from . import get_cipher
+from .common import transform_buffer_in_place
+
+# The ciphers that transform each byte on its own, which are streamed through a reused bytearray
+BYTE_CIPHERS = ("additive", "affine", "atbash", "vigenere")
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB read and written at a time
+
+
+def parse_key(name: str, key_text: str):
+    """
+    Converts a key given as text (on the command line or in a key file) to the key of the cipher.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key_text (str): The key text, e.g. "3" (additive), "5,8" (affine), "3" (rail_fence) or "LEMON" (vigenere).
+
+    Returns:
+    -   The key of the cipher (None for Atbash).
+
+    Raises:
+    -   ValueError: If the key is missing or cannot be parsed.
+    """
+
+    if name == "atbash":
+        return None
+
+    if not key_text:
+        raise ValueError(f"The {name} cipher needs a key")
+
+    if name in ("additive", "rail_fence"):
+        return int(key_text)
+
+    if name == "affine":
+        parts = key_text.split(",")
+
+        if len(parts) != 2:
+            raise ValueError("The affine key must be two integers, e.g. --key 5,8")
+
+        return (int(parts[0]), int(parts[1]))
+
+    return key_text
+
+
+def transform_line(cipher, name: str, direction: int, line: bytes):
+    """
+    Encrypts or decrypts a line of a binary stream as a message of its own. The line ending is written
+    through as it is, so the Hill, Playfair and Rail Fence ciphers never see it.
+
+    Args:
+    -   cipher: The compiled cipher.
+    -   name (str): The name of the cipher.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   line (bytes): The line, with its line ending.
+
+    Returns:
+    -   bytes-like: The transformed line, with its line ending.
+    """
+
+    if name in BYTE_CIPHERS:
+        return cipher.encrypt_buffer(line) if direction == 1 else cipher.decrypt_buffer(line)
+
+    message = line.rstrip(b"\r\n")
+    text = message.decode("utf-8", "surrogateescape")
+    text = cipher.encrypt(text) if direction == 1 else cipher.decrypt(text)
+
+    return text.encode("utf-8", "surrogateescape") + line[len(message):]
+
+
+def transform_stream(name: str, key, direction: int, source, target, chunk_size: int = DEFAULT_CHUNK_SIZE, **options):
+    """
+    Encrypts or decrypts a binary stream into another one, one chunk at a time.
+
+    The byte ciphers read each chunk into the same bytearray and transform it in place with the buffer
+    kernels, so a stream of any length uses a single chunk of memory. The other ciphers transform each
+    line as a message of its own (see transform_line()), so the line endings are kept as they are and a
+    single line is held in memory at a time.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   source (file): The binary input stream, e.g. sys.stdin.buffer.
+    -   target (file): The binary output stream, e.g. sys.stdout.buffer.
+    -   chunk_size (int): The number of bytes read at a time by the byte ciphers.
+    -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+    Returns:
+    -   int: The number of bytes read.
+
+    Raises:
+    -   ValueError: If there is no cipher with the given name, or the key is not valid.
+    """
+
+    cipher = get_cipher(name, key, **options)
+    total = 0
+
+    if name in BYTE_CIPHERS:
+        if direction == -1:
+            cipher.decrypt_buffer(b"")  # raises if the key cannot be inverted, before anything is written
+
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        phase = 0
+
+        while True:
+            length = source.readinto(buffer)
+
+            if not length:
+                return total
+
+            chunk = view[:length]
+            phase = transform_buffer_in_place(cipher, name, direction, chunk, phase)
+            target.write(chunk)
+            total += length
+
+    for line in source:
+        target.write(transform_line(cipher, name, direction, line))
+        total += len(line)
+
+    return total
+
+
+def transform_records(name: str, keys, direction: int, source, target, **options):
+    """
+    Encrypts or decrypts each line (record) of a binary stream with its own key.
+
+    The n-th record is transformed with the n-th key, on its own: the Vigenere key starts again at every
+    record, and the Hill, Playfair and Rail Fence ciphers transform each record as a whole message. The
+    line endings are kept as they are.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   keys (iterable): The key texts, one per record (parsed with parse_key()).
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   source (file): The binary input stream.
+    -   target (file): The binary output stream.
+    -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+    Returns:
+    -   int: The number of bytes read.
+
+    Raises:
+    -   ValueError: If there are fewer keys than records, or a key is not valid.
+    """
+
+    keys = iter(keys)
+    total = 0
+
+    for number, line in enumerate(source, 1):
+        key_text = next(keys, None)
+
+        if key_text is None:
+            raise ValueError(f"There is no key for record {number}, the key file has {number - 1} keys")
+
+        # The compiled ciphers are cached, so a key that is used again is not compiled again
+        cipher = get_cipher(name, parse_key(name, key_text.rstrip("\r\n")), **options)
+        target.write(transform_line(cipher, name, direction, line))
+        total += len(line)
+
+    return total
+
+
+def output_path(input_path: str, output_dir: str = None, suffix: str = ".enc"):
+    """
+    Returns the path of the output file of an input file.
+
+    Args:
+    -   input_path (str): The path of the input file.
+    -   output_dir (str): The directory of the output files, or None for the directory of the input file.
+    -   suffix (str): The suffix added to the name of the input file.
+
+    Returns:
+    -   str: The path of the output file.
+    """
+
+    directory, file_name = os.path.split(input_path)
+
+    return os.path.join(output_dir if output_dir is not None else directory, file_name + suffix)
+
+
+def transform_file(
+    name: str,
+    key,
+    direction: int,
+    input_path: str,
+    output_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    key_path: str = None,
+    options: dict = None,
+):
+    """
+    Encrypts or decrypts a file into another file. This is a module level function, so the files of a
+    batch can be transformed by the workers of a process pool.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash, or when key_path is given).
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   input_path (str): The path of the input file.
+    -   output_path (str): The path of the output file.
+    -   chunk_size (int): The number of bytes read at a time.
+    -   key_path (str): The path of a file with one key per line, to transform each line with its own key.
+    -   options (dict): Extra options of the cipher, e.g. {"zigzag": True} for the Rail Fence cipher.
+
+    Returns:
+    -   int: The number of bytes read.
+    """
+
+    options = options or {}
+
+    with open(input_path, "rb") as source, open(output_path, "wb") as target:
+        if key_path is None:
+            return transform_stream(name, key, direction, source, target, chunk_size, **options)
+
+        with open(key_path, encoding="utf-8") as keys:
+            return transform_records(name, keys, direction, source, target, **options)
@@ -0,0 +1,499 @@
+from functools import lru_cache  # Import lru_cache to cache the compiled chains
+
+from . import get_cipher
+from .common import iterate_chunks
+
+# The ciphers that map each letter on its own, x -> (a * x + b) % 26, so a chain of them is one affine map
+MONOALPHABETIC_CIPHERS = ("additive", "affine", "atbash", "rot13")
+
+# The ciphers whose steps can transform a buffer of bytes
+BUFFER_CIPHERS = ("additive", "affine", "atbash", "vigenere")
+
+
+def normalize_stage(stage, index: int):
+    """
+    Converts a stage of a chain to a step of a plan.
+
+    Args:
+    -   stage (str, tuple or dict): The name of a keyless cipher (e.g. "atbash" or "rot13"), a (name, key)
+        tuple, or a step dict with the "cipher", "key", "direction" and "options" of the stage.
+    -   index (int): The position of the stage in the chain.
+
+    Returns:
+    -   dict: The step, with the normalized cipher name and the index of the stage.
+
+    Raises:
+    -   ValueError: If the stage cannot be parsed or its direction is not 1 or -1.
+    """
+
+    if isinstance(stage, str):
+        stage = {"cipher": stage}
+    elif isinstance(stage, (tuple, list)) and len(stage) == 2:
+        stage = {"cipher": stage[0], "key": stage[1]}
+    elif not isinstance(stage, dict) or "cipher" not in stage:
+        raise ValueError(f"Stage {index} must be a cipher name, a (name, key) tuple or a step dict, not {stage!r}")
+
+    direction = stage.get("direction", 1)
+
+    if direction not in (1, -1):
+        raise ValueError(f"The direction of stage {index} must be 1 (encrypt) or -1 (decrypt), not {direction!r}")
+
+    key = stage.get("key")
+
+    # Affine keys are accepted as lists too
+    if isinstance(key, list):
+        key = tuple(key)
+
+    return {
+        "cipher": stage["cipher"].strip().lower().replace(" ", "_").replace("-", "_"),
+        "key": key,
+        "direction": direction,
+        "options": dict(stage.get("options", {})),
+        "stages": (index,),
+    }
+
+
+def affine_map(step: dict):
+    """
+    Returns the affine map (a, b) of a monoalphabetic step, x -> (a * x + b) % 26.
+
+    Args:
+    -   step (dict): The step.
+
+    Returns:
+    -   tuple: The multiplier a and the offset b.
+
+    Raises:
+    -   ValueError: If the step decrypts with an affine key that cannot be inverted.
+    """
+
+    cipher, key, direction = step["cipher"], step["key"], step["direction"]
+
+    if cipher == "atbash":
+        return 25, 25  # x -> 25 - x, which is its own inverse
+
+    if cipher in ("additive", "rot13"):
+        shift = 13 if cipher == "rot13" else key
+        return 1, direction * shift % 26
+
+    if direction == 1:
+        return key[0] % 26, key[1] % 26
+
+    from .affine import mod_inverse
+
+    m_dash = mod_inverse(key[0], 26)
+
+    if m_dash == -1:
+        raise ValueError("The modular inverse of {} does not exist.".format(key[0]))
+
+    # x -> m' * (x - b)
+    return m_dash, -m_dash * key[1] % 26
+
+
+def fused_step(kind: str, parameters, stages: tuple):
+    """
+    Builds the step of a fused run of stages, using the simplest cipher with the same mapping.
+
+    Args:
+    -   kind (str): "affine" for an affine map (a, b), or "vigenere" for a tuple of shifts.
+    -   parameters (tuple): The affine map or the shifts.
+    -   stages (tuple): The indices of the fused stages.
+
+    Returns:
+    -   dict: The step.
+    """
+
+    # A Vigenere key with a single repeated shift shifts every letter the same way
+    if kind == "vigenere" and len(set(parameters)) == 1:
+        kind, parameters = "affine", (1, parameters[0])
+
+    if kind == "vigenere":
+        cipher, key = "vigenere", "".join(chr(65 + shift) for shift in parameters)
+    elif parameters == (25, 25):
+        cipher, key = "atbash", None
+    elif parameters[0] == 1:
+        cipher, key = "additive", parameters[1]
+    else:
+        cipher, key = "affine", parameters
+
+    return {"cipher": cipher, "key": key, "direction": 1, "options": {}, "stages": stages}
+
+
+def fuse_stages(steps: list):
+    """
+    Fuses the consecutive stages of a chain that can be computed in a single pass.
+
+    Consecutive monoalphabetic stages are composed into one affine map. Consecutive Vigenere stages with
+    the same key length are added into one key, and a shift (an affine map with a = 1) next to a Vigenere
+    stage is added to every letter of its key. Every cipher leaves the other characters unchanged and
+    upper cases the letters, so the fused steps return exactly what the stages return one by one. The
+    Hill, Playfair and Rail Fence stages are kept as they are.
+
+    Args:
+    -   steps (list): The normalized stages.
+
+    Returns:
+    -   list: The steps of the plan.
+    """
+
+    plan = []  # (kind, parameters, stages) of each step, the kind is "affine", "vigenere" or "stage"
+
+    for step in steps:
+        if step["cipher"] in MONOALPHABETIC_CIPHERS:
+            current = ("affine", affine_map(step), step["stages"])
+        elif step["cipher"] == "vigenere":
+            from .vigenere import initialize_key_shifts
+
+            shifts = tuple(step["direction"] * shift % 26 for shift in initialize_key_shifts(step["key"]))
+            current = ("vigenere", shifts, step["stages"])
+        else:
+            current = ("stage", step, step["stages"])
+
+        kind, parameters, stages = current
+        previous_kind, previous_parameters, previous_stages = plan[-1] if plan else (None, None, ())
+
+        if previous_kind == "affine" and kind == "affine":
+            # x -> a2 * (a1 * x + b1) + b2
+            (a1, b1), (a2, b2) = previous_parameters, parameters
+            plan[-1] = ("affine", (a1 * a2 % 26, (a2 * b1 + b2) % 26), previous_stages + stages)
+
+        elif previous_kind == "vigenere" and kind == "vigenere" and len(previous_parameters) == len(parameters):
+            shifts = tuple((first + second) % 26 for first, second in zip(previous_parameters, parameters))
+            plan[-1] = ("vigenere", shifts, previous_stages + stages)
+
+        elif previous_kind == "vigenere" and kind == "affine" and parameters[0] == 1:
+            shifts = tuple((shift + parameters[1]) % 26 for shift in previous_parameters)
+            plan[-1] = ("vigenere", shifts, previous_stages + stages)
+
+        elif previous_kind == "affine" and kind == "vigenere" and previous_parameters[0] == 1:
+            shifts = tuple((shift + previous_parameters[1]) % 26 for shift in parameters)
+            plan[-1] = ("vigenere", shifts, previous_stages + stages)
+
+        else:
+            plan.append(current)
+
+    return [parameters if kind == "stage" else fused_step(kind, parameters, stages) for kind, parameters, stages in plan]
+
+
+def step_cipher(step: dict):
+    """
+    Returns the compiled cipher of a step.
+
+    Args:
+    -   step (dict): The step.
+
+    Returns:
+    -   object: The compiled cipher.
+    """
+
+    return get_cipher(step["cipher"], step["key"], **step["options"])
+
+
+class CipherChain:
+    """
+    A compiled chain of ciphers, e.g. an additive shift, then an affine cipher, then Atbash.
+
+    The stages are fused into a plan before anything is encrypted (see fuse_stages()), so a chain of
+    monoalphabetic stages is a single str.translate() pass with one table, instead of one pass and one
+    new string per stage. The Hill, Playfair and Rail Fence stages run on their own, and the streams of
+    the steps are chained, so a stream is still transformed one chunk at a time.
+
+    Args:
+    -   stages (iterable): The stages, applied in order. Each stage is the name of a keyless cipher
+        (e.g. "atbash" or "rot13"), a (name, key) tuple, or a dict with the "cipher", "key", "direction"
+        (1 to encrypt, -1 to decrypt) and "options" of the stage.
+
+    Raises:
+    -   ValueError: If a stage cannot be parsed, or a cipher name or key is not valid.
+    """
+
+    def __init__(self, stages):
+        self.stages = [normalize_stage(stage, index) for index, stage in enumerate(stages)]
+
+        if not self.stages:
+            raise ValueError("A cipher chain needs at least one stage")
+
+        self.plan = fuse_stages(self.stages)
+        self.ciphers = [step_cipher(step) for step in self.plan]  # raises the key errors up front
+        self.decrypt_plan = None  # built the first time the chain decrypts
+        self.decrypt_ciphers = None
+
+    def inverse_plan(self):
+        """
+        Returns the plan that decrypts the chain: the inverse of each stage, in the reverse order.
+
+        Returns:
+        -   list: The steps of the decryption plan.
+
+        Raises:
+        -   ValueError: If an affine stage has a key that cannot be inverted.
+        """
+
+        if self.decrypt_plan is None:
+            inverse_stages = [dict(stage, direction=-stage["direction"]) for stage in reversed(self.stages)]
+            self.decrypt_plan = fuse_stages(inverse_stages)
+            self.decrypt_ciphers = [step_cipher(step) for step in self.decrypt_plan]
+
+        return self.decrypt_plan
+
+    def describe(self, direction: int = 1):
+        """
+        Describes the plan, one line per step, with the stages fused into each step.
+
+        Args:
+        -   direction (int): 1 for the encryption plan, -1 for the decryption plan.
+
+        Returns:
+        -   str: The description.
+        """
+
+        plan = self.plan if direction == 1 else self.inverse_plan()
+        lines = []
+
+        for number, step in enumerate(plan, 1):
+            action = "encrypt" if step["direction"] == 1 else "decrypt"
+            key = "" if step["key"] is None else f" {step['key']!r}"
+            stages = ", ".join(str(index) for index in step["stages"])
+            lines.append(f"{number}. {action} {step['cipher']}{key} (stages {stages})")
+
+        return "\n".join(lines)
+
+    def run(self, text: str, direction: int):
+        """
+        Runs the encryption or the decryption plan over a text.
+
+        Args:
+        -   text (str): The text.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+        -   str: The transformed text.
+        """
+
+        plan = self.plan if direction == 1 else self.inverse_plan()
+        ciphers = self.ciphers if direction == 1 else self.decrypt_ciphers
+
+        for step, cipher in zip(plan, ciphers):
+            text = cipher.encrypt(text) if step["direction"] == 1 else cipher.decrypt(text)
+
+        return text
+
+    def run_stream(self, chunks, direction: int):
+        """
+        Chains the streams of the steps of the encryption or the decryption plan.
+
+        Args:
+        -   chunks (iterable or file): The text chunks, or a text file object to read them from.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+        -   iterator: The transformed chunks.
+        """
+
+        plan = self.plan if direction == 1 else self.inverse_plan()
+        ciphers = self.ciphers if direction == 1 else self.decrypt_ciphers
+        stream = iterate_chunks(chunks)
+
+        for step, cipher in zip(plan, ciphers):
+            stream = cipher.encrypt_stream(stream) if step["direction"] == 1 else cipher.decrypt_stream(stream)
+
+        return stream
+
+    def run_buffer(self, data, direction: int, out=None):
+        """
+        Runs the encryption or the decryption plan over a buffer of bytes. The first step writes into the
+        output buffer and the other steps transform it in place.
+
+        Args:
+        -   data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+        -   out (bytes-like): The writable output buffer (data itself to transform it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   ValueError: If a step of the plan cannot transform a buffer (Hill, Playfair and Rail Fence).
+        """
+
+        plan = self.plan if direction == 1 else self.inverse_plan()
+        ciphers = self.ciphers if direction == 1 else self.decrypt_ciphers
+
+        for step in plan:
+            if step["cipher"] not in BUFFER_CIPHERS:
+                raise ValueError(f"The {step['cipher']} stage cannot transform a buffer of bytes")
+
+        for step, cipher in zip(plan, ciphers):
+            transform = cipher.encrypt_buffer if step["direction"] == 1 else cipher.decrypt_buffer
+            out = transform(data, out=out)
+            data = out
+
+        return out
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text with every stage of the chain.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text.
+        """
+
+        return self.run(plain_text, 1)
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text, undoing the stages in the reverse order.
+
+        Args:
+        -   cipher_text (str): The encrypted text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text.
+
+        Raises:
+        -   ValueError: If an affine stage has a key that cannot be inverted.
+        """
+
+        return self.run(cipher_text, -1)
+
+    def encrypt_stream(self, plain_chunks):
+        """
+        Encrypts a stream of plain text chunks with every stage of the chain.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        yield from self.run_stream(plain_chunks, 1)
+
+    def decrypt_stream(self, cipher_chunks):
+        """
+        Decrypts a stream of cipher text chunks, undoing the stages in the reverse order.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        yield from self.run_stream(cipher_chunks, -1)
+
+    def encrypt_buffer(self, plain_data, out=None):
+        """
+        Encrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   ValueError: If a step of the plan cannot transform a buffer (Hill, Playfair and Rail Fence).
+        """
+
+        return self.run_buffer(plain_data, 1, out)
+
+    def decrypt_buffer(self, cipher_data, out=None):
+        """
+        Decrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   ValueError: If a step of the plan cannot transform a buffer, or an affine key cannot be inverted.
+        """
+
+        return self.run_buffer(cipher_data, -1, out)
+
+
+def compile_chain(*stages):
+    """
+    Returns the compiled chain of the given stages, with the fused plan in its plan attribute.
+    The most recently used chains are cached, so repeated calls with the same stages skip the planning.
+
+    Args:
+    -   stages: The stages, applied in order (see CipherChain).
+
+    Returns:
+    -   CipherChain: The compiled chain.
+
+    Raises:
+    -   ValueError: If a stage cannot be parsed, or a cipher name or key is not valid.
+    """
+
+    # The normalized stages are hashable, whichever form each stage was given in
+    stage_keys = []
+
+    for index, stage in enumerate(stages):
+        step = normalize_stage(stage, index)
+        stage_keys.append((step["cipher"], step["key"], step["direction"], tuple(sorted(step["options"].items()))))
+
+    return cached_chain(tuple(stage_keys))
+
+
+@lru_cache(maxsize=256)
+def cached_chain(stage_keys: tuple):
+    """
+    Builds the compiled chain of the given normalized stages, with an LRU cache.
+
+    Args:
+    -   stage_keys (tuple): The (cipher, key, direction, options) tuple of each stage.
+
+    Returns:
+    -   CipherChain: The compiled chain.
+    """
+
+    return CipherChain(
+        {"cipher": cipher, "key": key, "direction": direction, "options": dict(options)}
+        for cipher, key, direction, options in stage_keys
+    )
+
+
+def chain_encrypt(plain_text: str, stages):
+    """
+    Encrypts the given plain text with a chain of ciphers, fused into as few passes as possible.
+
+    Args:
+    -   plain_text (str): The text to be encrypted.
+    -   stages (iterable): The stages, applied in order (see CipherChain).
+
+    Returns:
+    -   str: The encrypted text.
+    """
+
+    return compile_chain(*stages).encrypt(plain_text)
+
+
+def chain_decrypt(cipher_text: str, stages):
+    """
+    Decrypts the given cipher text with a chain of ciphers, undoing the stages in the reverse order.
+
+    Args:
+    -   cipher_text (str): The encrypted text to be decrypted.
+    -   stages (iterable): The stages, in the order they were applied (see CipherChain).
+
+    Returns:
+    -   str: The decrypted text.
+
+    Raises:
+    -   ValueError: If an affine stage has a key that cannot be inverted.
+    """
+
+    return compile_chain(*stages).decrypt(cipher_text)
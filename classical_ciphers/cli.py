@@ -0,0 +1,377 @@
+import argparse  # Import argparse to parse the command line
+import os  # Import os to discard the output after a broken pipe
+import re  # Import re to parse the sizes
+import sys  # Import sys for the standard streams
+import time  # Import time to measure the throughput
+
+from . import available_ciphers
+from .batch import BYTE_CIPHERS, DEFAULT_CHUNK_SIZE, parse_key
+
+# The number of bytes of each size unit
+SIZE_UNITS = {
+    "": 1, "B": 1,
+    "K": 1 << 10, "KB": 1 << 10, "KIB": 1 << 10,
+    "M": 1 << 20, "MB": 1 << 20, "MIB": 1 << 20,
+    "G": 1 << 30, "GB": 1 << 30, "GIB": 1 << 30,
+}
+
+
+def parse_size(text: str):
+    """
+    Parses a size such as 4096, 64KB or 16MiB into a number of bytes.
+
+    Args:
+    -   text (str): The size.
+
+    Returns:
+    -   int: The number of bytes.
+
+    Raises:
+    -   argparse.ArgumentTypeError: If the size cannot be parsed.
+    """
+
+    match = re.fullmatch(r"\s*(\d+)\s*([A-Za-z]*)\s*", text)
+
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}, expected e.g. 4096, 64KB or 16MB")
+
+    return int(match.group(1)) * SIZE_UNITS[match.group(2).upper()]
+
+
+def parse_address(text: str):
+    """
+    Parses a host:port address.
+
+    Args:
+    -   text (str): The address, e.g. 127.0.0.1:8000 or :8000 for the local host.
+
+    Returns:
+    -   tuple: The host and the port.
+
+    Raises:
+    -   argparse.ArgumentTypeError: If the address cannot be parsed.
+    """
+
+    host, _, port = text.rpartition(":")
+
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(f"invalid address {text!r}, expected host:port")
+
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+def run_in_place(args):
+    """
+    Runs the inplace subcommand.
+
+    Args:
+    -   args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+    -   int: The exit status.
+    """
+
+    from .inplace import DEFAULT_WINDOW_SIZE, transform_file_in_place
+
+    def report(offset, length):
+        print(f"\r{offset:,} / {length:,} bytes ({offset / length:.0%})", end="", file=sys.stderr, flush=True)
+
+    key = parse_key(args.cipher, args.key)
+    transformed = transform_file_in_place(
+        args.cipher,
+        key,
+        args.path,
+        1 if args.direction == "encrypt" else -1,
+        args.window_size or DEFAULT_WINDOW_SIZE,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        progress=None if args.quiet else report,
+    )
+
+    if not args.quiet:
+        print(f"\n{args.direction}ed {transformed:,} bytes of {args.path}", file=sys.stderr)
+
+    return 0
+
+
+def run_proxy(args):
+    """
+    Runs the proxy subcommand until it is interrupted.
+
+    Args:
+    -   args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+    -   int: The exit status.
+    """
+
+    import asyncio  # asyncio is only imported when the proxy runs
+
+    from .aio import OFFLOAD_THRESHOLD, start_proxy
+
+    key = parse_key(args.cipher, args.key)
+
+    async def serve():
+        server = await start_proxy(
+            args.cipher,
+            key,
+            *args.upstream,
+            *args.listen,
+            direction=-1 if args.decrypt else 1,
+            offload_threshold=args.offload_threshold or OFFLOAD_THRESHOLD,
+        )
+
+        if not args.quiet:
+            host, port = server.sockets[0].getsockname()[:2]
+            print(f"proxying {host}:{port} to {args.upstream[0]}:{args.upstream[1]}", file=sys.stderr)
+
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def run_daemon(args):
+    """
+    Runs the daemon subcommand until it is interrupted.
+
+    Args:
+    -   args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+    -   int: The exit status.
+    """
+
+    import asyncio  # asyncio is only imported when the daemon runs
+
+    from .daemon import CipherDaemon
+    from .keycache import configure_key_cache
+
+    configure_key_cache(args.cache_entries, args.cache_bytes)
+    daemon = CipherDaemon(
+        args.path,
+        batch_window=args.batch_window / 1000,
+        batch_threshold=args.batch_threshold,
+        max_batch_size=args.max_batch_size,
+    )
+
+    async def serve():
+        await daemon.start()
+
+        if not args.quiet:
+            print(f"serving on {args.path}", file=sys.stderr)
+
+        await daemon.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+    if not args.quiet:
+        print(", ".join(f"{name} {count:,}" for name, count in daemon.stats.items()), file=sys.stderr)
+
+    return 0
+
+
+def run_batch(args):
+    """
+    Runs the encrypt and decrypt subcommands: the standard input is written to the standard output, or each
+    file to its output file, and the throughput is reported on the standard error stream at the end.
+
+    Args:
+    -   args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+    -   int: The exit status.
+    """
+
+    from .batch import output_path, transform_file, transform_records, transform_stream
+
+    direction = 1 if args.command == "encrypt" else -1
+    key = None if args.key_file is not None else parse_key(args.algo, args.key)
+    options = {"zigzag": True} if args.zigzag else {}
+    start = time.perf_counter()
+
+    if not args.files:
+        source, target = sys.stdin.buffer, sys.stdout.buffer
+
+        try:
+            if args.key_file is None:
+                total = transform_stream(args.algo, key, direction, source, target, args.chunk_size, **options)
+            else:
+                with open(args.key_file, encoding="utf-8") as keys:
+                    total = transform_records(args.algo, keys, direction, source, target, **options)
+
+            target.flush()
+        except BrokenPipeError:
+            # The reader stopped early (e.g. | head), so the rest of the output is discarded quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+
+        files = 1
+    else:
+        suffix = args.suffix if args.suffix is not None else f".{args.command}ed"
+        jobs = [
+            (args.algo, key, direction, path, output_path(path, args.output_dir, suffix), args.chunk_size)
+            for path in args.files
+        ]
+
+        if args.jobs > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor  # the pool is only imported for many files
+
+            with ProcessPoolExecutor(min(args.jobs, len(jobs))) as executor:
+                futures = [executor.submit(transform_file, *job, args.key_file, options) for job in jobs]
+                total = sum(future.result() for future in futures)
+        else:
+            total = sum(transform_file(*job, args.key_file, options) for job in jobs)
+
+        files = len(jobs)
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        print(
+            f"{args.command}ed {total:,} bytes in {files:,} file(s) in {elapsed:.3f}s "
+            f"({total / max(elapsed, 1e-9) / 1e6:.1f} MB/s)",
+            file=sys.stderr,
+        )
+
+    return 0
+
+
+def build_parser():
+    """
+    Builds the command line parser and its subcommands.
+
+    Returns:
+    -   argparse.ArgumentParser: The parser.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m classical_ciphers", description="Classical encryption algorithms."
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    in_place = subcommands.add_parser(
+        "inplace",
+        help="encrypt or decrypt a file in place through a memory map",
+        description="Encrypts or decrypts a file in place, one memory mapped window at a time. With --checkpoint, "
+        "an interrupted run can be resumed with --resume.",
+    )
+    in_place.add_argument("direction", choices=("encrypt", "decrypt"))
+    in_place.add_argument("cipher", choices=BYTE_CIPHERS)
+    in_place.add_argument("path", help="the file to transform in place")
+    in_place.add_argument("--key", help="the key, e.g. 3 (additive), 5,8 (affine) or LEMON (vigenere)")
+    in_place.add_argument(
+        "--window-size",
+        type=parse_size,
+        help="the number of bytes mapped at a time (default 16MB)",
+    )
+    in_place.add_argument("--checkpoint", help="the checkpoint file that records the progress")
+    in_place.add_argument("--resume", action="store_true", help="resume from the checkpoint")
+    in_place.add_argument("-q", "--quiet", action="store_true", help="do not report the progress")
+    in_place.set_defaults(run=run_in_place)
+
+    proxy = subcommands.add_parser(
+        "proxy",
+        help="encrypt the traffic of a line oriented TCP service",
+        description="Listens for TCP connections and forwards each one to the upstream server, encrypting the "
+        "traffic sent upstream and decrypting the traffic sent back (the other way around with --decrypt).",
+    )
+    proxy.add_argument("cipher", choices=available_ciphers())
+    proxy.add_argument("--key", help="the key, e.g. 3 (additive), 5,8 (affine) or LEMON (vigenere)")
+    proxy.add_argument("--listen", type=parse_address, default=("127.0.0.1", 0), help="the host:port to listen on")
+    proxy.add_argument("--upstream", type=parse_address, required=True, help="the host:port of the upstream server")
+    proxy.add_argument("--decrypt", action="store_true", help="decrypt the traffic sent upstream instead")
+    proxy.add_argument(
+        "--offload-threshold",
+        type=parse_size,
+        help="the length of the shortest line transformed in a thread by Hill, Playfair and Rail Fence (default 16KB)",
+    )
+    proxy.add_argument("-q", "--quiet", action="store_true", help="do not print the listening address")
+    proxy.set_defaults(run=run_proxy)
+
+    daemon = subcommands.add_parser(
+        "daemon",
+        help="serve encrypt and decrypt requests on a Unix socket",
+        description="Keeps the compiled ciphers warm and serves the requests of classical_ciphers.daemon.CipherClient "
+        "on a Unix socket. Small requests for the same key are transformed in batches, and large payloads are "
+        "passed in shared memory.",
+    )
+    daemon.add_argument("path", help="the path of the Unix socket")
+    daemon.add_argument(
+        "--batch-window",
+        type=float,
+        default=0.5,
+        help="the milliseconds a small request waits for others with the same key (default 0.5)",
+    )
+    daemon.add_argument(
+        "--batch-threshold",
+        type=parse_size,
+        default=4096,
+        help="the length of the shortest payload transformed on its own (default 4KB)",
+    )
+    daemon.add_argument("--max-batch-size", type=int, default=256, help="the most requests in one batch")
+    daemon.add_argument("--cache-entries", type=int, help="the most key schedules kept warm (default 1024)")
+    daemon.add_argument("--cache-bytes", type=parse_size, help="the most bytes of key schedules kept warm (default 64MB)")
+    daemon.add_argument("-q", "--quiet", action="store_true", help="do not print the socket and the statistics")
+    daemon.set_defaults(run=run_daemon)
+
+    for command in ("encrypt", "decrypt"):
+        batch = subcommands.add_parser(
+            command,
+            help=f"{command} the standard input, or many files",
+            description=f"Without files, {command}s the standard input to the standard output in large chunks "
+            "(the Hill, Playfair and Rail Fence ciphers transform each line as a message, keeping the line endings). "
+            f"With files, {command}s each one into a file of the same name with a suffix, across --jobs worker "
+            "processes. With --key-file, each line is a record transformed with the key on the same line of the "
+            "key file.",
+        )
+        batch.add_argument("files", nargs="*", help="the files to transform (the standard input by default)")
+        batch.add_argument("--algo", required=True, choices=available_ciphers(), help="the cipher")
+        keys = batch.add_mutually_exclusive_group()
+        keys.add_argument("--key", help="the key, e.g. 3 (additive), 5,8 (affine) or LEMON (vigenere)")
+        keys.add_argument("--key-file", help="a file with one key per line, one for each record (line) of the input")
+        batch.add_argument("--zigzag", action="store_true", help="use the zigzag Rail Fence cipher")
+        batch.add_argument("--output-dir", help="the directory of the output files (the directory of each file by default)")
+        batch.add_argument("--suffix", help=f"the suffix of the output files (default .{command}ed)")
+        batch.add_argument("-j", "--jobs", type=int, default=1, help="the number of files transformed at a time")
+        batch.add_argument(
+            "--chunk-size",
+            type=parse_size,
+            default=DEFAULT_CHUNK_SIZE,
+            help="the number of bytes read at a time (default 1MB)",
+        )
+        batch.add_argument("-q", "--quiet", action="store_true", help="do not report the throughput")
+        batch.set_defaults(run=run_batch)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs the command line interface.
+
+    Args:
+    -   argv (list): The arguments, sys.argv[1:] by default.
+
+    Returns:
+    -   int: The exit status.
+    """
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    # The other ciphers take no options, so get_cipher() would fail with a TypeError
+    if getattr(args, "zigzag", False) and args.algo != "rail_fence":
+        parser.error(f"--zigzag is only for the rail_fence cipher, not {args.algo}")
+
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))  # prints the usage and the error, and exits with status 2
@@ -0,0 +1,222 @@
+import string  # Import string for the ASCII letters
+
+BUFFER_CHUNK_SIZE = 65536  # the number of bytes translated at a time, bounding the temporary copies
+
+
+class TranslationTable(dict):
+    """
+    A translation table for str.translate() that maps character codes to their encrypted characters.
+
+    The ASCII characters are filled in when the table is built, so the table does not grow afterwards
+    (it is kept in the key schedule cache, which measures it once). Any other character is looked up
+    as missing and left unchanged by str.translate().
+
+    Args:
+    -   char_function (function): Encrypts a single alphabetic character and returns the new character.
+    -   prefill (bool): Whether to fill in the ASCII letters when the table is built.
+    """
+
+    def __init__(self, char_function, prefill=True):
+        super().__init__()
+        self.char_function = char_function
+
+        # Fill in the ASCII characters up front, the letters only when prefill is set
+        for code in range(128):
+            if chr(code) not in string.ascii_letters:
+                self[code] = chr(code)  # if the character is not an ASCII letter, it is left unchanged
+            elif prefill:
+                self[code] = char_function(chr(code))
+
+    def __missing__(self, code):
+        # Only the ASCII letters are alphabetic, isalpha() would also accept letters such as "é". Raising
+        # LookupError makes str.translate() keep the character, without adding it to the table.
+        if code > 127:
+            raise LookupError(code)
+
+        return self.char_function(chr(code))  # an ASCII letter of a table built without prefill
+
+
+def translate_text(text: str, table: TranslationTable, byte_table: bytes):
+    """
+    Translates a text with a translation table. A text with non-ASCII characters is translated through
+    its UTF-8 bytes instead, where those characters are bytes above 127 that the byte table leaves
+    unchanged, so str.translate() does not look each of them up in the table.
+
+    Args:
+    -   text (str): The text.
+    -   table (TranslationTable): The translation table.
+    -   byte_table (bytes): The same translation for bytes.translate(), or None to always use the table.
+
+    Returns:
+    -   str: The translated text.
+    """
+
+    if byte_table is None or text.isascii():
+        return text.translate(table)
+
+    # surrogatepass keeps lone surrogates, which str.translate() would also leave unchanged
+    return text.encode("utf-8", "surrogatepass").translate(byte_table).decode("utf-8", "surrogatepass")
+
+
+def build_byte_table(char_function):
+    """
+    Builds a 256 byte table for bytes.translate() from a single character function.
+    Only the ASCII letters are treated as alphabetic, every other byte is left unchanged.
+
+    Args:
+    -   char_function (function): Encrypts a single alphabetic character and returns the new character.
+
+    Returns:
+    -   bytes: The translation table.
+    """
+
+    table = bytearray(range(256))  # start with the identity table
+
+    for char in string.ascii_letters:
+        table[ord(char)] = ord(char_function(char))
+
+    return bytes(table)
+
+
+def iterate_chunks(source, chunk_size=65536):
+    """
+    Yields the text of a chunked source one chunk at a time.
+
+    Args:
+    -   source (iterable or file): An iterable of text chunks, or a file object opened in text mode.
+    -   chunk_size (int): The number of characters read at a time from a file object.
+
+    Yields:
+    -   str: The next chunk of text.
+    """
+
+    # File objects are read in fixed size chunks, so a long line never has to fit in memory
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+
+            if not chunk:
+                return
+
+            yield chunk
+
+    # A single string is treated as a single chunk
+    elif isinstance(source, str):
+        yield source
+
+    else:
+        yield from source
+
+
+def byte_view(data, writable: bool = False):
+    """
+    Returns a flat memoryview of the unsigned bytes of a buffer, without copying it.
+
+    Args:
+    -   data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   writable (bool): Whether the buffer has to be writable.
+
+    Returns:
+    -   memoryview: The bytes of the buffer.
+
+    Raises:
+    -   TypeError: If the buffer does not hold single bytes, is not contiguous, or is not writable.
+    """
+
+    view = memoryview(data)
+
+    if view.itemsize != 1 or not view.c_contiguous:
+        raise TypeError("The buffer must be a contiguous buffer of single bytes")
+
+    if writable and view.readonly:
+        raise TypeError("The output buffer must be writable")
+
+    return view.cast("B") if view.format != "B" or view.ndim != 1 else view
+
+
+def output_view(source, out):
+    """
+    Returns the output buffer of a buffer transform and a view of its bytes.
+
+    Args:
+    -   source (memoryview): The bytes of the input buffer.
+    -   out (bytes-like): The writable output buffer (the input buffer itself to transform it in place),
+        or None to allocate a new bytearray.
+
+    Returns:
+    -   tuple: A tuple containing the output buffer and a memoryview of its bytes.
+
+    Raises:
+    -   TypeError: If the output buffer is not a writable buffer of single bytes.
+    -   ValueError: If the output buffer does not have the length of the input buffer.
+    """
+
+    if out is None:
+        out = bytearray(len(source))
+
+    target = byte_view(out, writable=True)
+
+    if len(target) != len(source):
+        raise ValueError(
+            f"The output buffer must have the length of the input buffer ({len(source)} bytes, not {len(target)})"
+        )
+
+    return out, target
+
+
+def translate_buffer(data, byte_table: bytes, out=None):
+    """
+    Translates a buffer with a 256 byte table into an output buffer, or in place.
+
+    The buffer is translated one chunk at a time with bytes.translate(), so only two chunk sized copies
+    are ever allocated, however long the buffer is.
+
+    Args:
+    -   data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   byte_table (bytes): The translation table returned by build_byte_table().
+    -   out (bytes-like): The writable output buffer (data itself to translate it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+
+    Raises:
+    -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+    -   ValueError: If the output buffer does not have the length of the input buffer.
+    """
+
+    source = byte_view(data)
+    out, target = output_view(source, out)
+
+    for start in range(0, len(source), BUFFER_CHUNK_SIZE):
+        stop = start + BUFFER_CHUNK_SIZE
+        target[start:stop] = source[start:stop].tobytes().translate(byte_table)
+
+    return out
+
+
+def transform_buffer_in_place(cipher, name: str, direction: int, buffer, phase: int = 0):
+    """
+    Encrypts or decrypts a writable buffer in place with a compiled byte cipher, one piece of a longer
+    stream at a time.
+
+    Args:
+    -   cipher (object): The compiled Additive, Affine, Atbash or Vigenere cipher.
+    -   name (str): The name of the cipher.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   buffer (bytes-like): The writable buffer, e.g. a bytearray, a memoryview or a mapped window of a file.
+    -   phase (int): The number of letters before the buffer (Vigenere only).
+
+    Returns:
+    -   int: The number of letters up to the end of the buffer (Vigenere only).
+    """
+
+    if name == "vigenere":
+        _, phase = cipher.shift_buffer(buffer, direction, phase, out=buffer)
+
+    elif direction == 1:
+        cipher.encrypt_buffer(buffer, out=buffer)
+    else:
+        cipher.decrypt_buffer(buffer, out=buffer)
+
+    return phase
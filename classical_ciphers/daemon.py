@@ -0,0 +1,675 @@
+import asyncio  # Import asyncio for the server of the daemon
+import os  # Import os to restrict the socket to the owner and to remove a stale socket
+import socket  # Import socket for the blocking client
+import struct  # Import struct for the binary frames
+import threading  # Import threading for the lock of the client
+from multiprocessing import resource_tracker, shared_memory  # Import shared_memory to pass large payloads
+
+from . import available_ciphers, get_cipher
+from .batch import BYTE_CIPHERS, parse_key
+from .common import transform_buffer_in_place
+
+# The ciphers whose batches are transformed with a single vectorized call
+BATCHED_CIPHERS = ("hill", "playfair")
+
+CIPHER_NAMES = tuple(available_ciphers())  # a cipher is sent as its index in this tuple
+
+# request id, direction, flags, cipher index, key length, data length, shared memory name length
+REQUEST = struct.Struct("!IbBBHIH")
+
+# request id, status, flags, body length (the result, the length of the result in shared memory, or the error)
+RESPONSE = struct.Struct("!IBBI")
+
+SHARED = 1  # the payload (or the result) is in the shared memory segment named in the request
+ZIGZAG = 2  # the zigzag Rail Fence cipher
+
+OK, ERROR = 0, 1  # the status of a response
+
+BATCH_WINDOW = 0.0005  # seconds a small request waits for others with the same key
+BATCH_THRESHOLD = 4096  # payloads at least this long are transformed on their own, in the executor
+MAX_BATCH_SIZE = 256  # the most requests transformed in one batch
+SHARED_MEMORY_THRESHOLD = 1 << 20  # payloads at least this long are passed by the client in shared memory
+MAX_INLINE_LENGTH = 64 << 20  # the longest payload or key accepted in a frame
+
+
+def format_key(name: str, key):
+    """
+    Converts the key of a cipher to the text sent to the daemon, the inverse of batch.parse_key().
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher, e.g. 3 (additive), (5, 8) (affine) or "LEMON" (vigenere).
+
+    Returns:
+    -   str: The key text.
+    """
+
+    if key is None:
+        return ""
+
+    if name == "affine":
+        return f"{key[0]},{key[1]}"
+
+    return str(key)
+
+
+def transform_payload(cipher, name: str, direction: int, payload):
+    """
+    Encrypts or decrypts a payload. The byte ciphers transform a writable payload in place.
+
+    Args:
+    -   cipher: The compiled cipher.
+    -   name (str): The name of the cipher.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   payload (bytes-like): The payload, e.g. a memoryview of a shared memory segment.
+
+    Returns:
+    -   bytes-like: The transformed payload (the payload itself when it was transformed in place).
+    """
+
+    if name in BYTE_CIPHERS:
+        if isinstance(payload, memoryview) and not payload.readonly:
+            transform_buffer_in_place(cipher, name, direction, payload)
+            return payload
+
+        return cipher.encrypt_buffer(payload) if direction == 1 else cipher.decrypt_buffer(payload)
+
+    text = bytes(payload).decode("utf-8", "surrogateescape")
+    text = cipher.encrypt(text) if direction == 1 else cipher.decrypt(text)
+
+    return text.encode("utf-8", "surrogateescape")
+
+
+def transform_batch(name: str, key, direction: int, payloads: list, options: dict = None):
+    """
+    Encrypts or decrypts many payloads with the same key.
+
+    The Hill and Playfair payloads are transformed with a single vectorized call. If that call fails (e.g.
+    one payload has a character that is not in the Playfair matrix), each payload is transformed on its
+    own, so only the bad payloads fail.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   payloads (list): The payloads.
+    -   options (dict): Extra options of the cipher, e.g. {"zigzag": True} for the Rail Fence cipher.
+
+    Returns:
+    -   list: The transformed payload, or the exception raised, for each payload.
+    """
+
+    try:
+        cipher = get_cipher(name, key, **(options or {}))
+    except ValueError as error:
+        return [error] * len(payloads)
+
+    if name in BATCHED_CIPHERS and len(payloads) > 1:
+        texts = [payload.decode("utf-8", "surrogateescape") for payload in payloads]
+
+        try:
+            results = cipher.encrypt_batch(texts) if direction == 1 else cipher.decrypt_batch(texts)
+        except ValueError:
+            pass
+        else:
+            return [result.encode("utf-8", "surrogateescape") for result in results]
+
+    results = []
+
+    for payload in payloads:
+        try:
+            results.append(transform_payload(cipher, name, direction, payload))
+        except ValueError as error:
+            results.append(error)
+
+    return results
+
+
+def attach_shared_memory(name: str):
+    """
+    Attaches a shared memory segment created by a client.
+
+    The client owns the segment and unlinks it, so the segment is unregistered from the resource tracker of
+    the daemon, which would otherwise unlink it again (with a warning) when the daemon exits.
+
+    Args:
+    -   name (str): The name of the segment.
+
+    Returns:
+    -   SharedMemory: The attached segment.
+    """
+
+    memory = shared_memory.SharedMemory(name=name)
+
+    try:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    except Exception:
+        pass  # the platform does not track shared memory
+
+    return memory
+
+
+class CipherDaemon:
+    """
+    A long running daemon that keeps the compiled ciphers warm and serves requests over a Unix socket.
+
+    Each request is a binary frame (REQUEST) with the key text and either the payload or the name of a
+    shared memory segment holding it, and each response a frame (RESPONSE) with the result. A connection
+    may send many requests before reading the responses, which are sent back as they complete, tagged with
+    the request id. Small requests that arrive within batch_window of each other with the same cipher, key
+    and direction are transformed as one batch, in the executor once the batch adds up to batch_threshold
+    bytes. Large payloads are transformed on their own in the executor, and the ones in shared memory are
+    written back in place when the result fits in the segment.
+
+    Attributes:
+    -   path (str): The path of the Unix socket.
+    -   stats (dict): The number of requests, errors, batches, batched requests and shared memory requests.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_window: float = BATCH_WINDOW,
+        batch_threshold: int = BATCH_THRESHOLD,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        executor=None,
+    ):
+        """
+        Creates the daemon. It starts listening when start() is awaited.
+
+        Args:
+        -   path (str): The path of the Unix socket.
+        -   batch_window (float): The seconds a small request waits for others with the same key.
+        -   batch_threshold (int): The length of the shortest payload transformed on its own, in the executor.
+        -   max_batch_size (int): The most requests transformed in one batch.
+        -   executor (concurrent.futures.Executor): The executor, or None for the default executor of the loop.
+        """
+
+        self.path = path
+        self.batch_window = batch_window
+        self.batch_threshold = batch_threshold
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self.server = None
+        self.pending = {}  # (cipher, key text, direction, flags) -> the [payload, future] of the waiting requests
+        self.stats = {"requests": 0, "errors": 0, "batches": 0, "batched_requests": 0, "shared_requests": 0}
+
+    async def start(self):
+        """
+        Starts listening on the Unix socket, replacing a stale socket file. Only the owner can connect.
+
+        Returns:
+        -   asyncio.Server: The listening server.
+        """
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self.server = await asyncio.start_unix_server(self.handle_connection, self.path)
+        os.chmod(self.path, 0o600)
+
+        return self.server
+
+    async def serve_forever(self):
+        """
+        Starts the daemon and serves the requests until it is cancelled.
+        """
+
+        server = self.server or await self.start()
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Reads the requests of a connection until it is closed, serving each one in its own task.
+
+        Args:
+        -   reader (asyncio.StreamReader): The reader of the connection.
+        -   writer (asyncio.StreamWriter): The writer of the connection.
+        """
+
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST.size)
+                except asyncio.IncompleteReadError:
+                    break
+
+                request_id, direction, flags, cipher_index, key_length, data_length, name_length = REQUEST.unpack(header)
+
+                if data_length > MAX_INLINE_LENGTH and not flags & SHARED:
+                    break  # the frame cannot be skipped safely, so the connection is closed
+
+                key_text = (await reader.readexactly(key_length)).decode("utf-8")
+
+                if flags & SHARED:
+                    payload = (await reader.readexactly(name_length)).decode("utf-8")
+                else:
+                    payload = await reader.readexactly(data_length)
+
+                task = asyncio.ensure_future(
+                    self.serve_request(
+                        writer, write_lock, request_id, direction, flags, cipher_index, key_text, data_length, payload
+                    )
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, UnicodeDecodeError):
+            pass
+        finally:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def serve_request(
+        self, writer, write_lock, request_id: int, direction: int, flags: int, cipher_index: int, key_text: str,
+        data_length: int, payload,
+    ):
+        """
+        Transforms the payload of a request and writes the response.
+
+        Args:
+        -   writer (asyncio.StreamWriter): The writer of the connection.
+        -   write_lock (asyncio.Lock): Serializes the responses of the connection.
+        -   request_id (int): The id of the request, sent back in the response.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+        -   flags (int): SHARED and ZIGZAG.
+        -   cipher_index (int): The index of the cipher in CIPHER_NAMES.
+        -   key_text (str): The key text.
+        -   data_length (int): The length of the payload.
+        -   payload: The payload (bytes), or the name of the shared memory segment holding it (str).
+        """
+
+        self.stats["requests"] += 1
+        response_flags, memory = 0, None
+
+        try:
+            if cipher_index >= len(CIPHER_NAMES) or direction not in (1, -1):
+                raise ValueError("The request has an unknown cipher or direction")
+
+            name = CIPHER_NAMES[cipher_index]
+
+            if flags & ZIGZAG and name != "rail_fence":
+                raise ValueError("The zigzag flag is only for the Rail Fence cipher")
+
+            key = parse_key(name, key_text)
+            options = {"zigzag": True} if flags & ZIGZAG else {}
+
+            if flags & SHARED:
+                self.stats["shared_requests"] += 1
+                memory = attach_shared_memory(payload)
+                result = await self.transform_shared(name, key, direction, memory, data_length, options)
+
+                if isinstance(result, int):
+                    response_flags, body = SHARED, b""
+                    length = result
+                else:
+                    body = bytes(result)
+                    length = len(body)
+            elif data_length >= self.batch_threshold:
+                body = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, transform_batch, name, key, direction, [payload], options
+                )
+                body = body[0]
+            else:
+                body = await self.submit(name, key_text, key, direction, flags & ZIGZAG, options, payload)
+
+            if isinstance(body, Exception):
+                raise body
+
+            if not response_flags:
+                body = bytes(body)
+                length = len(body)
+
+            status = OK
+        except Exception as error:  # any failure is sent back, so the client never waits for a lost response
+            self.stats["errors"] += 1
+            status, response_flags, body = ERROR, 0, str(error).encode("utf-8")
+            length = len(body)
+        finally:
+            if memory is not None:
+                memory.close()
+
+        async with write_lock:
+            writer.write(RESPONSE.pack(request_id, status, response_flags, length) + body)
+
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass  # the client went away, its other responses are dropped too
+
+    async def transform_shared(self, name: str, key, direction: int, memory, length: int, options: dict):
+        """
+        Transforms a payload in shared memory in the executor, writing the result back into the segment when
+        it fits.
+
+        Args:
+        -   name (str): The name of the cipher.
+        -   key: The key of the cipher.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+        -   memory (SharedMemory): The segment.
+        -   length (int): The length of the payload at the start of the segment.
+        -   options (dict): Extra options of the cipher.
+
+        Returns:
+        -   The length of the result written into the segment (int), or the result (bytes) if it does not fit.
+        """
+
+        def transform():
+            view = memory.buf[:length]
+
+            try:
+                result = transform_batch(name, key, direction, [view], options)[0]
+
+                if isinstance(result, Exception):
+                    raise result
+
+                if result is view:  # transformed in place
+                    return length
+
+                if len(result) <= memory.size:
+                    memory.buf[: len(result)] = result
+                    return len(result)
+
+                return bytes(result)
+            finally:
+                view.release()
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, transform)
+
+    def submit(self, name: str, key_text: str, key, direction: int, flags: int, options: dict, payload: bytes):
+        """
+        Adds a small request to the batch of its cipher, key and direction. The batch is transformed when it
+        is full, or batch_window seconds after its first request.
+
+        Args:
+        -   name (str): The name of the cipher.
+        -   key_text (str): The key text.
+        -   key: The key of the cipher.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+        -   flags (int): ZIGZAG or 0.
+        -   options (dict): Extra options of the cipher.
+        -   payload (bytes): The payload.
+
+        Returns:
+        -   asyncio.Future: The transformed payload, or the exception raised.
+        """
+
+        loop = asyncio.get_running_loop()
+        batch_key = (name, key_text, direction, flags)
+        future = loop.create_future()
+        batch = self.pending.get(batch_key)
+
+        if batch is None:
+            batch = self.pending[batch_key] = []
+            loop.call_later(self.batch_window, self.flush, batch_key, batch, key, options)
+
+        batch.append((payload, future))
+
+        if len(batch) >= self.max_batch_size:
+            self.flush(batch_key, batch, key, options)
+
+        return future
+
+    def flush(self, batch_key: tuple, batch: list, key, options: dict):
+        """
+        Transforms a batch of small requests, and completes their futures when it is done.
+
+        A batch whose payloads add up to at least batch_threshold bytes is transformed in the executor, like a
+        large payload, so a full batch (e.g. 256 Playfair payloads just under the threshold) does not stall
+        the other connections. Smaller batches are transformed in the event loop, where they cost less than
+        the hand off to the executor. If the batch fails as a whole, each of its futures gets the exception.
+
+        Args:
+        -   batch_key (tuple): The cipher, key text, direction and flags of the batch.
+        -   batch (list): The (payload, future) pairs of the batch.
+        -   key: The key of the cipher.
+        -   options (dict): Extra options of the cipher.
+        """
+
+        if self.pending.get(batch_key) is not batch:
+            return  # the batch was already transformed when it became full
+
+        del self.pending[batch_key]
+        self.stats["batches"] += 1
+        self.stats["batched_requests"] += len(batch)
+        payloads = [payload for payload, _ in batch]
+
+        if sum(len(payload) for payload in payloads) < self.batch_threshold:
+            try:
+                results = transform_batch(batch_key[0], key, batch_key[2], payloads, options)
+            except Exception as error:  # raised in an event loop callback, it would leave the futures pending
+                results = error
+
+            self.complete(batch, results)
+            return
+
+        def done(transformed: asyncio.Future):
+            if transformed.cancelled():
+                self.complete(batch, asyncio.CancelledError())
+            else:
+                self.complete(batch, transformed.exception() or transformed.result())
+
+        transformed = asyncio.get_running_loop().run_in_executor(
+            self.executor, transform_batch, batch_key[0], key, batch_key[2], payloads, options
+        )
+        transformed.add_done_callback(done)
+
+    @staticmethod
+    def complete(batch: list, results):
+        """
+        Completes the futures of a batch with its results.
+
+        Args:
+        -   batch (list): The (payload, future) pairs of the batch.
+        -   results (list or Exception): The result of each payload, or the exception that failed the whole batch.
+        """
+
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+
+            if isinstance(results, BaseException):
+                future.set_exception(results)
+            else:
+                future.set_result(results[index])
+
+
+async def start_daemon(path: str, **settings):
+    """
+    Starts a cipher daemon listening on a Unix socket.
+
+    Args:
+    -   path (str): The path of the Unix socket.
+    -   settings: The batch_window, batch_threshold, max_batch_size and executor of the CipherDaemon.
+
+    Returns:
+    -   CipherDaemon: The daemon, already listening (await daemon.serve_forever() to serve until cancelled).
+    """
+
+    daemon = CipherDaemon(path, **settings)
+    await daemon.start()
+
+    return daemon
+
+
+class DaemonError(Exception):
+    """
+    Raised by the client when the daemon could not transform a payload, e.g. because the key is not valid.
+    """
+
+
+class CipherClient:
+    """
+    A blocking client of the cipher daemon. The client can be shared by many threads (one request is sent
+    at a time), and transform_many() sends many requests before reading the responses.
+
+    Attributes:
+    -   path (str): The path of the Unix socket.
+    -   shared_memory_threshold (int): The length of the shortest payload passed in shared memory.
+    """
+
+    def __init__(self, path: str, shared_memory_threshold: int = SHARED_MEMORY_THRESHOLD, timeout: float = None):
+        """
+        Connects to the daemon.
+
+        Args:
+        -   path (str): The path of the Unix socket.
+        -   shared_memory_threshold (int): The length of the shortest payload passed in shared memory.
+        -   timeout (float): The timeout of the socket in seconds, or None to wait forever.
+
+        Raises:
+        -   OSError: If the daemon is not running.
+        """
+
+        self.path = path
+        self.shared_memory_threshold = shared_memory_threshold
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rb")
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def encrypt(self, name: str, key, data, **options):
+        """
+        Encrypts a payload in the daemon.
+
+        Args:
+        -   name (str): The name of the cipher.
+        -   key: The key of the cipher (None for Atbash).
+        -   data (str or bytes-like): The payload.
+        -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+        Returns:
+        -   str or bytes: The encrypted payload (str if data is a str).
+
+        Raises:
+        -   DaemonError: If the daemon could not encrypt the payload.
+        """
+
+        return self.transform_many([(name, key, 1, data)], **options)[0]
+
+    def decrypt(self, name: str, key, data, **options):
+        """
+        Decrypts a payload in the daemon.
+
+        Args:
+        -   name (str): The name of the cipher.
+        -   key: The key of the cipher (None for Atbash).
+        -   data (str or bytes-like): The payload.
+        -   options: Extra options of the cipher, e.g. zigzag=True for the Rail Fence cipher.
+
+        Returns:
+        -   str or bytes: The decrypted payload (str if data is a str).
+
+        Raises:
+        -   DaemonError: If the daemon could not decrypt the payload.
+        """
+
+        return self.transform_many([(name, key, -1, data)], **options)[0]
+
+    def transform_many(self, requests: list, **options):
+        """
+        Sends many requests at once and waits for all the responses, so the daemon can batch them.
+
+        Args:
+        -   requests (list): The (cipher name, key, direction, data) of each request.
+        -   options: Extra options of the ciphers, e.g. zigzag=True for the Rail Fence cipher.
+
+        Returns:
+        -   list: The transformed payloads, in the order of the requests (str for the str payloads).
+
+        Raises:
+        -   DaemonError: If the daemon could not transform a payload (the first error is raised).
+        -   ValueError: If there is no cipher with a given name.
+        """
+
+        frames, segments, ids = [], {}, []
+
+        with self.lock:
+            try:
+                for name, key, direction, data in requests:
+                    name = name.strip().lower().replace(" ", "_").replace("-", "_")
+
+                    if name not in CIPHER_NAMES:
+                        raise ValueError(f"Unknown cipher {name!r}, expected one of {', '.join(CIPHER_NAMES)}")
+
+                    payload = data.encode("utf-8", "surrogateescape") if isinstance(data, str) else data
+                    key_bytes = format_key(name, key).encode("utf-8")
+                    flags = ZIGZAG if options.get("zigzag") else 0
+                    request_id = self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+                    length = memoryview(payload).nbytes
+
+                    if length >= self.shared_memory_threshold:
+                        memory = shared_memory.SharedMemory(create=True, size=length)
+                        memory.buf[:length] = memoryview(payload).cast("B")
+                        segments[request_id] = memory
+                        name_bytes = memory.name.encode("utf-8")
+                        header = REQUEST.pack(
+                            request_id, direction, flags | SHARED, CIPHER_NAMES.index(name), len(key_bytes), length,
+                            len(name_bytes),
+                        )
+                        frames += [header, key_bytes, name_bytes]
+                    else:
+                        header = REQUEST.pack(
+                            request_id, direction, flags, CIPHER_NAMES.index(name), len(key_bytes), length, 0
+                        )
+                        frames += [header, key_bytes, payload]
+
+                    ids.append((request_id, isinstance(data, str)))
+
+                self.socket.sendall(b"".join(frames))
+                responses = {}
+
+                for _ in ids:
+                    header = self.file.read(RESPONSE.size)
+
+                    if len(header) < RESPONSE.size:
+                        raise ConnectionError("The cipher daemon closed the connection")
+
+                    request_id, status, flags, length = RESPONSE.unpack(header)
+
+                    if flags & SHARED:
+                        body = bytes(segments[request_id].buf[:length])
+                    else:
+                        body = self.file.read(length)
+
+                    responses[request_id] = (status, body)
+            finally:
+                for memory in segments.values():
+                    memory.close()
+                    memory.unlink()
+
+        results = []
+
+        for request_id, is_text in ids:
+            status, body = responses[request_id]
+
+            if status != OK:
+                raise DaemonError(body.decode("utf-8", "replace"))
+
+            results.append(body.decode("utf-8", "surrogateescape") if is_text else body)
+
+        return results
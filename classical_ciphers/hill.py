@@ -0,0 +1,698 @@
+import numpy as np  # Import numpy for matrix operations
+import math  # Import math for square root function
+import tempfile  # Import tempfile to spill the rows of long streams to disk
+
+from .common import iterate_chunks
+from .keycache import cached_key_schedule, remeasure_key_schedule
+
+
+def initialize_key_matrix(key_text: str):
+    """
+    Initializes the key matrix for the Hill Cipher.
+
+    Args:
+    -   key_text (str): The key text used for encryption.
+
+    Returns:
+    -   numpy.ndarray: The key matrix.
+
+    Raises:
+    -   ValueError: If the key is empty or its length is not a perfect square.
+    """
+
+    matrix_size = math.sqrt(len(key_text))  # Calculate the matrix size
+
+    # An empty key would give an empty matrix, which cannot transform any block
+    if not key_text:
+        raise ValueError("The Hill key cannot be empty")
+
+    # If the matrix size is not an integer, the key length is not a perfect square
+    if matrix_size != int(matrix_size):
+        raise ValueError("The key length must be a perfect square")
+
+    matrix_size = int(matrix_size)  # Convert the matrix size to an integer
+
+    # Convert the key to uppercase
+    key_text = key_text.upper()
+
+    # Convert the key to number representations using the ASCII table
+    key_text = [ord(char) - 65 for char in key_text]
+
+    # Convert the key matrix to a numpy array using the matrix size
+    return np.array(list(key_text)).reshape(matrix_size, matrix_size)
+
+
+def upper_case_text(text: str):
+    """
+    Upper cases a text, one character for each character.
+
+    Args:
+    -   text (str): The text.
+
+    Returns:
+    -   str: The upper case text.
+
+    Raises:
+    -   ValueError: If a character is upper cased to more than one (e.g. "ß" to "SS"), which would move
+        the following characters to other blocks (or to other messages of a batch).
+    """
+
+    upper_text = text.upper()
+
+    if len(upper_text) != len(text):
+        raise ValueError("The text has a character that changes length when upper cased, e.g. 'ß' (SS)")
+
+    return upper_text
+
+
+def initialize_text_matrix(text: str, matrix_size: int):
+    """
+    Initializes the text matrix for the Hill Cipher, one block of matrix size characters per column.
+
+    Args:
+    -   text (str): The text to be encrypted or decrypted.
+    -   matrix_size (int): The size of the key matrix.
+
+    Returns:
+    -   numpy.ndarray: The text matrix.
+
+    Raises:
+    -   ValueError: If the length of the text is not a multiple of the matrix size, or it changes when upper cased.
+    """
+
+    # If the length of the cipher text is not a multiple of the matrix size, the cipher text cannot be encrypted
+    if len(text) % matrix_size != 0:
+        raise ValueError(
+            "The length of the cipher text must be a multiple of the matrix size"
+        )
+
+    # Convert the cipher text to uppercase
+    text = upper_case_text(text)
+
+    # Convert the cipher text to number representations using the ASCII table
+    text = [ord(char) - 65 for char in text]
+
+    # Convert the cipher matrix to a numpy array using the matrix size and transpose it
+    return np.array(list(text)).reshape(len(text) // matrix_size, matrix_size).T
+
+
+def initialize_matrices(key_text: str, text: str):
+    """
+    Initializes the key and plain matrices for the Hill Cipher encryption.
+
+    Args:
+    -   key_text (str): The key text used for encryption.
+    -   text (str): The plain text to be encrypted.
+
+    Returns:
+    -   tuple: A tuple containing the key matrix and the plain matrix.
+    Raises:
+    -   ValueError: If the key length is not a perfect square or if the length of the cipher text is not a multiple of the matrix size.
+    """
+
+    # The key is parsed once, in the shared key schedule cache (copied, so the caller may change it)
+    key_matrix = compile_hill_cipher(key_text).key_matrix.copy()
+    plain_matrix = initialize_text_matrix(text, len(key_matrix))  # Initialize the plain matrix
+
+    # Return the key and cipher matrices
+    return key_matrix, plain_matrix
+
+
+def mod_inverse(m, n):
+    """
+    Calculates the modular inverse of a number 'n' with respect to a modulus 'm', if it exists.
+    GCD(m, n) must be equal to 1 for the modular inverse to exist.
+
+    Parameters:
+    -   m (int): The modulus.
+    -   n (int): The number for which the modular inverse is to be calculated.
+
+    Returns:
+    -   int: The modular inverse of 'n' with respect to 'm'. Returns -1 if the modular inverse does not exist.
+    """
+
+    # Loop through all the numbers from 1 to n
+    for i in range(1, n):
+        # If the modular inverse exists, return it
+        if (m * i) % n == 1:
+            return i
+
+    return -1  # Return -1 if the modular inverse does not exist
+
+
+def integer_determinant(matrix):
+    """
+    Calculates the exact determinant of an integer matrix using fraction free (Bareiss) elimination.
+
+    Args:
+    -   matrix (numpy.ndarray): The square integer matrix.
+
+    Returns:
+    -   int: The determinant of the matrix.
+    """
+
+    rows = [[int(value) for value in row] for row in matrix]  # Python integers never overflow
+    matrix_size = len(rows)
+    sign = 1
+    previous_pivot = 1
+
+    for k in range(matrix_size - 1):
+        # If the pivot is zero, swap with a row below that has a non zero value in the column
+        if rows[k][k] == 0:
+            for i in range(k + 1, matrix_size):
+                if rows[i][k] != 0:
+                    rows[k], rows[i] = rows[i], rows[k]
+                    sign = -sign
+                    break
+            else:
+                return 0  # the whole column is zero, so the matrix is singular
+
+        # Eliminate the column below the pivot, every division is exact
+        for i in range(k + 1, matrix_size):
+            for j in range(k + 1, matrix_size):
+                rows[i][j] = (
+                    rows[i][j] * rows[k][k] - rows[i][k] * rows[k][j]
+                ) // previous_pivot
+
+        previous_pivot = rows[k][k]
+
+    return sign * rows[-1][-1] if matrix_size else 1
+
+
+def invert_matrix_mod_prime(matrix, prime: int):
+    """
+    Calculates the inverse of an integer matrix modulo a prime number using Gauss-Jordan elimination.
+
+    Args:
+    -   matrix (numpy.ndarray): The square integer matrix.
+    -   prime (int): The prime modulus.
+
+    Returns:
+    -   list: The rows of the inverse matrix.
+
+    Raises:
+    -   ValueError: If the matrix is not invertible modulo the prime.
+    """
+
+    matrix_size = len(matrix)
+
+    # Put the identity matrix next to the matrix
+    rows = [
+        [int(value) % prime for value in row] + [int(i == j) for j in range(matrix_size)]
+        for i, row in enumerate(matrix)
+    ]
+
+    for k in range(matrix_size):
+        # Find a row with a non zero value in the column, every non zero value is invertible modulo a prime
+        pivot_row = next((i for i in range(k, matrix_size) if rows[i][k]), None)
+
+        if pivot_row is None:
+            raise ValueError("The key matrix is not invertible")
+
+        rows[k], rows[pivot_row] = rows[pivot_row], rows[k]
+
+        # Scale the pivot row so the pivot becomes 1
+        pivot_inv = mod_inverse(rows[k][k], prime)
+        rows[k] = [(value * pivot_inv) % prime for value in rows[k]]
+
+        # Eliminate the column from every other row
+        for i in range(matrix_size):
+            if i != k and rows[i][k]:
+                factor = rows[i][k]
+                rows[i] = [
+                    (value - factor * pivot_value) % prime
+                    for value, pivot_value in zip(rows[i], rows[k])
+                ]
+
+    return [row[matrix_size:] for row in rows]  # the right half is the inverse
+
+
+def invert_key_matrix(key_matrix):
+    """
+    Calculates the inverse of the key matrix modulo 26 using exact integer arithmetic.
+
+    26 = 2 * 13, so the matrix is inverted modulo 2 and modulo 13, where Gauss-Jordan elimination
+    always works, and the two inverses are combined with the Chinese remainder theorem.
+
+    Args:
+    -   key_matrix (numpy.ndarray): The key matrix.
+
+    Returns:
+    -   numpy.ndarray: The inverse of the key matrix.
+
+    Raises:
+    -   ValueError: If the key matrix is singular or not invertible modulo 26.
+    """
+
+    # Calculate the determinant of the key matrix
+    key_matrix_det = integer_determinant(key_matrix)
+
+    # If the determinant is 0, the key matrix is singular and the inverse does not exist
+    if key_matrix_det == 0:
+        raise ValueError("The key matrix is singular")
+
+    # If the determinant is not coprime with 26, the inverse does not exist
+    if math.gcd(key_matrix_det, 26) != 1:
+        raise ValueError("The key matrix is not invertible")
+
+    # Calculate the inverse of the key matrix modulo 2 and modulo 13
+    inverse_mod_2 = np.array(invert_matrix_mod_prime(key_matrix, 2), dtype=np.int64)
+    inverse_mod_13 = np.array(invert_matrix_mod_prime(key_matrix, 13), dtype=np.int64)
+
+    # Combine them modulo 26 (13 is 1 modulo 2 and 0 modulo 13, 14 is 0 modulo 2 and 1 modulo 13)
+    key_matrix_inv = (13 * inverse_mod_2 + 14 * inverse_mod_13) % 26
+
+    return key_matrix_inv.reshape(key_matrix.shape)  # Return the inverse of the key matrix
+
+
+class HillCipher:
+    """
+    A compiled Hill cipher for a single key.
+
+    The key matrix is built once for the key, and its inverse is calculated the first time
+    something is decrypted, so repeated calls with the same key only cost the matrix multiplication.
+
+    Args:
+    -   key_text (str): The key text used for encryption and decryption.
+
+    Raises:
+    -   ValueError: If the key is empty or its length is not a perfect square.
+    """
+
+    def __init__(self, key_text: str):
+        self.key_text = key_text
+        self.key_matrix = initialize_key_matrix(key_text)
+        self.matrix_size = len(self.key_matrix)
+        self._key_matrix_inv = None
+
+    @property
+    def key_matrix_inv(self):
+        """
+        The inverse of the key matrix modulo 26, calculated on first use.
+
+        Raises:
+        -   ValueError: If the key matrix is singular or not invertible modulo 26.
+        """
+
+        if self._key_matrix_inv is None:
+            self._key_matrix_inv = invert_key_matrix(self.key_matrix)
+            remeasure_key_schedule(self)  # the cached cipher is now larger
+
+        return self._key_matrix_inv
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Parameters:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text, the same as the text returned by hill_encrypt().
+        """
+
+        return hill_transform_batch(self.key_matrix, [plain_text])[0]
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text.
+
+        Parameters:
+        -   cipher_text (str): The cipher text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text, the same as the text returned by hill_decrypt().
+        """
+
+        return hill_transform_batch(self.key_matrix_inv, [cipher_text])[0]
+
+    def encrypt_matrix(self, plain_text: str):
+        """
+        Encrypts the given plain text and also returns the encrypted matrix.
+
+        Parameters:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   tuple: A tuple containing the encrypted text as a string and the encrypted matrix.
+        """
+
+        plain_matrix = initialize_text_matrix(plain_text, self.matrix_size)
+
+        return transform_matrix(self.key_matrix, plain_matrix)
+
+    def decrypt_matrix(self, cipher_text: str):
+        """
+        Decrypts the given cipher text and also returns the decrypted matrix.
+
+        Parameters:
+        -   cipher_text (str): The cipher text to be decrypted.
+
+        Returns:
+        -   tuple: A tuple containing the decrypted text as a string and the decrypted matrix.
+        """
+
+        cipher_matrix = initialize_text_matrix(cipher_text, self.matrix_size)
+
+        return transform_matrix(self.key_matrix_inv, cipher_matrix)
+
+    def encrypt_batch(self, plain_texts: list):
+        """
+        Encrypts many plain texts with a single matrix multiplication.
+
+        Parameters:
+        -   plain_texts (list): The plain texts to be encrypted.
+
+        Returns:
+        -   list: The encrypted texts.
+        """
+
+        return hill_transform_batch(self.key_matrix, plain_texts)
+
+    def decrypt_batch(self, cipher_texts: list):
+        """
+        Decrypts many cipher texts with a single matrix multiplication.
+
+        Parameters:
+        -   cipher_texts (list): The cipher texts to be decrypted.
+
+        Returns:
+        -   list: The decrypted texts.
+        """
+
+        return hill_transform_batch(self.key_matrix_inv, cipher_texts)
+
+    def encrypt_stream(self, plain_chunks):
+        """
+        Encrypts a stream of plain text chunks.
+
+        Parameters:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        yield from hill_transform_stream(self.key_matrix, plain_chunks)
+
+    def decrypt_stream(self, cipher_chunks):
+        """
+        Decrypts a stream of cipher text chunks.
+
+        Parameters:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        yield from hill_transform_stream(self.key_matrix_inv, cipher_chunks)
+
+
+def transform_matrix(key_matrix, text_matrix):
+    """
+    Multiplies the text matrix with the key matrix modulo 26.
+
+    Args:
+    -   key_matrix (numpy.ndarray): The key matrix or its inverse.
+    -   text_matrix (numpy.ndarray): The text matrix.
+
+    Returns:
+    -   tuple: A tuple containing the resulting text as a string and the resulting matrix.
+    """
+
+    # Multiply the key matrix with the text matrix and take the modulo 26
+    result_matrix = np.dot(key_matrix, text_matrix) % 26
+
+    # Convert the hill matrix to a string representation
+    result_str = "".join([chr(char + 65) for char in result_matrix.flatten()])
+
+    # Return the hill matrix
+    return result_str, result_matrix
+
+
+@cached_key_schedule("hill")
+def compile_hill_cipher(key_text: str):
+    """
+    Returns the compiled Hill cipher for the given key.
+    The most recently used ciphers are cached, so repeated calls with the same key skip the build step.
+
+    Args:
+    -   key_text (str): The key text.
+
+    Returns:
+    -   HillCipher: The compiled cipher.
+    """
+
+    return HillCipher(key_text)
+
+
+def hill_encrypt(key_text: str, plain_text: str):
+    """
+    Encrypts the given cipher text using the Hill Cipher algorithm.
+
+    Parameters:
+    -   key_text (str): The key text used for encryption.
+    -   plain_text (str): The plain text to be encrypted.
+
+    Returns:
+    -   tuple: A tuple containing the encrypted text as a string and the encrypted matrix.
+    """
+
+    # Multiply the plain matrix with the compiled key matrix
+    return compile_hill_cipher(key_text).encrypt_matrix(plain_text)
+
+
+def hill_decrypt(key_text: str, cipher_text: str):
+    """
+    Decrypts the given cipher text using the Hill Cipher algorithm.
+
+    Parameters:
+    -   key_text (str): The key text used for decryption.
+    -   cipher_text (str): The cipher text to be decrypted.
+
+    Returns:
+    -   tuple: A tuple containing the decrypted text as a string and the decrypted matrix.
+    """
+
+    # Multiply the cipher matrix with the compiled inverse of the key matrix
+    return compile_hill_cipher(key_text).decrypt_matrix(cipher_text)
+
+
+def transform_blocks(key_matrix, values):
+    """
+    Multiplies each block of matrix size values by the key matrix modulo 26.
+
+    Args:
+    -   key_matrix (numpy.ndarray): The key matrix or its inverse.
+    -   values (numpy.ndarray): The uint8 values of the text modulo 26 (A = 0), a multiple of the matrix size long.
+
+    Returns:
+    -   numpy.ndarray: The resulting uint8 values, one block per row.
+    """
+
+    matrix_size = len(key_matrix)  # Get the matrix size
+
+    # A 32 bit accumulator holds matrix_size * 25 * 25 without overflowing for any practical key size
+    accumulator = np.int32 if matrix_size * 25 * 25 < 2**31 else np.int64
+    key_matrix = (np.asarray(key_matrix) % 26).astype(accumulator)
+
+    # Multiply the blocks (one block per row) and take the modulo 26
+    block_matrix = values.reshape(len(values) // matrix_size, matrix_size)
+
+    return (np.dot(block_matrix.astype(accumulator), key_matrix.T) % 26).astype(np.uint8)
+
+
+def hill_transform_batch(key_matrix, messages: list):
+    """
+    Multiplies many messages by the key matrix with a single matrix multiplication.
+
+    The messages are packed into one uint8 block matrix, multiplied with a 32 bit accumulator, and each
+    message is written row by row like hill_encrypt() and hill_decrypt() do, without a Python loop over the messages.
+
+    Args:
+    -   key_matrix (numpy.ndarray): The key matrix or its inverse.
+    -   messages (list): The messages, each with a length that is a multiple of the matrix size.
+
+    Returns:
+    -   list: The resulting messages as strings.
+
+    Raises:
+    -   ValueError: If the length of a message is not a multiple of the matrix size, or it changes when upper cased.
+    """
+
+    matrix_size = len(key_matrix)  # Get the matrix size
+    lengths = np.array([len(message) for message in messages], dtype=np.int64)
+
+    # If the length of a message is not a multiple of the matrix size, the messages cannot be transformed
+    if (lengths % matrix_size).any():
+        raise ValueError(
+            "The length of the cipher text must be a multiple of the matrix size"
+        )
+
+    text = upper_case_text("".join(messages))  # Pack all the messages into one upper case text
+
+    # Convert the text to numbers modulo 26 (A = 0), which fit in a single byte
+    if text.isascii():
+        codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8).astype(np.int16)
+    else:
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").astype(np.int64)
+
+    values = ((codes - 65) % 26).astype(np.uint8)
+
+    # Multiply every block of every message at once (one block per row)
+    result = transform_blocks(key_matrix, values)
+
+    # Each message is written row by row: character j of a message with b blocks is
+    # row j // b of its block (start + j % b), which is gathered with a single index array
+    block_counts = lengths // matrix_size
+    message_starts = np.repeat(np.cumsum(block_counts) - block_counts, lengths)
+    message_blocks = np.repeat(block_counts, lengths)
+    positions = np.arange(len(values), dtype=np.int64) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    index = (message_starts + positions % message_blocks) * matrix_size
+    index += positions // message_blocks
+
+    result_text = (result.reshape(-1)[index] + 65).tobytes().decode("ascii")
+
+    # Split the result back into the messages
+    offsets = np.cumsum(lengths).tolist()
+
+    return [result_text[end - length : end] for end, length in zip(offsets, lengths.tolist())]
+
+
+def hill_encrypt_batch(key_text: str, plain_texts: list):
+    """
+    Encrypts many plain texts with the same key using the Hill Cipher algorithm.
+    Each encrypted text is the same as the one returned by hill_encrypt().
+
+    Parameters:
+    -   key_text (str): The key text used for encryption.
+    -   plain_texts (list): The plain texts to be encrypted.
+
+    Returns:
+    -   list: The encrypted texts.
+    """
+
+    # Multiply all the plain texts with the compiled key matrix at once
+    return compile_hill_cipher(key_text).encrypt_batch(plain_texts)
+
+
+def hill_decrypt_batch(key_text: str, cipher_texts: list):
+    """
+    Decrypts many cipher texts with the same key using the Hill Cipher algorithm.
+    Each decrypted text is the same as the one returned by hill_decrypt().
+
+    Parameters:
+    -   key_text (str): The key text used for decryption.
+    -   cipher_texts (list): The cipher texts to be decrypted.
+
+    Returns:
+    -   list: The decrypted texts.
+    """
+
+    # Multiply all the cipher texts with the compiled inverse of the key matrix at once
+    return compile_hill_cipher(key_text).decrypt_batch(cipher_texts)
+
+
+def hill_transform_stream(key_matrix, chunks):
+    """
+    Multiplies a stream of text by the key matrix, one block of matrix size characters at a time.
+
+    hill_encrypt() and hill_decrypt() write their result row by row: the first letter of every block,
+    then the second letter of every block, and so on. To give the same output without holding the text
+    in memory, each row is spilled to its own temporary file and the files are joined when the stream ends.
+
+    Args:
+    -   key_matrix (numpy.ndarray): The matrix to multiply the blocks with.
+    -   chunks (iterable or file): The text chunks, or a text file object to read them from.
+
+    Yields:
+    -   str: The resulting text chunks.
+
+    Raises:
+    -   ValueError: If the length of the text is not a multiple of the matrix size, or it changes when upper cased.
+    """
+
+    matrix_size = len(key_matrix)  # Get the matrix size
+    row_files = [tempfile.TemporaryFile() for _ in range(matrix_size)]
+
+    try:
+        remainder = ""  # the characters of a partial block, carried over to the next chunk
+
+        for chunk in iterate_chunks(chunks):
+            text = remainder + chunk
+
+            # Split off the characters that do not fill a whole block
+            blocks_length = len(text) - len(text) % matrix_size
+            remainder = text[blocks_length:]
+
+            if blocks_length == 0:
+                continue
+
+            # Convert the blocks to number representations using the ASCII table
+            values = np.frombuffer(
+                upper_case_text(text[:blocks_length]).encode("utf-32-le"), dtype="<u4"
+            ).astype(np.int64) - 65
+
+            # Multiply the key matrix with the block matrix and take the modulo 26
+            block_matrix = values.reshape(blocks_length // matrix_size, matrix_size).T
+            result_matrix = np.dot(key_matrix, block_matrix) % 26
+
+            # Append each row of the result to its own file
+            for row, row_file in zip(result_matrix, row_files):
+                row_file.write((row + 65).astype(np.uint8).tobytes())
+
+        # If a partial block is left, the text cannot be transformed
+        if remainder:
+            raise ValueError(
+                "The length of the cipher text must be a multiple of the matrix size"
+            )
+
+        # Yield the rows one after the other
+        for row_file in row_files:
+            row_file.seek(0)
+
+            while True:
+                data = row_file.read(65536)
+
+                if not data:
+                    break
+
+                yield data.decode("ascii")
+    finally:
+        for row_file in row_files:
+            row_file.close()
+
+
+def hill_encrypt_stream(key_text: str, plain_chunks):
+    """
+    Encrypts a stream of plain text chunks using the Hill Cipher algorithm.
+    The output is the same as the encrypted text returned by hill_encrypt().
+
+    Parameters:
+    -   key_text (str): The key text used for encryption.
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+    Yields:
+    -   str: The encrypted chunks.
+    """
+
+    yield from compile_hill_cipher(key_text).encrypt_stream(plain_chunks)
+
+
+def hill_decrypt_stream(key_text: str, cipher_chunks):
+    """
+    Decrypts a stream of cipher text chunks using the Hill Cipher algorithm.
+    The output is the same as the decrypted text returned by hill_decrypt().
+
+    Parameters:
+    -   key_text (str): The key text used for decryption.
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+    Yields:
+    -   str: The decrypted chunks.
+    """
+
+    yield from compile_hill_cipher(key_text).decrypt_stream(cipher_chunks)
@@ -0,0 +1,325 @@
+import hashlib  # Import hashlib to fingerprint the key in the checkpoint
+import json  # Import json to read and write the checkpoints
+import mmap  # Import mmap to map the windows of the file
+import os  # Import os to replace and sync the checkpoint files
+import struct  # Import struct for the offset at the start of the journal
+
+from . import get_cipher
+from .batch import BYTE_CIPHERS
+from .common import BUFFER_CHUNK_SIZE, transform_buffer_in_place
+
+IN_PLACE_CIPHERS = BYTE_CIPHERS
+
+DEFAULT_WINDOW_SIZE = 16 * 1024 * 1024  # 16 MiB of the file mapped at a time
+
+JOURNAL_HEADER = struct.Struct("<Q")  # the offset of the window saved in the journal
+
+
+def window_bounds(length: int, window_size: int, start: int = 0):
+    """
+    Splits a file into windows that start at multiples of the allocation granularity, as mmap requires.
+
+    Args:
+    -   length (int): The length of the file.
+    -   window_size (int): The requested number of bytes in each window.
+    -   start (int): The offset of the first window, a window boundary returned by an earlier call.
+
+    Returns:
+    -   list: The (start, stop) bounds of each window.
+    """
+
+    granularity = mmap.ALLOCATIONGRANULARITY
+    window_size = max(window_size // granularity, 1) * granularity
+
+    return [(offset, min(offset + window_size, length)) for offset in range(start, length, window_size)]
+
+
+def key_fingerprint(name: str, key, direction: int):
+    """
+    Fingerprints the cipher, key and direction of a transform, so a checkpoint is never resumed with
+    another key. The key itself is never written to the checkpoint.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+
+    Returns:
+    -   str: The hexadecimal SHA-256 fingerprint.
+    """
+
+    # An affine key is the same key as a list or a tuple
+    if isinstance(key, list):
+        key = tuple(key)
+
+    return hashlib.sha256(repr((name, key, direction)).encode("utf-8")).hexdigest()
+
+
+def write_file_atomically(path: str, data: bytes):
+    """
+    Writes a small file so that it is either entirely old or entirely new after a crash.
+
+    Args:
+    -   path (str): The path of the file.
+    -   data (bytes): The new contents.
+    """
+
+    temporary_path = f"{path}.tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary_path, path)
+
+
+def copy_file_range(source, target, count: int, source_offset: int, target_offset: int):
+    """
+    Copies a range of bytes from one file to another. The kernel copies them (os.copy_file_range) where it
+    can, so they are never read into Python objects; otherwise they are copied through one chunk of memory.
+
+    Args:
+    -   source (file): The file to copy from.
+    -   target (file): The file to copy to.
+    -   count (int): The number of bytes to copy.
+    -   source_offset (int): The offset of the bytes in the source.
+    -   target_offset (int): The offset the bytes are copied to in the target.
+    """
+
+    copied = 0
+
+    try:
+        while copied < count:
+            length = os.copy_file_range(
+                source.fileno(), target.fileno(), count - copied, source_offset + copied, target_offset + copied
+            )
+
+            if not length:
+                break
+
+            copied += length
+    except (AttributeError, OSError):
+        pass  # copy_file_range() is Linux only, and some file systems do not support it
+
+    while copied < count:
+        chunk = os.pread(source.fileno(), min(count - copied, BUFFER_CHUNK_SIZE), source_offset + copied)
+
+        if not chunk:
+            break
+
+        os.pwrite(target.fileno(), chunk, target_offset + copied)
+        copied += len(chunk)
+
+
+def save_journal(journal_path: str, file, start: int, stop: int):
+    """
+    Saves the original bytes of a window to the journal before the window is changed, so that either the
+    old journal or the whole new one is on disk after a crash.
+
+    Args:
+    -   journal_path (str): The path of the journal.
+    -   file (file): The file.
+    -   start (int): The offset of the window.
+    -   stop (int): The end of the window.
+    """
+
+    temporary_path = f"{journal_path}.tmp"
+
+    with open(temporary_path, "wb") as journal:
+        journal.write(JOURNAL_HEADER.pack(start))
+        journal.flush()
+        copy_file_range(file, journal, stop - start, start, JOURNAL_HEADER.size)
+        os.fsync(journal.fileno())
+
+    os.replace(temporary_path, journal_path)
+
+
+def read_checkpoint(checkpoint_path: str, fingerprint: str, length: int):
+    """
+    Reads the offset and the Vigenere phase to resume from.
+
+    Args:
+    -   checkpoint_path (str): The path of the checkpoint.
+    -   fingerprint (str): The fingerprint of the current transform.
+    -   length (int): The length of the file.
+
+    Returns:
+    -   tuple: The offset and the phase, (0, 0) if there is no checkpoint.
+
+    Raises:
+    -   ValueError: If the checkpoint was written by another transform or for a file of another length.
+    """
+
+    if not os.path.exists(checkpoint_path):
+        return 0, 0
+
+    with open(checkpoint_path, "rb") as file:
+        checkpoint = json.loads(file.read())
+
+    if checkpoint["fingerprint"] != fingerprint or checkpoint["length"] != length:
+        raise ValueError(
+            "The checkpoint was written by another cipher, key or direction, or for a file of another length"
+        )
+
+    return checkpoint["offset"], checkpoint["phase"]
+
+
+def restore_journal(journal_path: str, file, offset: int):
+    """
+    Undoes a window that was interrupted while it was being transformed, by writing back the original
+    bytes saved in the journal. A journal of an earlier window (saved before the checkpoint moved past
+    it) is ignored.
+
+    Args:
+    -   journal_path (str): The path of the journal.
+    -   file (file): The file, opened for reading and writing.
+    -   offset (int): The offset of the checkpoint.
+    """
+
+    if not os.path.exists(journal_path):
+        return
+
+    with open(journal_path, "rb") as journal:
+        (journal_offset,) = JOURNAL_HEADER.unpack(journal.read(JOURNAL_HEADER.size))
+
+        if journal_offset == offset:
+            length = os.path.getsize(journal_path) - JOURNAL_HEADER.size
+            copy_file_range(journal, file, length, JOURNAL_HEADER.size, offset)
+            os.fsync(file.fileno())
+
+    os.remove(journal_path)
+
+
+def transform_file_in_place(
+    name: str,
+    key,
+    path: str,
+    direction: int,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+    checkpoint_path: str = None,
+    resume: bool = False,
+    progress=None,
+):
+    """
+    Encrypts or decrypts a file in place through a memory map, one window at a time.
+
+    Each window is mapped, transformed with the compiled table (or the vectorized Vigenere kernel) and
+    flushed before the next one, so the file is never read into Python strings and only one window is
+    mapped at a time. The Vigenere key position is carried from one window to the next.
+
+    With a checkpoint path, the original bytes of each window are saved to a journal before the window is
+    changed, and the offset and the Vigenere phase are saved to the checkpoint after it is flushed. An
+    interrupted transform resumed from the checkpoint first writes back the journal, so no byte is ever
+    transformed twice. The checkpoint and the journal are deleted when the whole file is done.
+
+    The journal is the price of resuming: every byte is written twice (to the journal and to the file), and
+    each window is synced to disk before it is changed. A window interrupted half way through cannot be
+    told apart from the original without its original bytes, so an offset and a digest would not be enough.
+    The bytes are copied to the journal by the kernel (see copy_file_range()), so they are still never read
+    into Python objects. Without a checkpoint, the file is transformed in a single pass.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash or vigenere.
+    -   key: The key of the cipher (None for Atbash).
+    -   path (str): The path of the file.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   window_size (int): The number of bytes mapped at a time, rounded down to the allocation granularity.
+    -   checkpoint_path (str): The path of the checkpoint, or None to transform without one.
+    -   resume (bool): Whether to resume from an existing checkpoint.
+    -   progress (callable): Called with the offset reached and the length of the file after each window.
+
+    Returns:
+    -   int: The number of bytes transformed by this call.
+
+    Raises:
+    -   ValueError: If the cipher cannot transform a file in place, the key is not valid, a checkpoint
+        already exists without resume, or the checkpoint does not match the transform.
+    """
+
+    normalized_name = name.strip().lower().replace(" ", "_").replace("-", "_")
+
+    if normalized_name not in IN_PLACE_CIPHERS:
+        raise ValueError(
+            f"The {name!r} cipher cannot transform a file in place, expected one of: {', '.join(IN_PLACE_CIPHERS)}"
+        )
+
+    cipher = get_cipher(normalized_name, key)  # raises the key errors before the file is changed
+
+    if direction == -1:
+        cipher.decrypt_buffer(b"")  # raises if the key cannot be inverted
+
+    length = os.path.getsize(path)
+    fingerprint = key_fingerprint(normalized_name, key, direction)
+    journal_path = f"{checkpoint_path}.journal" if checkpoint_path else None
+    offset, phase = 0, 0
+
+    if checkpoint_path and os.path.exists(checkpoint_path) and not resume:
+        raise ValueError(f"The checkpoint {checkpoint_path!r} already exists, resume it or delete it")
+
+    with open(path, "r+b") as file:
+        if checkpoint_path and resume:
+            offset, phase = read_checkpoint(checkpoint_path, fingerprint, length)
+            restore_journal(journal_path, file, offset)
+
+        start_offset = offset
+
+        for start, stop in window_bounds(length, window_size, offset):
+            with mmap.mmap(file.fileno(), stop - start, offset=start) as window:
+                # Save the original bytes first, so an interrupted window can be undone
+                if checkpoint_path:
+                    save_journal(journal_path, file, start, stop)
+
+                phase = transform_buffer_in_place(cipher, normalized_name, direction, window, phase)
+                window.flush()
+
+            if checkpoint_path:
+                checkpoint = {"fingerprint": fingerprint, "length": length, "offset": stop, "phase": phase}
+                write_file_atomically(checkpoint_path, json.dumps(checkpoint).encode("utf-8"))
+
+            if progress is not None:
+                progress(stop, length)
+
+    # The whole file is done, so there is nothing left to resume
+    if checkpoint_path:
+        for finished_path in (journal_path, checkpoint_path):
+            if os.path.exists(finished_path):
+                os.remove(finished_path)
+
+    return length - start_offset
+
+
+def encrypt_file_in_place(name: str, key, path: str, window_size: int = DEFAULT_WINDOW_SIZE, **options):
+    """
+    Encrypts a file in place through a memory map, one window at a time.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash or vigenere.
+    -   key: The key of the cipher (None for Atbash).
+    -   path (str): The path of the file.
+    -   window_size (int): The number of bytes mapped at a time.
+    -   options: checkpoint_path, resume and progress, see transform_file_in_place().
+
+    Returns:
+    -   int: The number of bytes encrypted by this call.
+    """
+
+    return transform_file_in_place(name, key, path, 1, window_size, **options)
+
+
+def decrypt_file_in_place(name: str, key, path: str, window_size: int = DEFAULT_WINDOW_SIZE, **options):
+    """
+    Decrypts a file in place through a memory map, one window at a time.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash or vigenere.
+    -   key: The key of the cipher (None for Atbash).
+    -   path (str): The path of the file.
+    -   window_size (int): The number of bytes mapped at a time.
+    -   options: checkpoint_path, resume and progress, see transform_file_in_place().
+
+    Returns:
+    -   int: The number of bytes decrypted by this call.
+    """
+
+    return transform_file_in_place(name, key, path, -1, window_size, **options)
@@ -0,0 +1,440 @@
+import functools  # Import functools to copy the names and docstrings of the cached functions
+import itertools  # Import itertools to sample the items of large containers
+import sys  # Import sys to estimate the size of the key schedules
+import threading  # Import threading for the lock of the cache
+import time  # Import time to measure the build time of the key schedules
+from collections import OrderedDict  # Import OrderedDict to keep the entries in least recently used order
+
+DEFAULT_MAX_ENTRIES = 1024  # key schedules kept across all the ciphers
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MiB of key schedules kept across all the ciphers
+
+SIZE_SAMPLE = 16  # the number of items of a container that are measured to estimate its size
+
+MISSING = object()  # returned by KeyScheduleCache.lookup() when the key is not in the cache
+
+
+def estimate_size(value, depth: int = 4, seen: set = None):
+    """
+    Estimates the memory used by a key schedule: the NumPy arrays (nbytes), the containers and their
+    items (scaled up from the first SIZE_SAMPLE items), and the attributes of the objects, down to the
+    given depth. Objects referenced twice are counted once.
+
+    Args:
+    -   value: The key schedule, e.g. a compiled cipher.
+    -   depth (int): The number of nested containers and objects that are followed.
+    -   seen (set): The ids of the objects already counted.
+
+    Returns:
+    -   int: The estimated number of bytes.
+    """
+
+    seen = set() if seen is None else seen
+
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    nbytes = getattr(value, "nbytes", None)
+
+    if isinstance(nbytes, int):  # NumPy arrays and memoryviews
+        return nbytes + sys.getsizeof(value, 0)
+
+    size = sys.getsizeof(value, 0)
+
+    if depth <= 0 or isinstance(value, (str, bytes, bytearray, int, float)):
+        return size
+
+    # The items of large containers are estimated from the first few, so the estimate stays cheaper than the
+    # build of the schedule (e.g. the 625 digraphs of each Playfair table)
+    if isinstance(value, dict):
+        items = list(itertools.islice(value.items(), SIZE_SAMPLE))
+        sampled = sum(estimate_size(key, depth - 1, seen) + estimate_size(item, depth - 1, seen) for key, item in items)
+        size += sampled * len(value) // max(len(items), 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(itertools.islice(value, SIZE_SAMPLE))
+        sampled = sum(estimate_size(item, depth - 1, seen) for item in items)
+        size += sampled * len(value) // max(len(items), 1)
+
+    attributes = getattr(value, "__dict__", None)
+
+    if isinstance(attributes, dict):
+        size += estimate_size(attributes, depth - 1, seen)
+
+    return size
+
+
+def new_counters():
+    """
+    Returns the empty statistics of a namespace of the cache.
+
+    Returns:
+    -   dict: The hits, misses, evictions, oversized (schedules larger than the whole cache, which are not
+        kept), entries, bytes, build_seconds (the time spent building) and saved_seconds (the build time of
+        the schedules that were found in the cache instead).
+    """
+
+    return {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "oversized": 0,
+        "entries": 0,
+        "bytes": 0,
+        "build_seconds": 0.0,
+        "saved_seconds": 0.0,
+    }
+
+
+class KeyScheduleCache:
+    """
+    A thread safe LRU cache of key schedules (compiled ciphers, key matrices, permutations), bounded by
+    both the number of entries and their estimated size in bytes.
+
+    The entries of every cipher share the same bounds, each one in its own namespace, so a workload that
+    churns through keys of one cipher evicts the least recently used schedules of any cipher instead of
+    growing. The schedules are built outside the lock, so two threads that miss the same key at the same
+    time may both build it; the first one is kept. A schedule that builds more state after it was cached
+    (e.g. the inverse of a Hill key) calls remeasure_key_schedule(), so its size stays accounted for.
+
+    Attributes:
+    -   max_entries (int): The maximum number of entries.
+    -   max_bytes (int): The maximum estimated size of the entries, in bytes.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Creates an empty cache.
+
+        Args:
+        -   max_entries (int): The maximum number of entries.
+        -   max_bytes (int): The maximum estimated size of the entries, in bytes.
+
+        Raises:
+        -   ValueError: If a bound is negative.
+        """
+
+        self.lock = threading.Lock()
+        # (namespace, key) -> [schedule, size, build seconds, hits], least recently used first. The hits of an
+        # entry are only added to the counters of its namespace when it is removed, so a hit is cheap.
+        self.entries = OrderedDict()
+        self.entry_keys = {}  # id(schedule) -> (namespace, key), to find the entry of a schedule that grew
+        self.counters = {}  # namespace -> the statistics of the entries that were removed, and of the misses
+        self.total_bytes = 0
+        self.max_entries = DEFAULT_MAX_ENTRIES
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.configure(max_entries, max_bytes)
+
+    def configure(self, max_entries: int = None, max_bytes: int = None):
+        """
+        Changes the bounds of the cache, evicting the least recently used entries that no longer fit.
+
+        Args:
+        -   max_entries (int): The maximum number of entries, or None to keep the current one.
+        -   max_bytes (int): The maximum estimated size of the entries in bytes, or None to keep the current one.
+
+        Raises:
+        -   ValueError: If a bound is negative.
+        """
+
+        if (max_entries is not None and max_entries < 0) or (max_bytes is not None and max_bytes < 0):
+            raise ValueError("The bounds of the key schedule cache cannot be negative")
+
+        with self.lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+
+            self.evict()
+
+    def remove(self, entry_key, entry: list):
+        """
+        Accounts for an entry that was removed from the cache. The lock must be held.
+
+        Args:
+        -   entry_key (tuple): The namespace and the key of the entry.
+        -   entry (list): The schedule, size, build seconds and hits of the entry.
+        """
+
+        schedule, size, build_seconds, hits = entry
+        self.entry_keys.pop(id(schedule), None)
+        counters = self.counters[entry_key[0]]
+        counters["hits"] += hits
+        counters["saved_seconds"] += hits * build_seconds
+        counters["entries"] -= 1
+        counters["bytes"] -= size
+        self.total_bytes -= size
+
+    def evict(self):
+        """
+        Evicts the least recently used entries until the cache is within its bounds. The lock must be held.
+        """
+
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            entry_key, entry = self.entries.popitem(last=False)
+            self.remove(entry_key, entry)
+            self.counters[entry_key[0]]["evictions"] += 1
+
+    def lookup(self, namespace: str, key):
+        """
+        Returns the schedule of a key if it is in the cache, marking it as the most recently used.
+
+        Args:
+        -   namespace (str): The namespace of the schedule, e.g. the name of the cipher.
+        -   key: The hashable key of the schedule.
+
+        Returns:
+        -   The schedule, or MISSING if it is not in the cache (which is not counted as a miss).
+        """
+
+        # A hit does not take the lock, which would cost more than the lookup: each OrderedDict call is atomic
+        # under the GIL, and an entry evicted meanwhile by another thread is still a valid schedule. Only
+        # the hit count of an entry can miss a hit, when two threads hit it at the same time.
+        entry_key = (namespace, key)
+        entry = self.entries.get(entry_key)
+
+        if entry is None:
+            return MISSING
+
+        try:
+            self.entries.move_to_end(entry_key)
+        except KeyError:
+            pass
+
+        entry[3] += 1
+
+        return entry[0]
+
+    def build(self, namespace: str, key, build, *args, **kwargs):
+        """
+        Builds the schedule of a key and adds it to the cache, counting a miss.
+
+        Args:
+        -   namespace (str): The namespace of the schedule, e.g. the name of the cipher.
+        -   key: The hashable key of the schedule.
+        -   build (function): Builds the schedule, called with args and kwargs.
+        -   args: The positional arguments of build.
+        -   kwargs: The keyword arguments of build.
+
+        Returns:
+        -   The schedule (the one already in the cache, if another thread built it first).
+
+        Raises:
+        -   Exception: Any error raised by build, in which case nothing is cached.
+        """
+
+        start = time.perf_counter()
+        schedule = build(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        size = estimate_size(schedule)
+
+        with self.lock:
+            counters = self.counters.get(namespace)
+
+            if counters is None:
+                counters = self.counters[namespace] = new_counters()
+
+            counters["misses"] += 1
+            counters["build_seconds"] += elapsed
+
+            if size > self.max_bytes or not self.max_entries:
+                counters["oversized"] += 1
+                return schedule
+
+            entry = self.entries.get((namespace, key))
+
+            if entry is not None:  # another thread built the same key first
+                self.entries.move_to_end((namespace, key))
+                return entry[0]
+
+            self.entries[namespace, key] = [schedule, size, elapsed, 0]
+            self.entry_keys[id(schedule)] = (namespace, key)
+            self.total_bytes += size
+            counters["entries"] += 1
+            counters["bytes"] += size
+            self.evict()
+
+        return schedule
+
+    def remeasure(self, schedule):
+        """
+        Measures a cached schedule again after it built more state, evicting the least recently used entries
+        if the cache no longer fits. A schedule that is not in the cache is ignored.
+
+        Args:
+        -   schedule: The schedule, e.g. a compiled cipher.
+        """
+
+        with self.lock:
+            entry_key = self.entry_keys.get(id(schedule))
+            entry = self.entries.get(entry_key) if entry_key is not None else None
+
+            if entry is None or entry[0] is not schedule:
+                return
+
+            size = estimate_size(schedule)
+            counters = self.counters[entry_key[0]]
+            counters["bytes"] += size - entry[1]
+            self.total_bytes += size - entry[1]
+            entry[1] = size
+
+            if size > self.max_bytes:  # the schedule alone no longer fits, so it is not kept
+                self.remove(entry_key, self.entries.pop(entry_key))
+                counters["oversized"] += 1
+
+            self.evict()
+
+    def get(self, namespace: str, key, build, *args, **kwargs):
+        """
+        Returns the schedule of a key, building it on a miss.
+
+        Args:
+        -   namespace (str): The namespace of the schedule, e.g. the name of the cipher.
+        -   key: The hashable key of the schedule.
+        -   build (function): Builds the schedule, called with args and kwargs.
+        -   args: The positional arguments of build.
+        -   kwargs: The keyword arguments of build.
+
+        Returns:
+        -   The schedule.
+        """
+
+        schedule = self.lookup(namespace, key)
+
+        if schedule is MISSING:
+            schedule = self.build(namespace, key, build, *args, **kwargs)
+
+        return schedule
+
+    def clear(self, namespace: str = None):
+        """
+        Removes the entries of a namespace, or of the whole cache. The statistics are kept.
+
+        Args:
+        -   namespace (str): The namespace to clear, or None for every namespace.
+        """
+
+        with self.lock:
+            for entry_key in [entry_key for entry_key in self.entries if namespace in (None, entry_key[0])]:
+                self.remove(entry_key, self.entries.pop(entry_key))
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+
+        Returns:
+        -   dict: The bounds, the current entries and bytes, the totals of the counters, and the counters of
+            each namespace ("namespaces").
+        """
+
+        with self.lock:
+            namespaces = {namespace: dict(counters) for namespace, counters in sorted(self.counters.items())}
+
+            # Add the hits of the entries still in the cache
+            for (namespace, _), (_, _, build_seconds, hits) in self.entries.items():
+                namespaces[namespace]["hits"] += hits
+                namespaces[namespace]["saved_seconds"] += hits * build_seconds
+
+            totals = new_counters()
+
+            for counters in namespaces.values():
+                for name in totals:
+                    totals[name] += counters[name]
+
+            return {
+                **totals,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "namespaces": namespaces,
+            }
+
+
+key_schedule_cache = KeyScheduleCache()  # shared by the key schedules of every cipher
+
+
+def cached_key_schedule(namespace: str):
+    """
+    Decorates a function that builds a key schedule, so its results are kept in the shared key schedule
+    cache. The arguments of the function are the key of the schedule, and must be hashable.
+
+    Args:
+    -   namespace (str): The namespace of the schedules in the cache, e.g. the name of the cipher.
+
+    Returns:
+    -   function: The decorator.
+    """
+
+    # The hits are looked up as in KeyScheduleCache.lookup(), inlined because they run on every call
+    get_entry = key_schedule_cache.entries.get
+    move_to_end = key_schedule_cache.entries.move_to_end
+
+    def decorator(function):
+        @functools.wraps(function)
+        def cached(*args, **kwargs):
+            entry_key = (namespace, args if not kwargs else (args, tuple(sorted(kwargs.items()))))
+            entry = get_entry(entry_key)
+
+            if entry is None:
+                return key_schedule_cache.build(namespace, entry_key[1], function, *args, **kwargs)
+
+            try:
+                move_to_end(entry_key)
+            except KeyError:
+                pass
+
+            entry[3] += 1
+
+            return entry[0]
+
+        cached.cache_namespace = namespace
+        cached.cache_clear = functools.partial(key_schedule_cache.clear, namespace)
+
+        return cached
+
+    return decorator
+
+
+def remeasure_key_schedule(schedule):
+    """
+    Measures a schedule of the shared key schedule cache again after it built more state on first use.
+
+    Args:
+    -   schedule: The schedule, e.g. a compiled cipher.
+    """
+
+    key_schedule_cache.remeasure(schedule)
+
+
+def configure_key_cache(max_entries: int = None, max_bytes: int = None):
+    """
+    Changes the bounds of the shared key schedule cache, evicting the entries that no longer fit.
+
+    Args:
+    -   max_entries (int): The maximum number of entries, or None to keep the current one.
+    -   max_bytes (int): The maximum estimated size of the entries in bytes, or None to keep the current one.
+
+    Raises:
+    -   ValueError: If a bound is negative.
+    """
+
+    key_schedule_cache.configure(max_entries, max_bytes)
+
+
+def key_cache_stats():
+    """
+    Returns the statistics of the shared key schedule cache.
+
+    Returns:
+    -   dict: See KeyScheduleCache.stats().
+    """
+
+    return key_schedule_cache.stats()
+
+
+def clear_key_cache():
+    """
+    Removes every entry of the shared key schedule cache. The statistics are kept.
+    """
+
+    key_schedule_cache.clear()
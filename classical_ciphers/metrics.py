@@ -0,0 +1,516 @@
+import bisect  # Import bisect to find the bucket of each observation
+import functools  # Import functools to copy the names and docstrings of the entry points to their wrappers
+import importlib  # Import importlib to load the cipher modules that are instrumented
+import inspect  # Import inspect to find the entry points and their parameters
+import math  # Import math for the Hill matrix size
+import os  # Import os to replace the exported file atomically
+import threading  # Import threading for the lock and the outermost call of each thread
+import time  # Import time to measure the wall and CPU time
+
+from .keycache import key_cache_stats
+
+# The cipher modules whose public encrypt and decrypt functions are instrumented
+INSTRUMENTED_MODULES = ("additive", "affine", "atbash", "vigenere", "hill", "playfair", "rail_fence")
+
+# The upper bounds (in seconds) of the buckets of the wall and CPU time histograms
+TIME_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+# Key sizes up to this one are labeled exactly, longer ones by their power of two range (e.g. "17-32"), so
+# arbitrary or book-length keys add at most one series per power of two
+EXACT_KEY_SIZES = 16
+
+# The parameters that are not the text of an entry point
+KEY_PARAMETERS = ("key", "key_text", "depth")
+OPTION_PARAMETERS = ("zigzag", "out", "frame_size")
+
+original_functions = {}  # (module name, function name) -> the function replaced by its wrapper
+cache_baselines = {}  # key schedule cache namespace -> its counters when the metrics were last reset
+series = {}  # (function, cipher, key_size) -> the counters and histograms of the calls
+lock = threading.Lock()  # guards the series, which are updated by every thread
+
+
+class ActiveCall(threading.local):
+    """
+    Whether an instrumented call is running in the thread. The class attribute is the default of every
+    thread, so reading it never raises an AttributeError, which is slow.
+    """
+
+    call = False
+
+
+active = ActiveCall()
+
+
+def new_series():
+    """
+    Returns the empty counters and histograms of a series.
+
+    Returns:
+    -   dict: The series.
+    """
+
+    return {
+        "calls": 0,
+        "errors": 0,
+        "characters": 0,
+        "wall_sum": 0.0,
+        "cpu_sum": 0.0,
+        "wall_buckets": [0] * len(TIME_BUCKETS),
+        "cpu_buckets": [0] * len(TIME_BUCKETS),
+    }
+
+
+def record_call(labels: tuple, characters: int, wall_time: float, cpu_time: float, failed: bool):
+    """
+    Adds a finished call to its series.
+
+    Args:
+    -   labels (tuple): The function, cipher and key size of the call.
+    -   characters (int): The number of characters (or bytes) processed.
+    -   wall_time (float): The wall time of the call, in seconds.
+    -   cpu_time (float): The CPU time of the thread during the call, in seconds.
+    -   failed (bool): Whether the call raised an exception.
+    """
+
+    with lock:
+        entry = series.get(labels)
+
+        if entry is None:
+            entry = series[labels] = new_series()
+
+        entry["calls"] += 1
+        entry["errors"] += failed
+        entry["characters"] += characters
+        entry["wall_sum"] += wall_time
+        entry["cpu_sum"] += cpu_time
+
+        # Each observation is counted in its own bucket, the cumulative counts are summed on export
+        entry["wall_buckets"][bisect.bisect_left(TIME_BUCKETS, wall_time)] += 1
+        entry["cpu_buckets"][bisect.bisect_left(TIME_BUCKETS, cpu_time)] += 1
+
+
+def measure_length(value):
+    """
+    Returns the number of characters of a text, a buffer or a list of texts.
+
+    Args:
+    -   value: The text argument of an entry point.
+
+    Returns:
+    -   int: The number of characters, or None for a stream, whose chunks are counted as they are yielded.
+    """
+
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+
+    if isinstance(value, (list, tuple)):
+        return sum(len(text) for text in value)
+
+    try:
+        return memoryview(value).nbytes
+    except TypeError:
+        return None  # an iterable of chunks or a file object
+
+
+def key_size_label(size: int):
+    """
+    Returns the label of a key size: the size itself up to EXACT_KEY_SIZES, and its power of two range above.
+
+    Args:
+    -   size (int): The key length, Hill matrix size or Rail Fence depth.
+
+    Returns:
+    -   str: The label, e.g. "5" or "65-128".
+    """
+
+    if size <= EXACT_KEY_SIZES:
+        return str(size)
+
+    upper = 1 << (size - 1).bit_length()  # the smallest power of two that is at least the size
+
+    return f"{upper // 2 + 1}-{upper}"
+
+
+def key_size_function(cipher: str, parameter: str):
+    """
+    Returns the function that measures the key size label of a call (see key_size_label()).
+
+    Args:
+    -   cipher (str): The cipher module name.
+    -   parameter (str): The name of the key parameter, or None if the entry point has no key.
+
+    Returns:
+    -   function: Called with the key, returns the key size as a string.
+    """
+
+    if parameter is None or parameter == "key":
+        return lambda key: ""  # the additive and affine keys do not change the cost of a call
+
+    if cipher == "hill":
+        return lambda key: key_size_label(math.isqrt(len(key)))  # the matrix size
+
+    if parameter == "depth":
+        return key_size_label
+
+    return lambda key: key_size_label(len(key))
+
+
+def instrument(module_name: str, function):
+    """
+    Wraps an entry point so that each call is recorded with its cipher, key size, characters and times.
+
+    Only the outermost instrumented call of a thread is recorded, so rot13_encrypt() is not counted again
+    as the additive_encrypt() call it makes. A stream is timed while its chunks are yielded, and the
+    characters of its chunks are counted.
+
+    Args:
+    -   module_name (str): The cipher module name.
+    -   function (function): The entry point.
+
+    Returns:
+    -   function: The wrapper.
+    """
+
+    parameters = list(inspect.signature(function).parameters)
+    key_parameter = next((name for name in parameters if name in KEY_PARAMETERS), None)
+    text_parameter = next(name for name in parameters if name not in KEY_PARAMETERS + OPTION_PARAMETERS)
+    key_index = parameters.index(key_parameter) if key_parameter else None
+    text_index = parameters.index(text_parameter)
+    key_size = key_size_function(module_name, key_parameter)
+    function_name = function.__name__
+    streaming = function_name.endswith("_stream")  # the stream functions return generators
+
+    def argument(args, kwargs, index, name):
+        return args[index] if index < len(args) else kwargs.get(name)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if active.call:
+            return function(*args, **kwargs)  # a call made by another entry point
+
+        try:
+            key = argument(args, kwargs, key_index, key_parameter) if key_parameter else None
+            labels = (function_name, module_name, key_size(key) if key is not None else "")
+            characters = measure_length(argument(args, kwargs, text_index, text_parameter))
+        except Exception:
+            return function(*args, **kwargs)  # the entry point raises its own error for the arguments
+
+        active.call = True
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        failed = True
+
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+        finally:
+            wall_time, cpu_time = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+            active.call = False
+
+            if failed or not streaming:
+                record_call(labels, characters or 0, wall_time, cpu_time, failed)
+
+        if streaming:
+            return instrument_stream(result, labels, wall_time, cpu_time)
+
+        return result
+
+    return wrapper
+
+
+def instrument_stream(chunks, labels: tuple, wall_time: float, cpu_time: float):
+    """
+    Yields the chunks of a stream, timing each chunk and counting its characters. The call is recorded
+    when the stream is exhausted, fails or is closed.
+
+    Args:
+    -   chunks (generator): The stream returned by the entry point.
+    -   labels (tuple): The function, cipher and key size of the call.
+    -   wall_time (float): The wall time of the call that created the stream.
+    -   cpu_time (float): The CPU time of the call that created the stream.
+
+    Yields:
+    -   The chunks of the stream.
+    """
+
+    characters = 0
+    failed = True
+
+    try:
+        while True:
+            active.call = True
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                failed = False
+                return
+            finally:
+                wall_time += time.perf_counter() - wall_start
+                cpu_time += time.thread_time() - cpu_start
+                active.call = False
+
+            characters += len(chunk)
+            yield chunk
+    except GeneratorExit:
+        failed = False  # the consumer stopped reading the stream
+        raise
+    finally:
+        chunks.close()
+        record_call(labels, characters, wall_time, cpu_time, failed)
+
+
+def entry_points(module):
+    """
+    Lists the public encrypt and decrypt functions defined in a cipher module.
+
+    Args:
+    -   module (module): The cipher module.
+
+    Returns:
+    -   list: The (name, function) pairs.
+    """
+
+    return [
+        (name, value)
+        for name, value in vars(module).items()
+        if inspect.isfunction(value)
+        and value.__module__ == module.__name__
+        and not name.startswith("_")
+        and ("encrypt" in name or "decrypt" in name)
+    ]
+
+
+def enable_metrics(modules=INSTRUMENTED_MODULES):
+    """
+    Starts recording the calls of the public encrypt and decrypt functions of the cipher modules.
+
+    The functions are replaced by instrumented wrappers in their modules, so the calls made through the
+    modules (classical_ciphers.vigenere.vigenere_encrypt(...)) are recorded. A function imported with
+    "from ... import" before the metrics were enabled keeps calling the original function. While the
+    metrics are disabled, the original functions are in place, so there is no overhead at all.
+
+    Args:
+    -   modules (iterable): The cipher module names to instrument.
+    """
+
+    for module_name in modules:
+        module = importlib.import_module(f"{__package__}.{module_name}")
+
+        for name, function in entry_points(module):
+            if (module_name, name) not in original_functions:
+                original_functions[module_name, name] = function
+                setattr(module, name, instrument(module_name, function))
+
+    for namespace, counters in key_cache_stats()["namespaces"].items():
+        cache_baselines.setdefault(namespace, counters)
+
+
+def disable_metrics():
+    """
+    Stops recording the calls, putting the original functions back. The recorded metrics are kept.
+    """
+
+    for (module_name, name), function in original_functions.items():
+        setattr(importlib.import_module(f"{__package__}.{module_name}"), name, function)
+
+    original_functions.clear()
+
+
+def metrics_enabled():
+    """
+    Returns whether the calls are being recorded.
+
+    Returns:
+    -   bool: Whether the metrics are enabled.
+    """
+
+    return bool(original_functions)
+
+
+def reset_metrics():
+    """
+    Clears the recorded calls, and counts the key cache hits and misses from now on.
+    """
+
+    with lock:
+        series.clear()
+
+    cache_baselines.clear()
+    cache_baselines.update(key_cache_stats()["namespaces"])
+
+
+def cumulative(buckets: list):
+    """
+    Converts the count of each bucket to the cumulative counts of the histogram.
+
+    Args:
+    -   buckets (list): The number of observations in each bucket.
+
+    Returns:
+    -   list: The number of observations less than or equal to each bound.
+    """
+
+    counts, total = [], 0
+
+    for count in buckets:
+        total += count
+        counts.append(total)
+
+    return counts
+
+
+def metrics_snapshot():
+    """
+    Returns a copy of the recorded metrics.
+
+    Returns:
+    -   dict: A dict with "enabled", "calls" (one dict per function, cipher and key size, with the calls,
+        errors, characters and the wall and CPU time histograms) and "key_caches" (the hits, misses,
+        evictions, hit rate and saved build time of each namespace of the key schedule cache since the
+        metrics were enabled or reset, and its current entries and bytes).
+    """
+
+    bounds = ["+Inf" if math.isinf(bound) else repr(bound) for bound in TIME_BUCKETS]
+
+    with lock:
+        calls = [
+            {
+                "function": function,
+                "cipher": cipher,
+                "key_size": key_size,
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "characters": entry["characters"],
+                "wall_seconds": {
+                    "sum": entry["wall_sum"],
+                    "buckets": dict(zip(bounds, cumulative(entry["wall_buckets"]))),
+                },
+                "cpu_seconds": {
+                    "sum": entry["cpu_sum"],
+                    "buckets": dict(zip(bounds, cumulative(entry["cpu_buckets"]))),
+                },
+            }
+            for (function, cipher, key_size), entry in sorted(series.items())
+        ]
+
+    caches = {}
+
+    for namespace, counters in key_cache_stats()["namespaces"].items():
+        baseline = cache_baselines.get(namespace, {})
+        hits, misses = (counters[name] - baseline.get(name, 0) for name in ("hits", "misses"))
+        caches[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters["evictions"] - baseline.get("evictions", 0),
+            "hit_rate": hits / (hits + misses) if hits + misses else None,
+            "saved_seconds": counters["saved_seconds"] - baseline.get("saved_seconds", 0.0),
+            "entries": counters["entries"],
+            "bytes": counters["bytes"],
+        }
+
+    return {"enabled": metrics_enabled(), "calls": calls, "key_caches": caches}
+
+
+def format_labels(**labels):
+    """
+    Formats the labels of a Prometheus sample, escaping the values.
+
+    Args:
+    -   labels: The label names and values.
+
+    Returns:
+    -   str: The labels in braces.
+    """
+
+    pairs = []
+
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+
+    return "{" + ",".join(pairs) + "}"
+
+
+def prometheus_text(snapshot: dict = None):
+    """
+    Formats the metrics in the Prometheus text exposition format.
+
+    Args:
+    -   snapshot (dict): The snapshot returned by metrics_snapshot(), or None to take one now.
+
+    Returns:
+    -   str: The exposition.
+    """
+
+    snapshot = snapshot or metrics_snapshot()
+    lines = []
+
+    def metric(name, metric_type, help_text):
+        lines.append(f"# HELP classical_ciphers_{name} {help_text}")
+        lines.append(f"# TYPE classical_ciphers_{name} {metric_type}")
+
+    counters = (
+        ("calls_total", "calls", "Calls of the encrypt and decrypt functions."),
+        ("errors_total", "errors", "Calls that raised an exception."),
+        ("characters_total", "characters", "Characters (or bytes) processed."),
+    )
+
+    for name, field, help_text in counters:
+        metric(name, "counter", help_text)
+
+        for call in snapshot["calls"]:
+            labels = format_labels(function=call["function"], cipher=call["cipher"], key_size=call["key_size"])
+            lines.append(f"classical_ciphers_{name}{labels} {call[field]}")
+
+    histograms = (
+        ("call_wall_seconds", "wall_seconds", "Wall time of the calls."),
+        ("call_cpu_seconds", "cpu_seconds", "CPU time of the thread during the calls."),
+    )
+
+    for name, field, help_text in histograms:
+        metric(name, "histogram", help_text)
+
+        for call in snapshot["calls"]:
+            labels = {"function": call["function"], "cipher": call["cipher"], "key_size": call["key_size"]}
+
+            for bound, count in call[field]["buckets"].items():
+                lines.append(f"classical_ciphers_{name}_bucket{format_labels(**labels, le=bound)} {count}")
+
+            lines.append(f"classical_ciphers_{name}_sum{format_labels(**labels)} {call[field]['sum']!r}")
+            lines.append(f"classical_ciphers_{name}_count{format_labels(**labels)} {call['calls']}")
+
+    cache_metrics = (
+        ("key_cache_hits_total", "counter", "hits", "Key schedule cache hits."),
+        ("key_cache_misses_total", "counter", "misses", "Key schedule cache misses."),
+        ("key_cache_evictions_total", "counter", "evictions", "Key schedules evicted from the cache."),
+        ("key_cache_saved_seconds_total", "counter", "saved_seconds", "Build time saved by the cache hits."),
+        ("key_cache_entries", "gauge", "entries", "Key schedules in the cache."),
+        ("key_cache_bytes", "gauge", "bytes", "Estimated size of the key schedules in the cache."),
+    )
+
+    for name, metric_type, field, help_text in cache_metrics:
+        metric(name, metric_type, help_text)
+
+        for namespace, cache in snapshot["key_caches"].items():
+            lines.append(f"classical_ciphers_{name}{format_labels(cache=namespace)} {cache[field]!r}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, snapshot: dict = None):
+    """
+    Writes the metrics in the Prometheus text exposition format to a file, e.g. for the textfile collector
+    of the node exporter. The file is replaced atomically, so a scrape never reads a partial file.
+
+    Args:
+    -   path (str): The path of the file, usually ending in .prom.
+    -   snapshot (dict): The snapshot returned by metrics_snapshot(), or None to take one now.
+    """
+
+    temporary_path = f"{path}.tmp"
+
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(prometheus_text(snapshot))
+
+    os.replace(temporary_path, path)
@@ -0,0 +1,398 @@
+import os  # Import os to find the number of cores and the size of files
+import string  # Import string for the ASCII letters
+from concurrent.futures import ProcessPoolExecutor  # Import ProcessPoolExecutor to run the shards on many cores
+from multiprocessing import shared_memory  # Import shared_memory to share the buffers with the workers
+
+from . import get_cipher
+
+# The ciphers that can be split into shards. Playfair inserts fillers between the pairs and the
+# Rail Fence cipher reorders the whole text, so they cannot be split
+SHARDABLE_CIPHERS = ("additive", "affine", "atbash", "vigenere", "hill")
+
+DEFAULT_SHARD_SIZE = 4 * 1024 * 1024  # 4 MiB of data per shard
+
+ASCII_LETTERS = string.ascii_letters.encode("ascii")
+
+worker_buffers = {}  # the shared input and output buffers, attached once in each worker
+
+
+def shard_bounds(length: int, shard_size: int, alignment: int = 1):
+    """
+    Splits a buffer into shards at cipher safe boundaries.
+
+    Args:
+    -   length (int): The length of the buffer.
+    -   shard_size (int): The number of bytes in each shard, rounded down to a multiple of the alignment.
+    -   alignment (int): Every shard except the last one starts at a multiple of the alignment (the Hill matrix size).
+
+    Returns:
+    -   list: The (start, stop) bounds of each shard.
+    """
+
+    shard_size = max(shard_size // alignment, 1) * alignment
+
+    return [(start, min(start + shard_size, length)) for start in range(0, length, shard_size)]
+
+
+def count_letters(data: bytes):
+    """
+    Counts the ASCII letters of the data, the letters that move the Vigenere key forward.
+
+    Args:
+    -   data (bytes): The data.
+
+    Returns:
+    -   int: The number of ASCII letters.
+    """
+
+    # Deleting the letters with bytes.translate() counts them without a Python loop
+    return len(data) - len(data.translate(None, ASCII_LETTERS))
+
+
+def transform_shard(cipher, name: str, direction: int, source, target, start: int, stop: int, phase: int):
+    """
+    Encrypts or decrypts one shard of the source buffer into the same position of the target buffer.
+
+    Args:
+    -   cipher (object): The compiled cipher.
+    -   name (str): The name of the cipher.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   source (memoryview): The whole input buffer.
+    -   target (memoryview): The whole output buffer, as long as the input buffer.
+    -   start (int): The start of the shard.
+    -   stop (int): The end of the shard.
+    -   phase (int): The number of letters before the shard (Vigenere only).
+
+    Returns:
+    -   int: The number of letters up to the end of the shard (Vigenere only).
+    """
+
+    if name == "vigenere":
+        # The shard is shifted from the shared input straight into the shared output, without a copy
+        _, phase = cipher.shift_buffer(source[start:stop], direction, phase, out=target[start:stop])
+
+    elif name == "hill":
+        import numpy as np  # NumPy is only imported by the Hill cipher
+        from .hill import transform_blocks
+
+        key_matrix = cipher.key_matrix if direction == 1 else cipher.key_matrix_inv
+        matrix_size = cipher.matrix_size
+
+        # Convert the shard to numbers modulo 26 (A = 0) and multiply its blocks by the key matrix
+        codes = np.frombuffer(bytes(source[start:stop]).upper(), dtype=np.uint8).astype(np.int16)
+        result = transform_blocks(key_matrix, ((codes - 65) % 26).astype(np.uint8))
+
+        # The whole text is written row by row (character j of b blocks is row j // b of block j % b),
+        # so the blocks of the shard are written into a column range of every row of the output
+        block_count = len(target) // matrix_size
+        rows = np.frombuffer(target, dtype=np.uint8).reshape(matrix_size, block_count)
+        first_block = start // matrix_size
+        rows[:, first_block : first_block + len(result)] = result.T + 65
+
+    elif direction == 1:
+        cipher.encrypt_buffer(source[start:stop], out=target[start:stop])
+    else:
+        cipher.decrypt_buffer(source[start:stop], out=target[start:stop])
+
+    return phase
+
+
+def attach_worker_buffers(input_name: str, output_name: str, length: int):
+    """
+    Attaches the shared input and output buffers in a worker process.
+
+    Args:
+    -   input_name (str): The name of the shared input buffer.
+    -   output_name (str): The name of the shared output buffer.
+    -   length (int): The length of the data in the buffers.
+    """
+
+    input_memory = shared_memory.SharedMemory(name=input_name)
+    output_memory = shared_memory.SharedMemory(name=output_name)
+
+    # Keep the shared memory objects alive for as long as the worker runs
+    worker_buffers["memory"] = (input_memory, output_memory)
+    worker_buffers["source"] = input_memory.buf[:length]
+    worker_buffers["target"] = output_memory.buf[:length]
+
+
+def count_worker_letters(bounds: tuple):
+    """
+    Counts the ASCII letters of one shard of the shared input buffer.
+
+    Args:
+    -   bounds (tuple): The (start, stop) bounds of the shard.
+
+    Returns:
+    -   int: The number of ASCII letters.
+    """
+
+    start, stop = bounds
+
+    return count_letters(bytes(worker_buffers["source"][start:stop]))
+
+
+def transform_worker_shard(task: tuple):
+    """
+    Encrypts or decrypts one shard of the shared input buffer into the shared output buffer.
+
+    Args:
+    -   task (tuple): The cipher name, key, direction, shard bounds and phase.
+    """
+
+    name, key, direction, start, stop, phase = task
+
+    # The compiled cipher is cached, so each worker compiles the key only once
+    cipher = get_cipher(name, key)
+
+    transform_shard(
+        cipher, name, direction, worker_buffers["source"], worker_buffers["target"], start, stop, phase
+    )
+
+
+def transform_shared(
+    name: str, key, direction: int, input_memory, output_memory, length: int, shard_size: int, workers: int
+):
+    """
+    Encrypts or decrypts the data of a shared input buffer into a shared output buffer shard by shard.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   input_memory (SharedMemory): The shared input buffer.
+    -   output_memory (SharedMemory): The shared output buffer.
+    -   length (int): The length of the data in the buffers.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes.
+
+    Raises:
+    -   ValueError: If the cipher cannot be split into shards, the key is not valid, or the
+        length of the data is not a multiple of the Hill matrix size.
+    """
+
+    normalized_name = name.strip().lower().replace(" ", "_").replace("-", "_")
+
+    if normalized_name not in SHARDABLE_CIPHERS:
+        raise ValueError(
+            f"The {name} cipher cannot be split into shards, expected one of: {', '.join(SHARDABLE_CIPHERS)}"
+        )
+
+    cipher = get_cipher(normalized_name, key)  # raises the key errors before the workers are started
+    alignment = 1
+
+    if normalized_name == "hill":
+        alignment = cipher.matrix_size
+
+        # If the length of the data is not a multiple of the matrix size, the data cannot be transformed
+        if length % alignment != 0:
+            raise ValueError(
+                "The length of the cipher text must be a multiple of the matrix size"
+            )
+
+        if direction == -1:
+            cipher.key_matrix_inv  # raises if the key matrix cannot be inverted
+    elif direction == -1 and normalized_name != "vigenere":
+        cipher.decrypt_bytes(b"")  # raises if the key cannot be inverted
+
+    bounds = shard_bounds(length, shard_size, alignment)
+    workers = min(workers or os.cpu_count() or 1, len(bounds))
+
+    source = input_memory.buf[:length]
+    target = output_memory.buf[:length]
+
+    try:
+        # A single worker runs the shards in this process, without starting a pool
+        if workers <= 1:
+            phase = 0  # the number of letters before the shard
+
+            for start, stop in bounds:
+                phase = transform_shard(cipher, normalized_name, direction, source, target, start, stop, phase)
+
+            return
+
+        with ProcessPoolExecutor(
+            workers,
+            initializer=attach_worker_buffers,
+            initargs=(input_memory.name, output_memory.name, length),
+        ) as executor:
+            phases = [0] * len(bounds)
+
+            # The Vigenere key position of each shard is the number of letters before it, so the
+            # letters of every shard are counted in parallel first and the counts are summed up
+            if normalized_name == "vigenere":
+                letter_counts = executor.map(count_worker_letters, bounds)
+
+                for i, letter_count in enumerate(letter_counts, start=1):
+                    if i < len(bounds):
+                        phases[i] = phases[i - 1] + letter_count
+
+            tasks = [
+                (normalized_name, key, direction, start, stop, phase)
+                for (start, stop), phase in zip(bounds, phases)
+            ]
+
+            # Each worker writes its shards to their own positions of the output, so the order is kept
+            for _ in executor.map(transform_worker_shard, tasks):
+                pass
+    finally:
+        source.release()
+        target.release()
+
+
+def parallel_transform(
+    name: str, key, data: bytes, direction: int, shard_size: int = DEFAULT_SHARD_SIZE, workers: int = None
+):
+    """
+    Encrypts or decrypts a large buffer on many cores.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   data (bytes-like): The data to be transformed.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes, the number of cores by default.
+
+    Returns:
+    -   bytes: The transformed data.
+    """
+
+    length = len(data)
+
+    if length == 0:
+        return b""
+
+    input_memory = shared_memory.SharedMemory(create=True, size=length)
+    output_memory = shared_memory.SharedMemory(create=True, size=length)
+
+    try:
+        input_memory.buf[:length] = data  # copy the data into the shared input buffer once
+
+        transform_shared(name, key, direction, input_memory, output_memory, length, shard_size, workers)
+
+        return bytes(output_memory.buf[:length])
+    finally:
+        for memory in (input_memory, output_memory):
+            memory.close()
+            memory.unlink()
+
+
+def parallel_transform_file(
+    name: str,
+    key,
+    input_path: str,
+    output_path: str,
+    direction: int,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    workers: int = None,
+):
+    """
+    Encrypts or decrypts a large file on many cores.
+    The file is read straight into the shared input buffer and written straight from the shared output buffer.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher (None for Atbash).
+    -   input_path (str): The path of the file to be transformed.
+    -   output_path (str): The path of the transformed file.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes, the number of cores by default.
+    """
+
+    length = os.path.getsize(input_path)
+
+    if length == 0:
+        open(output_path, "wb").close()
+        return
+
+    input_memory = shared_memory.SharedMemory(create=True, size=length)
+    output_memory = shared_memory.SharedMemory(create=True, size=length)
+
+    try:
+        with open(input_path, "rb") as file:
+            file.readinto(input_memory.buf[:length])
+
+        transform_shared(name, key, direction, input_memory, output_memory, length, shard_size, workers)
+
+        with open(output_path, "wb") as file:
+            file.write(output_memory.buf[:length])
+    finally:
+        for memory in (input_memory, output_memory):
+            memory.close()
+            memory.unlink()
+
+
+def parallel_encrypt(name: str, key, data: bytes, shard_size: int = DEFAULT_SHARD_SIZE, workers: int = None):
+    """
+    Encrypts a large buffer of ASCII text on many cores.
+    The output is the same as encrypting the whole buffer with the compiled cipher.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash, vigenere or hill.
+    -   key: The key of the cipher (None for Atbash).
+    -   data (bytes-like): The plain data.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes, the number of cores by default.
+
+    Returns:
+    -   bytes: The encrypted data.
+    """
+
+    return parallel_transform(name, key, data, 1, shard_size, workers)
+
+
+def parallel_decrypt(name: str, key, data: bytes, shard_size: int = DEFAULT_SHARD_SIZE, workers: int = None):
+    """
+    Decrypts a large buffer of ASCII text on many cores.
+    The output is the same as decrypting the whole buffer with the compiled cipher.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash, vigenere or hill.
+    -   key: The key of the cipher (None for Atbash).
+    -   data (bytes-like): The cipher data.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes, the number of cores by default.
+
+    Returns:
+    -   bytes: The decrypted data.
+    """
+
+    return parallel_transform(name, key, data, -1, shard_size, workers)
+
+
+def parallel_encrypt_file(
+    name: str, key, input_path: str, output_path: str, shard_size: int = DEFAULT_SHARD_SIZE, workers: int = None
+):
+    """
+    Encrypts a large ASCII text file on many cores.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash, vigenere or hill.
+    -   key: The key of the cipher (None for Atbash).
+    -   input_path (str): The path of the plain file.
+    -   output_path (str): The path of the encrypted file.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes, the number of cores by default.
+    """
+
+    parallel_transform_file(name, key, input_path, output_path, 1, shard_size, workers)
+
+
+def parallel_decrypt_file(
+    name: str, key, input_path: str, output_path: str, shard_size: int = DEFAULT_SHARD_SIZE, workers: int = None
+):
+    """
+    Decrypts a large ASCII text file on many cores.
+
+    Args:
+    -   name (str): The name of the cipher: additive, affine, atbash, vigenere or hill.
+    -   key: The key of the cipher (None for Atbash).
+    -   input_path (str): The path of the encrypted file.
+    -   output_path (str): The path of the decrypted file.
+    -   shard_size (int): The number of bytes in each shard.
+    -   workers (int): The number of worker processes, the number of cores by default.
+    """
+
+    parallel_transform_file(name, key, input_path, output_path, -1, shard_size, workers)
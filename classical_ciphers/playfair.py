@@ -0,0 +1,711 @@
+import re  # Import re to find the pairs of identical characters
+
+from .common import iterate_chunks
+from .keycache import cached_key_schedule, remeasure_key_schedule
+
+
+def initialize_text(text: str):
+    """
+    Initializes the plain text for the Playfair Cipher encryption.
+
+    Args:
+    -   text (str): The plain text to be encrypted.
+
+    Returns:
+    -   list: A list of pairs of two characters representing the initialized plain text.
+    """
+
+    # Split the text into pairs in a single pass, inserting the filler characters on the way
+    return list(iterate_digraphs(text))
+
+
+def initialize_playfair_matrix(key_text: str):
+    """
+    Initializes a Playfair matrix based on a given key text.
+
+    Args:
+    -   key_text (str): The key text used to generate the Playfair matrix.
+
+    Returns:
+    -   list: A 5x5 matrix representing the Playfair matrix.
+    """
+
+    # Initialize an empty matrix of size 5x5
+    playfair_matrix = [["" for i in range(5)] for j in range(5)]
+
+    key_text = key_text.upper()  # converting the key to upper case
+    aplhabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # J is omitted
+    main_string = key_text + aplhabet  # appending the key to the alphabet
+
+    # Remove duplicate characters from the main string
+    main_string = "".join(dict.fromkeys(main_string))
+
+    # Loop through each character in the key
+    for i in range(5):
+        for j in range(5):
+            playfair_matrix[i][j] = main_string[i * 5 + j]
+
+    # Loop through the remaining characters of the alphabet
+
+    return playfair_matrix  # return the initialized playfair matrix
+
+
+# Matches a run of pairs made of two different characters
+DIFFERENT_PAIRS = re.compile(r"(?:(.)(?!\1).)*", re.DOTALL)
+
+VECTORIZE_THRESHOLD = 4096  # texts of at least this many pairs are looked up with NumPy
+
+
+def transform_pair(playfair_matrix, position_1, position_2, shift: int):
+    """
+    Applies the Playfair rules to a pair of characters given their positions in the matrix.
+
+    Args:
+    -   playfair_matrix (list): The 5x5 Playfair matrix.
+    -   position_1 (tuple): The row and column of the first character.
+    -   position_2 (tuple): The row and column of the second character.
+    -   shift (int): 1 to encrypt (right and down), -1 to decrypt (left and up).
+
+    Returns:
+    -   str: The transformed pair of characters.
+    """
+
+    row_1, col_1 = position_1
+    row_2, col_2 = position_2
+
+    # If the two characters are in the same row, shift them along the row
+    if row_1 == row_2:
+        char_1 = playfair_matrix[row_1][(col_1 + shift) % 5]
+        char_2 = playfair_matrix[row_2][(col_2 + shift) % 5]
+
+    # If the two characters are in the same column, shift them along the column
+    elif col_1 == col_2:
+        char_1 = playfair_matrix[(row_1 + shift) % 5][col_1]
+        char_2 = playfair_matrix[(row_2 + shift) % 5][col_2]
+
+    # If the two characters are not in the same row or column, swap their columns
+    else:
+        char_1 = playfair_matrix[row_1][col_2]
+        char_2 = playfair_matrix[row_2][col_1]
+
+    return char_1 + char_2
+
+
+class PlayfairCipher:
+    """
+    A compiled Playfair cipher for a single key.
+
+    The position of every character in the matrix and the result of every one of the 25 x 25 pairs
+    are computed once for the key, so each pair is encrypted with a single dictionary lookup
+    instead of a search through the matrix.
+
+    Args:
+    -   key_text (str): The key text used to initialize the Playfair matrix.
+    """
+
+    def __init__(self, key_text: str):
+        self.key_text = key_text
+        self.playfair_matrix = initialize_playfair_matrix(key_text)
+
+        # The row and column of each character in the matrix
+        self.positions = {
+            char: (i, j)
+            for i, row in enumerate(self.playfair_matrix)
+            for j, char in enumerate(row)
+        }
+
+        # The encrypted and decrypted result of every pair of characters in the matrix
+        self.encrypt_table = {}
+        self.decrypt_table = {}
+
+        for char_1, position_1 in self.positions.items():
+            for char_2, position_2 in self.positions.items():
+                self.encrypt_table[char_1 + char_2] = transform_pair(
+                    self.playfair_matrix, position_1, position_2, 1
+                )
+                self.decrypt_table[char_1 + char_2] = transform_pair(
+                    self.playfair_matrix, position_1, position_2, -1
+                )
+
+        self._index_tables = None  # the NumPy tables, built the first time they are used
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text.
+
+        Raises:
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        return self.transform(initialize_text(plain_text), 1)
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text.
+
+        Args:
+        -   cipher_text (str): The cipher text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text.
+
+        Raises:
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        return self.transform(initialize_text(cipher_text), -1)
+
+    def encrypt_digraphs(self, digraphs: list):
+        """
+        Encrypts the given pairs of characters.
+
+        Args:
+        -   digraphs (list): The pairs of characters returned by initialize_text().
+
+        Returns:
+        -   str: The encrypted text.
+
+        Raises:
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        return self.transform(digraphs, 1)
+
+    def decrypt_digraphs(self, digraphs: list):
+        """
+        Decrypts the given pairs of characters.
+
+        Args:
+        -   digraphs (list): The pairs of characters returned by initialize_text().
+
+        Returns:
+        -   str: The decrypted text.
+
+        Raises:
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        return self.transform(digraphs, -1)
+
+    def encrypt_batch(self, plain_texts: list):
+        """
+        Encrypts many plain texts with a single lookup of all their pairs.
+        Each encrypted text is the same as the one returned by encrypt().
+
+        Args:
+        -   plain_texts (list): The plain texts to be encrypted.
+
+        Returns:
+        -   list: The encrypted texts.
+
+        Raises:
+        -   ValueError: If a character of any plain text is not in the Playfair matrix.
+        """
+
+        return self.transform_batch([initialize_text(text) for text in plain_texts], 1)
+
+    def decrypt_batch(self, cipher_texts: list):
+        """
+        Decrypts many cipher texts with a single lookup of all their pairs.
+        Each decrypted text is the same as the one returned by decrypt().
+
+        Args:
+        -   cipher_texts (list): The cipher texts to be decrypted.
+
+        Returns:
+        -   list: The decrypted texts.
+
+        Raises:
+        -   ValueError: If a character of any cipher text is not in the Playfair matrix.
+        """
+
+        return self.transform_batch([initialize_text(text) for text in cipher_texts], -1)
+
+    def transform_batch(self, digraph_lists: list, shift: int):
+        """
+        Encrypts or decrypts the pairs of many texts at once, so a batch of short texts is long enough for
+        the vectorized path, and splits the result back into the texts.
+
+        Args:
+        -   digraph_lists (list): The pairs of characters of each text, returned by initialize_text().
+        -   shift (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+        -   list: The transformed texts.
+
+        Raises:
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        transformed_text = self.transform([pair for digraphs in digraph_lists for pair in digraphs], shift)
+        texts, start = [], 0
+
+        # Every pair is transformed into two characters
+        for digraphs in digraph_lists:
+            end = start + 2 * len(digraphs)
+            texts.append(transformed_text[start:end])
+            start = end
+
+        return texts
+
+    def encrypt_stream(self, plain_chunks, bounded_memory: bool = False):
+        """
+        Encrypts a stream of plain text chunks.
+        Pairs and fillers are carried across chunk boundaries, so the output is the same as playfair_encrypt().
+        To match it, one character is held back for each filler inserted so far (see iterate_digraphs()), unless
+        bounded_memory is set.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+        -   bounded_memory (bool): Whether to insert a filler in every doubled pair, so the memory stays the same
+            however many fillers are inserted, at the cost of differing from playfair_encrypt() on the last pairs.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        for batch in batch_digraphs(iterate_digraphs(plain_chunks, bounded_memory)):
+            yield self.transform(batch, 1)
+
+    def decrypt_stream(self, cipher_chunks, bounded_memory: bool = False):
+        """
+        Decrypts a stream of cipher text chunks.
+        Pairs are carried across chunk boundaries, so the output is the same as playfair_decrypt().
+        To match it, one character is held back for each filler inserted so far (see iterate_digraphs()), unless
+        bounded_memory is set.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+        -   bounded_memory (bool): Whether to insert a filler in every doubled pair, so the memory stays the same
+            however many fillers are inserted, at the cost of differing from playfair_decrypt() on the last pairs.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        for batch in batch_digraphs(iterate_digraphs(cipher_chunks, bounded_memory)):
+            yield self.transform(batch, -1)
+
+    def transform(self, digraphs: list, shift: int):
+        """
+        Encrypts or decrypts the given pairs of characters.
+        Long lists of pairs are looked up with NumPy when it is installed.
+
+        Args:
+        -   digraphs (list): The pairs of characters returned by initialize_text().
+        -   shift (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+        -   str: The transformed text.
+
+        Raises:
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        # Use the vectorized path for long texts
+        if len(digraphs) >= VECTORIZE_THRESHOLD:
+            try:
+                transformed_text = self.transform_vectorized("".join(digraphs), shift)
+            except ImportError:
+                transformed_text = None  # NumPy is not installed, use the lookups instead
+
+            if transformed_text is not None:
+                return transformed_text
+
+        table = self.encrypt_table if shift == 1 else self.decrypt_table
+
+        try:
+            return "".join([table[pair] for pair in digraphs])
+        except KeyError:
+            raise ValueError(self.missing_character_message(digraphs)) from None
+
+    def transform_pair_indices(self, pair_indices, shift: int):
+        """
+        Maps an array of pair indices through the encryption or decryption table at once.
+        The index of a pair is 25 * (position of the first character) + (position of the second character),
+        where the position of a character is 5 * row + column.
+
+        Args:
+        -   pair_indices (numpy.ndarray): The pair indices.
+        -   shift (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+        -   numpy.ndarray: The transformed pair indices.
+        """
+
+        encrypt_indices, decrypt_indices, _ = self.index_tables()
+
+        return (encrypt_indices if shift == 1 else decrypt_indices)[pair_indices]
+
+    def transform_vectorized(self, text: str, shift: int):
+        """
+        Encrypts or decrypts a text of whole pairs with a few NumPy array operations.
+
+        Args:
+        -   text (str): The joined pairs of characters.
+        -   shift (int): 1 to encrypt, -1 to decrypt.
+
+        Returns:
+        -   str: The transformed text, or None if the text or the matrix is not ASCII.
+
+        Raises:
+        -   ImportError: If NumPy is not installed.
+        -   ValueError: If a character is not in the Playfair matrix.
+        """
+
+        import numpy as np  # NumPy is only imported when the vectorized path is used
+
+        _, _, char_positions = self.index_tables()
+
+        if char_positions is None or not text.isascii():
+            return None
+
+        # Convert each character to its position in the matrix
+        positions = char_positions[np.frombuffer(text.encode("ascii"), dtype=np.uint8)]
+
+        if (positions < 0).any():
+            raise ValueError(self.missing_character_message([text]))
+
+        # Map the pairs through the table and convert the positions back to characters
+        pair_indices = positions[0::2] * 25 + positions[1::2]
+        transformed = self.transform_pair_indices(pair_indices, shift)
+
+        matrix_bytes = np.frombuffer(
+            "".join(self.positions).encode("ascii"), dtype=np.uint8
+        )
+        transformed_bytes = np.empty(len(positions), dtype=np.uint8)
+        transformed_bytes[0::2] = matrix_bytes[transformed // 25]
+        transformed_bytes[1::2] = matrix_bytes[transformed % 25]
+
+        return transformed_bytes.tobytes().decode("ascii")
+
+    def index_tables(self):
+        """
+        Builds the NumPy tables used by the vectorized path on first use.
+
+        Returns:
+        -   tuple: The encryption and decryption tables of pair indices, and a table from ASCII code
+            to position in the matrix (-1 if the character is not in it, None if the matrix is not ASCII).
+        """
+
+        if self._index_tables is None:
+            import numpy as np  # NumPy is only imported when the vectorized path is used
+
+            chars = list(self.positions)  # the characters in matrix order
+            index = {char: i for i, char in enumerate(chars)}
+
+            encrypt_indices = np.array(
+                [
+                    index[self.encrypt_table[char_1 + char_2][0]] * 25
+                    + index[self.encrypt_table[char_1 + char_2][1]]
+                    for char_1 in chars
+                    for char_2 in chars
+                ],
+                dtype=np.int16,
+            )
+            decrypt_indices = np.array(
+                [
+                    index[self.decrypt_table[char_1 + char_2][0]] * 25
+                    + index[self.decrypt_table[char_1 + char_2][1]]
+                    for char_1 in chars
+                    for char_2 in chars
+                ],
+                dtype=np.int16,
+            )
+
+            char_positions = None
+
+            if "".join(chars).isascii():
+                char_positions = np.full(256, -1, dtype=np.int16)
+
+                for i, char in enumerate(chars):
+                    char_positions[ord(char)] = i
+
+            self._index_tables = (encrypt_indices, decrypt_indices, char_positions)
+            remeasure_key_schedule(self)  # the cached cipher is now larger
+
+        return self._index_tables
+
+    def missing_character_message(self, digraphs):
+        """
+        Builds the error message for a text with a character that is not in the Playfair matrix.
+
+        Args:
+        -   digraphs (list): The pairs of characters.
+
+        Returns:
+        -   str: The error message.
+        """
+
+        for pair in digraphs:
+            for char in pair:
+                if char not in self.positions:
+                    return "The character {!r} is not in the Playfair matrix".format(char)
+
+        return "The text contains a character that is not in the Playfair matrix"
+
+
+@cached_key_schedule("playfair")
+def compile_playfair_cipher(key_text: str):
+    """
+    Returns the compiled Playfair cipher for the given key.
+    The most recently used ciphers are cached, so repeated calls with the same key skip the build step.
+
+    Args:
+    -   key_text (str): The key text.
+
+    Returns:
+    -   PlayfairCipher: The compiled cipher.
+    """
+
+    return PlayfairCipher(key_text)
+
+
+def playfair_encrypt(plain_text: str, key_text: str):
+    """
+    Encrypts the given plain text using the Playfair cipher algorithm.
+
+    Parameters:
+    -   plain_text (str): The plain text to be encrypted.
+    -   key_text (str): The key text used to initialize the Playfair matrix.
+
+    Returns:
+    -   str: The encrypted text.
+
+    Raises:
+    -   ValueError: If a character of the plain text is not in the Playfair matrix.
+    """
+
+    initialized_plain_text = initialize_text(plain_text)  # initialize the plain text
+
+    # Look up each pair of characters in the compiled cipher
+    return compile_playfair_cipher(key_text).encrypt_digraphs(initialized_plain_text)
+
+
+def playfair_decrypt(cipher_text: str, key_text: str):
+    """
+    Decrypts a given cipher text using the Playfair cipher algorithm.
+
+    Args:
+    -   cipher_text (str): The cipher text to be decrypted.
+    -   key_text (str): The key text used for encryption.
+
+    Returns:
+    -   str: The decrypted plain text.
+
+    Raises:
+    -   ValueError: If a character of the cipher text is not in the Playfair matrix.
+    """
+
+    initialized_cipher_text = initialize_text(cipher_text)  # initialize the plain text
+
+    # Look up each pair of characters in the compiled cipher
+    return compile_playfair_cipher(key_text).decrypt_digraphs(initialized_cipher_text)
+
+
+def playfair_encrypt_batch(plain_texts: list, key_text: str):
+    """
+    Encrypts many plain texts with the same key using the Playfair cipher algorithm.
+    Each encrypted text is the same as the one returned by playfair_encrypt().
+
+    Parameters:
+    -   plain_texts (list): The plain texts to be encrypted.
+    -   key_text (str): The key text used to initialize the Playfair matrix.
+
+    Returns:
+    -   list: The encrypted texts.
+
+    Raises:
+    -   ValueError: If a character of any plain text is not in the Playfair matrix.
+    """
+
+    # Look up the pairs of all the plain texts in the compiled cipher at once
+    return compile_playfair_cipher(key_text).encrypt_batch(plain_texts)
+
+
+def playfair_decrypt_batch(cipher_texts: list, key_text: str):
+    """
+    Decrypts many cipher texts with the same key using the Playfair cipher algorithm.
+    Each decrypted text is the same as the one returned by playfair_decrypt().
+
+    Parameters:
+    -   cipher_texts (list): The cipher texts to be decrypted.
+    -   key_text (str): The key text used to initialize the Playfair matrix.
+
+    Returns:
+    -   list: The decrypted texts.
+
+    Raises:
+    -   ValueError: If a character of any cipher text is not in the Playfair matrix.
+    """
+
+    # Look up the pairs of all the cipher texts in the compiled cipher at once
+    return compile_playfair_cipher(key_text).decrypt_batch(cipher_texts)
+
+
+def iterate_digraphs(chunks, bounded_memory: bool = False):
+    """
+    Splits a stream of text into pairs of two characters, one pair at a time, in a single pass.
+
+    A filler character X is inserted between two identical characters of a pair, and at the end if the
+    length is odd. Like the original quadratic version of initialize_text(), identical pairs are only
+    checked up to the original length of the text, so the last characters (one for each inserted filler)
+    are paired as they are. To know where that point is without knowing the length of the stream up front,
+    a doubled pair waits until one character for each inserted filler has been read past it, so the memory
+    grows with the number of fillers inserted so far (e.g. a text of repeated "BALLOON" holds back a
+    character for every 7 characters read).
+
+    With bounded_memory, every pair of identical characters gets a filler, up to the end of the text, so a
+    doubled pair never waits and the memory stays the same however long the stream is. The pairs then differ
+    from initialize_text() when the last characters of the text (one for each filler) have a doubled pair.
+
+    Args:
+    -   chunks (iterable or file): The text chunks, or a text file object to read them from.
+    -   bounded_memory (bool): Whether to insert a filler in every doubled pair instead of holding back the
+        characters needed to match initialize_text().
+
+    Yields:
+    -   str: The pairs of two characters.
+    """
+
+    chunks = iterate_chunks(chunks)
+    text = ""  # characters read but not paired yet, starting at the beginning of a pair
+    consumed = 0  # number of characters paired before the text
+    inserted = 0  # number of filler characters inserted so far
+    text_length = None  # length of the whole text, known once the stream has ended
+
+    while True:
+        # Read at least as many new characters as are left over, so the text is copied a bounded number of times
+        new_chunks = []
+        new_length = 0
+
+        while text_length is None and new_length <= len(text):
+            chunk = next(chunks, None)
+
+            if chunk is None:
+                text_length = consumed + len(text) + new_length
+            else:
+                new_chunks.append(chunk.upper())  # converting the text to upper case
+                new_length += len(chunk)
+
+        text += "".join(new_chunks)
+        position = 0  # start of the next pair in the text
+
+        while True:
+            # Skip over the pairs of two different characters with a single regular expression match
+            end = DIFFERENT_PAIRS.match(text, position).end()
+
+            for i in range(position, end, 2):
+                yield text[i : i + 2]
+
+            position = end
+
+            # If less than two characters are left, wait for the next chunk
+            if end + 1 >= len(text):
+                break
+
+            # The two characters at the end are identical, check whether a filler has to be inserted
+            if bounded_memory:
+                insert_filler = True
+            elif text_length is None:
+                # Wait until it is known that the pair is within the original length of the text
+                if end + 1 + inserted >= len(text):
+                    break
+
+                insert_filler = True
+            else:
+                insert_filler = consumed + end + 1 + inserted < text_length
+
+            if insert_filler:
+                yield text[end] + "X"
+                inserted += 1
+                position = end + 1  # the second character starts the next pair
+            else:
+                yield text[end : end + 2]
+                position = end + 2
+
+        consumed += position
+        text = text[position:]
+
+        if text_length is not None:
+            break
+
+    # If the length of the text is odd, append a filler character at the end
+    if text:
+        yield text + "X"
+
+
+def batch_digraphs(digraphs, batch_size=32768):
+    """
+    Groups pairs of characters into lists, so each list can be looked up at once.
+
+    Args:
+    -   digraphs (iterable): The pairs of characters.
+    -   batch_size (int): The number of pairs in each list.
+
+    Yields:
+    -   list: The lists of pairs.
+    """
+
+    batch = []
+
+    for pair in digraphs:
+        batch.append(pair)
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def playfair_encrypt_stream(plain_chunks, key_text: str, bounded_memory: bool = False):
+    """
+    Encrypts a stream of plain text chunks using the Playfair cipher algorithm.
+    Pairs and fillers are carried across chunk boundaries, so the output is the same as playfair_encrypt().
+
+    Matching playfair_encrypt() means holding back one character for each filler inserted so far, because
+    the original algorithm only checks the doubled pairs up to the original length of the text, which a
+    stream does not know until it ends. The memory therefore grows with the number of doubled pairs (slowly:
+    a text of repeated "BALLOON" holds back one character for every 7 read). With bounded_memory, every
+    doubled pair gets a filler, so the memory stays flat, but the last pairs can differ from playfair_encrypt().
+
+    Parameters:
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+    -   key_text (str): The key text used to initialize the Playfair matrix.
+    -   bounded_memory (bool): Whether to keep the memory flat instead of matching playfair_encrypt() exactly.
+
+    Yields:
+    -   str: The encrypted chunks.
+    """
+
+    yield from compile_playfair_cipher(key_text).encrypt_stream(plain_chunks, bounded_memory)
+
+
+def playfair_decrypt_stream(cipher_chunks, key_text: str, bounded_memory: bool = False):
+    """
+    Decrypts a stream of cipher text chunks using the Playfair cipher algorithm.
+    Pairs are carried across chunk boundaries, so the output is the same as playfair_decrypt().
+
+    Matching playfair_decrypt() means holding back one character for each filler inserted so far (see
+    playfair_encrypt_stream()), so the memory grows with the number of doubled pairs. With bounded_memory,
+    every doubled pair gets a filler, so the memory stays flat, but the last pairs can differ from
+    playfair_decrypt().
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+    -   key_text (str): The key text used for encryption.
+    -   bounded_memory (bool): Whether to keep the memory flat instead of matching playfair_decrypt() exactly.
+
+    Yields:
+    -   str: The decrypted chunks.
+    """
+
+    yield from compile_playfair_cipher(key_text).decrypt_stream(cipher_chunks, bounded_memory)
@@ -0,0 +1,401 @@
+from .common import iterate_chunks
+from .keycache import cached_key_schedule
+
+VECTORIZE_THRESHOLD = 4096  # texts of at least this many characters are reordered with NumPy
+
+PERMUTATION_BLOCK_SIZE = 1 << 20  # positions placed at a time when a permutation is built, bounding the temporaries
+
+
+def rail_positions(length: int, depth: int, zigzag: bool = False):
+    """
+    Calculates which positions of the text are written on each rail.
+
+    In the default mode, position j is on rail j % depth. In the zigzag mode, the text goes down
+    and up the rails (0, 1, ..., depth - 1, depth - 2, ..., 1, 0, 1, ...).
+
+    Args:
+    -   length (int): The length of the text.
+    -   depth (int): The number of rails.
+    -   zigzag (bool): Whether to use the zigzag mode.
+
+    Returns:
+    -   list: The positions on each rail, from the top rail to the bottom rail.
+    """
+
+    cycle = 2 * (depth - 1)  # length of one way down and up the rails
+
+    # Without the zigzag (or with a single rail), every depth-th position is on the same rail
+    if not zigzag or cycle == 0:
+        return [range(i, length, depth) for i in range(depth)]
+
+    rails = []
+
+    for i in range(depth):
+        # The top and bottom rails are visited once per cycle, the others on the way down and on the way up
+        if i == 0 or i == depth - 1:
+            rails.append(range(i, length, cycle))
+        else:
+            rails.append(sorted([*range(i, length, cycle), *range(cycle - i, length, cycle)]))
+
+    return rails
+
+
+@cached_key_schedule("rail_permutation")
+def rail_permutation(length: int, depth: int, zigzag: bool = False):
+    """
+    Calculates the permutation of the Rail Fence cipher as a NumPy index array.
+    The encrypted text is text[permutation]. The most recently used permutations are kept in the shared key
+    schedule cache, which is bounded in bytes, so the permutations of long texts do not pile up.
+
+    The index of each position in the encrypted text is calculated directly (the start of its rail plus its
+    rank on the rail), one block of PERMUTATION_BLOCK_SIZE positions at a time, and scattered into the
+    permutation. The permutation is int32 for texts shorter than 2**31, so the only array as long as the
+    text takes 4 bytes per character, instead of the int64 positions, rails and sort indices of a sort by rail.
+
+    Args:
+    -   length (int): The length of the text.
+    -   depth (int): The number of rails.
+    -   zigzag (bool): Whether to use the zigzag mode.
+
+    Returns:
+    -   numpy.ndarray: The read only permutation.
+    """
+
+    import numpy as np  # NumPy is only imported when the vectorized path is used
+
+    dtype = np.int32 if length < 2**31 else np.int64
+    cycle = 2 * (depth - 1)  # length of one way down and up the rails
+    zigzag = zigzag and cycle > 0
+
+    # With a single rail, or at least as many rails as characters, the characters stay in order
+    if depth == 1 or depth >= length:
+        permutation = np.arange(length, dtype=dtype)
+        permutation.flags.writeable = False
+        return permutation
+
+    # Count the positions on each rail: one per period, and for the middle zigzag rails one more on the way up
+    period = cycle if zigzag else depth
+    rails = np.arange(depth, dtype=np.int64)
+    counts = (length - rails + period - 1) // period
+
+    if zigzag:
+        rising = cycle - rails[1:-1]  # the first position of each middle rail on the way up
+        counts[1:-1] += (length - rising + period - 1) // period
+
+    # The encrypted text starts each rail after all the positions of the rails above it
+    starts = np.zeros(depth, dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+
+    permutation = np.empty(length, dtype=dtype)
+
+    for start in range(0, length, PERMUTATION_BLOCK_SIZE):
+        positions = np.arange(start, min(start + PERMUTATION_BLOCK_SIZE, length), dtype=np.int64)
+        turns, offsets = np.divmod(positions, period)
+
+        if zigzag:
+            # The rail is the offset on the way down, and mirrored on the way up. A middle rail is visited
+            # twice per cycle, so its rank counts two positions per cycle, plus one on the way up.
+            rail = np.minimum(offsets, cycle - offsets)
+            middle = (rail != 0) & (rail != depth - 1)
+            rank = turns * (1 + middle) + (offsets >= depth)
+        else:
+            rail, rank = offsets, turns
+
+        permutation[starts[rail] + rank] = positions
+
+    permutation.flags.writeable = False  # the cached array is shared between calls
+
+    return permutation
+
+
+def permute_text(text: str, depth: int, zigzag: bool, inverse: bool):
+    """
+    Reorders the text with the Rail Fence permutation.
+    Long texts are reordered with a single NumPy gather (encryption) or scatter (decryption).
+
+    Args:
+    -   text (str): The text to be reordered.
+    -   depth (int): The number of rails.
+    -   zigzag (bool): Whether to use the zigzag mode.
+    -   inverse (bool): False to encrypt, True to decrypt.
+
+    Returns:
+    -   str: The reordered text.
+    """
+
+    length = len(text)  # length of the text
+
+    # Use the vectorized path for long texts
+    if length >= VECTORIZE_THRESHOLD:
+        try:
+            import numpy as np  # NumPy is only imported when the vectorized path is used
+        except ImportError:
+            np = None  # NumPy is not installed, use the Python path instead
+
+        if np is not None:
+            permutation = rail_permutation(length, depth, zigzag)
+
+            # Each character is one byte in ASCII texts, four bytes otherwise
+            encoding, dtype = ("ascii", np.uint8) if text.isascii() else ("utf-32-le", "<u4")
+            values = np.frombuffer(text.encode(encoding), dtype=dtype)
+
+            if inverse:
+                reordered = np.empty_like(values)
+                reordered[permutation] = values  # scatter each character back to its position
+            else:
+                reordered = values[permutation]  # gather the characters rail by rail
+
+            return reordered.tobytes().decode(encoding)
+
+    # Read the positions rail by rail
+    order = [j for rail in rail_positions(length, depth, zigzag) for j in rail]
+
+    if inverse:
+        chars = [""] * length
+
+        for i, j in enumerate(order):
+            chars[j] = text[i]
+
+        return "".join(chars)
+
+    return "".join([text[j] for j in order])
+
+
+def rail_encrypt(plain_text: str, depth: int, zigzag: bool = False):
+    """
+    Encrypts the given plain text using the Rail Fence cipher algorithm.
+
+    Parameters:
+    -   plain_text (str): The plain text to be encrypted.
+    -   depth (int): The depth used for encryption.
+    -   zigzag (bool): Whether to write the text in a zigzag down and up the rails.
+
+    Returns:
+    -   str: The encrypted text.
+
+    Raises:
+    -   ValueError: If the depth is less than 1.
+    """
+
+    # If the depth is less than 1, there are no rails to write on
+    if depth < 1:
+        raise ValueError("The depth must be at least 1")
+
+    plain_text = plain_text.replace(
+        " ", ""
+    ).upper()  # remove all spaces from the plain text and convert it to uppercase
+
+    # If the length of the plain text is less than the depth, return the plain text
+    if len(plain_text) < depth:
+        return plain_text
+
+    # Read the text rail by rail
+    return permute_text(plain_text, depth, zigzag, inverse=False)
+
+
+def rail_decrypt(cipher_text: str, depth: int, zigzag: bool = False):
+    """
+    Decrypts the given Rail Fence cipher text using the provided depth.
+
+    Parameters:
+    -   cipher_text (str): The encrypted text to be decrypted.
+    -   depth (int): The depth used for decryption.
+    -   zigzag (bool): Whether the text was written in a zigzag down and up the rails.
+
+    Returns:
+    -   str: The decrypted text.
+
+    Raises:
+    -   ValueError: If the depth is less than 1.
+    """
+
+    # If the depth is less than 1, there are no rails to read from
+    if depth < 1:
+        raise ValueError("The depth must be at least 1")
+
+    # If the length of the cipher text is less than the depth, return the cipher text
+    if len(cipher_text) < depth:
+        return cipher_text
+
+    # Put each character back to its position on the rails
+    return permute_text(cipher_text, depth, zigzag, inverse=True)
+
+
+def iterate_frames(chunks, frame_size: int, prepare=None):
+    """
+    Cuts a stream of text into frames of a fixed number of characters.
+
+    Args:
+    -   chunks (iterable or file): The text chunks, or a text file object to read them from.
+    -   frame_size (int): The number of characters in each frame. The last frame may be shorter.
+    -   prepare (function): Applied to each chunk before it is cut into frames.
+
+    Yields:
+    -   str: The frames of text.
+    """
+
+    remainder = ""  # the characters of a partial frame, carried over to the next chunk
+
+    for chunk in iterate_chunks(chunks):
+        text = remainder + (prepare(chunk) if prepare else chunk)
+        start = 0  # start of the next frame in the text
+
+        # Yield every full frame in the text
+        while len(text) - start >= frame_size:
+            yield text[start : start + frame_size]
+            start += frame_size
+
+        remainder = text[start:]
+
+    if remainder:
+        yield remainder
+
+
+def rail_encrypt_stream(
+    plain_chunks, depth: int, frame_size: int = 65536, zigzag: bool = False
+):
+    """
+    Encrypts a stream of plain text using the Rail Fence cipher algorithm, one frame at a time.
+
+    The Rail Fence cipher reorders the whole text, so the stream is cut into frames of frame_size
+    characters (after the spaces are removed) and each frame is encrypted with rail_encrypt().
+    A text that fits in a single frame gives the same output as rail_encrypt().
+
+    Parameters:
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+    -   depth (int): The depth used for encryption.
+    -   frame_size (int): The number of characters in each frame.
+    -   zigzag (bool): Whether to write the text in a zigzag down and up the rails.
+
+    Yields:
+    -   str: The encrypted frames.
+    """
+
+    # Remove all spaces from each chunk and convert it to uppercase before it is framed
+    for frame in iterate_frames(
+        plain_chunks, frame_size, lambda chunk: chunk.replace(" ", "").upper()
+    ):
+        yield rail_encrypt(frame, depth, zigzag)
+
+
+def rail_decrypt_stream(
+    cipher_chunks, depth: int, frame_size: int = 65536, zigzag: bool = False
+):
+    """
+    Decrypts a stream of Rail Fence cipher text, one frame at a time.
+    The frame size must be the same as the one used by rail_encrypt_stream().
+
+    Parameters:
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+    -   depth (int): The depth used for decryption.
+    -   frame_size (int): The number of characters in each frame.
+    -   zigzag (bool): Whether the text was written in a zigzag down and up the rails.
+
+    Yields:
+    -   str: The decrypted frames.
+    """
+
+    for frame in iterate_frames(cipher_chunks, frame_size):
+        yield rail_decrypt(frame, depth, zigzag)
+
+
+class RailFenceCipher:
+    """
+    A Rail Fence cipher with a fixed depth and mode.
+
+    Attributes:
+    -   depth (int): The number of rails.
+    -   zigzag (bool): Whether the text is written in a zigzag down and up the rails.
+    """
+
+    def __init__(self, depth: int, zigzag: bool = False):
+        """
+        Initializes the cipher.
+
+        Args:
+        -   depth (int): The number of rails.
+        -   zigzag (bool): Whether to write the text in a zigzag down and up the rails.
+
+        Raises:
+        -   ValueError: If the depth is less than 1.
+        """
+
+        # If the depth is less than 1, there are no rails to write on
+        if depth < 1:
+            raise ValueError("The depth must be at least 1")
+
+        self.depth = depth
+        self.zigzag = zigzag
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text.
+        """
+
+        return rail_encrypt(plain_text, self.depth, self.zigzag)
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text.
+
+        Args:
+        -   cipher_text (str): The cipher text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text.
+        """
+
+        return rail_decrypt(cipher_text, self.depth, self.zigzag)
+
+    def encrypt_stream(self, plain_chunks, frame_size: int = 65536):
+        """
+        Encrypts a stream of plain text chunks, one frame at a time.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+        -   frame_size (int): The number of characters in each frame.
+
+        Yields:
+        -   str: The encrypted frames.
+        """
+
+        yield from rail_encrypt_stream(plain_chunks, self.depth, frame_size, self.zigzag)
+
+    def decrypt_stream(self, cipher_chunks, frame_size: int = 65536):
+        """
+        Decrypts a stream of cipher text chunks, one frame at a time.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+        -   frame_size (int): The number of characters in each frame.
+
+        Yields:
+        -   str: The decrypted frames.
+        """
+
+        yield from rail_decrypt_stream(cipher_chunks, self.depth, frame_size, self.zigzag)
+
+
+@cached_key_schedule("rail_fence")
+def compile_rail_fence_cipher(depth: int, zigzag: bool = False):
+    """
+    Returns a Rail Fence cipher for the given depth and mode, from the shared key schedule cache.
+
+    Args:
+    -   depth (int): The number of rails.
+    -   zigzag (bool): Whether to write the text in a zigzag down and up the rails.
+
+    Returns:
+    -   RailFenceCipher: The cipher.
+
+    Raises:
+    -   ValueError: If the depth is less than 1.
+    """
+
+    return RailFenceCipher(depth, zigzag)
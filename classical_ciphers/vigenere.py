@@ -0,0 +1,569 @@
+import string  # Import string for the ASCII letters
+
+from .common import BUFFER_CHUNK_SIZE, byte_view, iterate_chunks, output_view
+from .keycache import cached_key_schedule
+
+VECTORIZE_THRESHOLD = 4096  # ASCII texts of at least this many characters are shifted with NumPy
+
+ASCII_LETTERS = string.ascii_letters.encode("ascii")  # deleted from a buffer to find whether it has letters
+
+SHIFT_CHUNK_SIZE = 1 << 14  # the number of bytes shifted at a time by NumPy, and the length the key is repeated by
+
+
+def initialize_key_shifts(key_text: str):
+    """
+    Converts the key text to the list of shifts used by the Vigenere cipher.
+
+    Args:
+    -   key_text (str): The key text.
+
+    Returns:
+    -   list: The shift of each key character (A = 0, B = 1, ...), empty for an empty key (see reject_empty_key()).
+    """
+
+    return [ord(char.upper()) - 65 for char in key_text]
+
+
+def reject_empty_key(data):
+    """
+    Raises the error of an empty key for data that has a letter to shift. An empty key has no shift, so only
+    data without letters (e.g. an empty text) is transformed with it, unchanged, as by the original functions
+    (which divided by zero at the first letter).
+
+    Args:
+    -   data (str or bytes-like): The text or the bytes to be shifted.
+
+    Raises:
+    -   ValueError: If the data has an ASCII letter.
+    """
+
+    if isinstance(data, str):
+        has_letter = any(char in string.ascii_letters for char in data)
+    else:
+        data = bytes(data)
+        has_letter = len(data.translate(None, ASCII_LETTERS)) != len(data)
+
+    if has_letter:
+        raise ValueError("The Vigenere key cannot be empty")
+
+
+def build_shift_arrays(key_shifts: list):
+    """
+    Builds the key shifts of both directions as bytes of shifts between 0 and 25, which the vectorized paths
+    index by letter position. The key is repeated to be SHIFT_CHUNK_SIZE longer than itself, so the letters
+    of a chunk can be indexed from any key position without a modulo. The bytes are built without NumPy,
+    so a compiled cipher can hold them from the start without importing it.
+
+    Args:
+    -   key_shifts (list): The key shifts returned by initialize_key_shifts().
+
+    Returns:
+    -   dict: The repeated shifts of each direction (1 and -1), as bytes.
+    """
+
+    shift_arrays = {}
+    length = len(key_shifts) + SHIFT_CHUNK_SIZE
+
+    for direction in (1, -1):
+        key = bytes(shift * direction % 26 for shift in key_shifts)
+        shift_arrays[direction] = (key * (length // len(key) + 1))[:length] if key else key
+
+    return shift_arrays
+
+
+def key_shift_array(key_shifts: list, direction: int, shift_arrays: dict = None):
+    """
+    Returns the repeated key shifts of a direction (see build_shift_arrays()) as a NumPy uint8 array.
+
+    Args:
+    -   key_shifts (list): The key shifts returned by initialize_key_shifts().
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   shift_arrays (dict): The shifts built for the key by build_shift_arrays(), or None to build them.
+
+    Returns:
+    -   numpy.ndarray: The uint8 shift of each key letter, repeated (a view of the bytes, without a copy).
+
+    Raises:
+    -   ImportError: If NumPy is not installed.
+    """
+
+    import numpy as np  # NumPy is only imported when the vectorized path is used
+
+    if shift_arrays is None:
+        shift_arrays = build_shift_arrays(key_shifts)
+
+    return np.frombuffer(shift_arrays[direction], dtype=np.uint8)
+
+
+def vigenere_shift(text: str, key_shifts: list, direction: int, phase: int = 0, shift_arrays: dict = None):
+    """
+    Shifts each letter of the text by the key shift at its letter position.
+
+    The n-th letter of the text uses key_shifts[n % len(key_shifts)], so the key never has to be rotated.
+    Long ASCII texts are shifted with NumPy when it is installed.
+
+    Args:
+    -   text (str): The text to be shifted.
+    -   key_shifts (list): The key shifts returned by initialize_key_shifts().
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   phase (int): The number of letters already shifted before this text, used by the streams.
+    -   shift_arrays (dict): The shifts of the key built by build_shift_arrays(), or None to build them.
+
+    Returns:
+    -   tuple: A tuple containing the shifted text and the phase after the text.
+
+    Raises:
+    -   ValueError: If the key is empty and the text has a letter.
+    """
+
+    if not key_shifts:
+        reject_empty_key(text)
+        return text, phase
+
+    # Use the vectorized path for long ASCII texts
+    if len(text) >= VECTORIZE_THRESHOLD and text.isascii():
+        try:
+            shifted_bytes, phase = vigenere_shift_bytes(
+                text.encode("ascii"), key_shifts, direction, phase, shift_arrays
+            )
+            return shifted_bytes.decode("ascii"), phase
+        except ImportError:
+            pass  # NumPy is not installed, use the character loop instead
+
+    key_length = len(key_shifts)  # length of the key
+    shifted_chars = []  # shifted characters are stored in this list
+
+    # Loop through each character in the text
+    for char in text:
+        if (
+            char.isascii() and char.isalpha()
+        ):  # only the ASCII letters are shifted, isalpha() alone also accepts letters such as "é"
+            ascii_val = ord(
+                char.upper()
+            )  # ord() returns the ASCII value of the character
+
+            key = key_shifts[phase % key_length]  # key value for the current letter
+
+            shifted_chars.append(
+                chr((((ascii_val - 65) + direction * key) % 26) + 65)
+            )  # 65 is the ASCII value of 'A' (vigenere formula)
+
+            phase += 1  # move to the next key letter
+        else:
+            shifted_chars.append(char)  # if the character is not an alphabet
+
+    return "".join(shifted_chars), phase
+
+
+def vigenere_shift_bytes(data: bytes, key_shifts: list, direction: int, phase: int = 0, shift_arrays: dict = None):
+    """
+    Shifts each ASCII letter of the data by the key shift at its letter position using NumPy.
+    The whole buffer is shifted with a few array operations instead of a loop over each character.
+
+    Args:
+    -   data (bytes): The ASCII data to be shifted.
+    -   key_shifts (list): The key shifts returned by initialize_key_shifts().
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   phase (int): The number of letters already shifted before this data.
+    -   shift_arrays (dict): The shifts of the key built by build_shift_arrays(), or None to build them.
+
+    Returns:
+    -   tuple: A tuple containing the shifted data as bytes and the phase after the data.
+
+    Raises:
+    -   ImportError: If NumPy is not installed.
+    """
+
+    import numpy as np  # NumPy is only imported when the vectorized path is used
+
+    values = np.frombuffer(data, dtype=np.uint8)
+    shifted = np.empty_like(values)
+    shifts = key_shift_array(key_shifts, direction, shift_arrays)
+
+    # The data is shifted one chunk at a time, so the temporary arrays stay small
+    for start in range(0, len(values), SHIFT_CHUNK_SIZE):
+        stop = start + SHIFT_CHUNK_SIZE
+        phase = shift_letter_array(values[start:stop], shifted[start:stop], shifts, len(key_shifts), phase)
+
+    return shifted.tobytes(), phase
+
+
+def shift_letter_array(values, target, shifts, key_length: int, phase: int = 0):
+    """
+    Shifts each ASCII letter of a NumPy byte array into a target array, which may be the same array.
+
+    Args:
+    -   values (numpy.ndarray): The uint8 bytes to be shifted.
+    -   target (numpy.ndarray): The uint8 array the shifted bytes are written to, as long as values.
+    -   shifts (numpy.ndarray): The repeated uint8 key shifts of the direction, returned by key_shift_array().
+    -   key_length (int): The length of the key, the period of the shifts.
+    -   phase (int): The number of letters already shifted before these bytes.
+
+    Returns:
+    -   int: The phase after the bytes.
+    """
+
+    import numpy as np  # NumPy is only imported when the vectorized path is used
+
+    # Letters are found by folding them to lower case (setting the 0x20 bit)
+    folded = values | 0x20
+    is_letter = (folded >= 97) & (folded <= 122)
+
+    # The rank of each byte among the letters (1 for the first letter), counted without compacting the letters
+    ranks = np.cumsum(is_letter, dtype=np.uint32)
+    letter_count = int(ranks[-1]) if len(ranks) else 0
+
+    # The letter of rank r uses the key shift at (phase + r - 1) modulo the key length. The repeated key is
+    # indexed directly, so the work depends on the length of the bytes and not of the key (which may be a book).
+    offset = (phase - 1) % key_length
+    positions = ranks + np.uint32(offset)  # the ranks and the key positions fit in 32 bits
+
+    if offset + letter_count >= len(shifts):  # a chunk longer than SHIFT_CHUNK_SIZE wraps around the key
+        positions %= np.uint32(key_length)
+
+    shifts = shifts[positions]
+
+    # Shift every byte as if it were a letter in 8 bit arithmetic (at most 25 + 25), then keep the letters
+    shifted = folded - np.uint8(97) + shifts
+    shifted -= (shifted >= 26) * np.uint8(26)
+    shifted += np.uint8(65)
+
+    # The shifted letters are computed before anything is written, so the target may be the values themselves
+    np.copyto(target, values)
+    np.copyto(target, shifted, where=is_letter)
+
+    return phase + letter_count
+
+
+def vigenere_shift_buffer(data, key_shifts: list, direction: int, phase: int = 0, out=None, shift_arrays: dict = None):
+    """
+    Shifts each ASCII letter of a buffer by the key shift at its letter position, into an output buffer
+    or in place, without decoding it.
+
+    Long buffers are shifted with NumPy one chunk at a time when it is installed, so the temporary arrays
+    stay the same size however long the buffer is. Short buffers (and every buffer without NumPy) are
+    shifted with a loop over the bytes.
+
+    Args:
+    -   data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key_shifts (list): The key shifts returned by initialize_key_shifts().
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+    -   phase (int): The number of letters already shifted before this buffer.
+    -   out (bytes-like): The writable output buffer (data itself to shift it in place), or None to
+        allocate a new bytearray.
+    -   shift_arrays (dict): The shifts of the key built by build_shift_arrays(), or None to build them.
+
+    Returns:
+    -   tuple: A tuple containing the output buffer and the phase after the buffer.
+
+    Raises:
+    -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+    -   ValueError: If the output buffer does not have the length of the input buffer.
+    -   ValueError: If the key is empty and the buffer has a letter.
+    """
+
+    source = byte_view(data)
+    out, target = output_view(source, out)
+
+    if not key_shifts:
+        reject_empty_key(source)
+        target[:] = source
+        return out, phase
+
+    if len(source) >= VECTORIZE_THRESHOLD:
+        try:
+            import numpy as np  # NumPy is only imported when the vectorized path is used
+
+            values = np.frombuffer(source, dtype=np.uint8)
+            shifted = np.frombuffer(target, dtype=np.uint8)
+            shifts = key_shift_array(key_shifts, direction, shift_arrays)
+
+            for start in range(0, len(values), SHIFT_CHUNK_SIZE):
+                stop = start + SHIFT_CHUNK_SIZE
+                phase = shift_letter_array(values[start:stop], shifted[start:stop], shifts, len(key_shifts), phase)
+
+            return out, phase
+        except ImportError:
+            pass  # NumPy is not installed, use the byte loop instead
+
+    key_length = len(key_shifts)
+
+    for start in range(0, len(source), BUFFER_CHUNK_SIZE):
+        stop = start + BUFFER_CHUNK_SIZE
+        chunk = bytearray(source[start:stop])
+
+        for i, byte in enumerate(chunk):
+            folded = byte | 0x20  # fold the letter to lower case
+
+            if 97 <= folded <= 122:
+                chunk[i] = (folded - 97 + direction * key_shifts[phase % key_length]) % 26 + 65
+                phase += 1
+
+        target[start:stop] = chunk
+
+    return out, phase
+
+
+class VigenereCipher:
+    """
+    A compiled Vigenere cipher for a single key.
+
+    The key is converted to its list of shifts once, so long keys are not upper cased and converted again on every call.
+    The repeated shifts of the vectorized paths are also built once, when the cipher is created, so the key
+    schedule cache measures them (a cipher does not grow after it is cached).
+
+    Args:
+    -   key_text (str): The key text used for encryption and decryption. An empty key only transforms the
+        texts without letters (see reject_empty_key()).
+    """
+
+    def __init__(self, key_text: str):
+        self.key_text = key_text
+        self.key_shifts = initialize_key_shifts(key_text)
+        self.shift_arrays = build_shift_arrays(self.key_shifts)  # direction -> the repeated shifts, as bytes
+
+    def shift_buffer(self, data, direction: int, phase: int = 0, out=None):
+        """
+        Shifts a buffer of ASCII bytes from a letter position, into an output buffer or in place. This is
+        used by the streams, shards and in place windows that carry the key position between buffers.
+
+        Args:
+        -   data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   direction (int): 1 to encrypt, -1 to decrypt.
+        -   phase (int): The number of letters before this buffer.
+        -   out (bytes-like): The writable output buffer (data itself to shift it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   tuple: A tuple containing the output buffer and the phase after the buffer.
+        """
+
+        return vigenere_shift_buffer(data, self.key_shifts, direction, phase, out, self.shift_arrays)
+
+    def encrypt(self, plain_text: str):
+        """
+        Encrypts the given plain text.
+
+        Args:
+        -   plain_text (str): The plain text to be encrypted.
+
+        Returns:
+        -   str: The encrypted text.
+        """
+
+        # Shift each letter forward by the key letter at its position
+        encrypted_text, _ = vigenere_shift(plain_text, self.key_shifts, 1, 0, self.shift_arrays)
+
+        return encrypted_text
+
+    def decrypt(self, cipher_text: str):
+        """
+        Decrypts the given cipher text.
+
+        Args:
+        -   cipher_text (str): The encrypted text to be decrypted.
+
+        Returns:
+        -   str: The decrypted text.
+        """
+
+        # Shift each letter backward by the key letter at its position
+        decrypted_text, _ = vigenere_shift(cipher_text, self.key_shifts, -1, 0, self.shift_arrays)
+
+        return decrypted_text
+
+    def encrypt_buffer(self, plain_data, out=None):
+        """
+        Encrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        out, _ = self.shift_buffer(plain_data, 1, out=out)
+
+        return out
+
+    def decrypt_buffer(self, cipher_data, out=None):
+        """
+        Decrypts a buffer of ASCII bytes without decoding it, into an output buffer or in place.
+
+        Args:
+        -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+        -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+            allocate a new bytearray.
+
+        Returns:
+        -   bytes-like: The output buffer.
+
+        Raises:
+        -   TypeError: If a buffer is not a contiguous buffer of single bytes, or the output is not writable.
+        -   ValueError: If the output buffer does not have the length of the input buffer.
+        """
+
+        out, _ = self.shift_buffer(cipher_data, -1, out=out)
+
+        return out
+
+    def encrypt_stream(self, plain_chunks):
+        """
+        Encrypts a stream of plain text chunks.
+        The key position is carried from one chunk to the next, so the output is the same as
+        encrypting the whole text at once while only one chunk is held in memory.
+
+        Args:
+        -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The encrypted chunks.
+        """
+
+        phase = 0  # the number of letters encrypted by the previous chunks
+
+        for chunk in iterate_chunks(plain_chunks):
+            encrypted_chunk, phase = vigenere_shift(chunk, self.key_shifts, 1, phase, self.shift_arrays)
+
+            yield encrypted_chunk
+
+    def decrypt_stream(self, cipher_chunks):
+        """
+        Decrypts a stream of cipher text chunks.
+        The key position is carried from one chunk to the next, so the output is the same as
+        decrypting the whole text at once while only one chunk is held in memory.
+
+        Args:
+        -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+
+        Yields:
+        -   str: The decrypted chunks.
+        """
+
+        phase = 0  # the number of letters decrypted by the previous chunks
+
+        for chunk in iterate_chunks(cipher_chunks):
+            decrypted_chunk, phase = vigenere_shift(chunk, self.key_shifts, -1, phase, self.shift_arrays)
+
+            yield decrypted_chunk
+
+
+@cached_key_schedule("vigenere")
+def compile_vigenere_cipher(key_text: str):
+    """
+    Returns the compiled Vigenere cipher for the given key.
+    The most recently used ciphers are cached, so repeated calls with the same key skip the build step.
+
+    Args:
+    -   key_text (str): The key text.
+
+    Returns:
+    -   VigenereCipher: The compiled cipher.
+    """
+
+    return VigenereCipher(key_text)
+
+
+def vigenere_encrypt(plain_text, key_text):
+    """
+    Encrypts the given plain text using the Vigenere cipher algorithm.
+
+    Args:
+    -   plain_text (str): The plain text to be encrypted.
+    -   key_text (str): The key text used for encryption.
+
+    Returns:
+    -   str: The encrypted text.
+    """
+
+    return compile_vigenere_cipher(key_text).encrypt(plain_text)
+
+
+def vigenere_decrypt(cipher_text, key_text):
+    """
+    Decrypts the given Vigenere cipher text using the provided key.
+
+    Args:
+    -   cipher_text (str): The encrypted text to be decrypted.
+    -   key_text (str): The key used for decryption.
+
+    Returns:
+    -   str: The decrypted text.
+    """
+
+    return compile_vigenere_cipher(key_text).decrypt(cipher_text)
+
+
+def vigenere_encrypt_stream(plain_chunks, key_text):
+    """
+    Encrypts a stream of plain text chunks using the Vigenere cipher algorithm.
+    The key position is carried from one chunk to the next, so the output is the same as
+    encrypting the whole text at once while only one chunk is held in memory.
+
+    Args:
+    -   plain_chunks (iterable or file): The plain text chunks, or a text file object to read them from.
+    -   key_text (str): The key text used for encryption.
+
+    Yields:
+    -   str: The encrypted chunks.
+    """
+
+    yield from compile_vigenere_cipher(key_text).encrypt_stream(plain_chunks)
+
+
+def vigenere_decrypt_stream(cipher_chunks, key_text):
+    """
+    Decrypts a stream of Vigenere cipher text chunks using the provided key.
+    The key position is carried from one chunk to the next, so the output is the same as
+    decrypting the whole text at once while only one chunk is held in memory.
+
+    Args:
+    -   cipher_chunks (iterable or file): The cipher text chunks, or a text file object to read them from.
+    -   key_text (str): The key used for decryption.
+
+    Yields:
+    -   str: The decrypted chunks.
+    """
+
+    yield from compile_vigenere_cipher(key_text).decrypt_stream(cipher_chunks)
+
+
+def vigenere_encrypt_buffer(plain_data, key_text, out=None):
+    """
+    Encrypts a buffer of ASCII bytes using the Vigenere cipher algorithm, into an output buffer or in place.
+
+    Args:
+    -   plain_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key_text (str): The key text used for encryption.
+    -   out (bytes-like): The writable output buffer (plain_data itself to encrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_vigenere_cipher(key_text).encrypt_buffer(plain_data, out)
+
+
+def vigenere_decrypt_buffer(cipher_data, key_text, out=None):
+    """
+    Decrypts a buffer of Vigenere cipher bytes using the provided key, into an output buffer or in place.
+
+    Args:
+    -   cipher_data (bytes-like): A bytes, bytearray, memoryview, NumPy array or other buffer of single bytes.
+    -   key_text (str): The key used for decryption.
+    -   out (bytes-like): The writable output buffer (cipher_data itself to decrypt it in place), or None to
+        allocate a new bytearray.
+
+    Returns:
+    -   bytes-like: The output buffer.
+    """
+
+    return compile_vigenere_cipher(key_text).decrypt_buffer(cipher_data, out)
@@ -0,0 +1,4 @@
+"""
+The original implementations of the ciphers, kept as they were before the classical_ciphers package (only the
+interactive prompts at the end of each script are left out). The tests check the package against them.
+"""
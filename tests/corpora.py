@@ -0,0 +1,100 @@
+import random  # Import random to generate the long corpora
+import string  # Import string for the characters of the corpora
+
+# Fixed texts the package is checked on: lower case, digits and punctuation, doubled letters, odd lengths,
+# and texts longer than the VECTORIZE_THRESHOLD of the ciphers, so both the Python and the NumPy paths run
+CORPORA = {
+    "lower": "attack at dawn, meet me by the old oak tree",
+    "mixed": "Hello World! 1234 The Quick Brown Fox; jumps over 42 lazy dogs.\n",
+    "doubled": "balloon bookkeeper committee aardvark LLAMA mississippi",
+    "odd": "ABCDEFGHI",
+    "single": "a",
+    "empty": "",
+    "long": "".join(random.Random(0).choices(string.ascii_letters + string.digits + " ,.!\n", k=20001)),
+}
+
+# English prose (the openings of A Tale of Two Cities and Pride and Prejudice, and the Gettysburg Address),
+# for the cryptanalysis, which scores the decryptions against the letter statistics of English
+ENGLISH = """
+It was the best of times, it was the worst of times, it was the age of wisdom, it was the age of
+foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season of Light,
+it was the season of Darkness, it was the spring of hope, it was the winter of despair, we had
+everything before us, we had nothing before us, we were all going direct to Heaven, we were all going
+direct the other way; in short, the period was so far like the present period, that some of its
+noisiest authorities insisted on its being received, for good or for evil, in the superlative degree
+of comparison only. There were a king with a large jaw and a queen with a plain face, on the throne of
+England; there were a king with a large jaw and a queen with a fair face, on the throne of France. In
+both countries it was clearer than crystal to the lords of the State preserves of loaves and fishes,
+that things in general were settled for ever.
+
+It is a truth universally acknowledged, that a single man in possession of a good fortune, must be in
+want of a wife. However little known the feelings or views of such a man may be on his first entering
+a neighbourhood, this truth is so well fixed in the minds of the surrounding families, that he is
+considered the rightful property of some one or other of their daughters. My dear Mr. Bennet, said his
+lady to him one day, have you heard that Netherfield Park is let at last? Mr. Bennet replied that he
+had not. But it is, returned she; for Mrs. Long has just been here, and she told me all about it. Mr.
+Bennet made no answer. Do you not want to know who has taken it? cried his wife impatiently. You want
+to tell me, and I have no objection to hearing it. This was invitation enough.
+
+Four score and seven years ago our fathers brought forth on this continent, a new nation, conceived in
+Liberty, and dedicated to the proposition that all men are created equal. Now we are engaged in a great
+civil war, testing whether that nation, or any nation so conceived and so dedicated, can long endure.
+We are met on a great battle-field of that war. We have come to dedicate a portion of that field, as a
+final resting place for those who here gave their lives that that nation might live. It is altogether
+fitting and proper that we should do this. But, in a larger sense, we can not dedicate, we can not
+consecrate, we can not hallow this ground. The brave men, living and dead, who struggled here, have
+consecrated it, far above our poor power to add or detract. The world will little note, nor long
+remember what we say here, but it can never forget what they did here. It is for us the living, rather,
+to be dedicated here to the unfinished work which they who fought here have thus far so nobly advanced.
+It is rather for us to be here dedicated to the great task remaining before us, that from these honored
+dead we take increased devotion to that cause for which they gave the last full measure of devotion,
+that we here highly resolve that these dead shall not have died in vain, that this nation, under God,
+shall have a new birth of freedom, and that government of the people, by the people, for the people,
+shall not perish from the earth.
+"""
+
+# The same corpora with only upper case letters, for the ciphers that need letters only (Hill, Playfair)
+LETTERS = {name: "".join(char for char in text.upper() if char.isalpha()) for name, text in CORPORA.items()}
+
+
+def split_points(length: int, seed: int):
+    """
+    Returns the chunk boundaries used to cut a text into a stream: chunks of one character, of a few
+    characters, at random positions, and the whole text at once.
+
+    Args:
+    -   length (int): The length of the text.
+    -   seed (int): The seed of the random boundaries.
+
+    Returns:
+    -   list: The lists of chunk lengths.
+    """
+
+    rng = random.Random(seed)
+    random_lengths = []
+
+    while sum(random_lengths) < length:
+        random_lengths.append(rng.randrange(1, 5000))
+
+    return [[1] * min(length, 64) + [length], [3] * (length // 3 + 1), random_lengths, [length]]
+
+
+def split_text(text: str, lengths: list):
+    """
+    Cuts a text into chunks of the given lengths. The last chunk is shorter when the lengths add up to more.
+
+    Args:
+    -   text (str): The text.
+    -   lengths (list): The chunk lengths.
+
+    Returns:
+    -   list: The chunks.
+    """
+
+    chunks, start = [], 0
+
+    for length in lengths:
+        chunks.append(text[start : start + length])
+        start += length
+
+    return chunks
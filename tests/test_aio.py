@@ -0,0 +1,195 @@
+import asyncio  # Import asyncio to run the streams and the proxy
+
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher
+from classical_ciphers.aio import CipherStreamReader, CipherStreamWriter, CipherTransform, start_proxy
+
+from .corpora import CORPORA, LETTERS, split_points, split_text
+
+TEXT = CORPORA["long"].upper().encode("ascii")  # upper case, so decrypting the encrypted text gives it back
+# Lines of letters, each a multiple of the Hill matrix size long, without the J missing from the Playfair matrix
+LETTER_TEXT = LETTERS["long"].replace("J", "I").encode("ascii")
+LINES = [LETTER_TEXT[start : start + 6 * length] + b"\n" for start, length in [(0, 1), (6, 40), (30, 3)]]
+
+
+class RecordingWriter:
+    """
+    Stands in for an asyncio.StreamWriter, recording what is written to it.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.eof = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def can_write_eof(self):
+        return True
+
+    def write_eof(self):
+        self.eof = True
+
+
+def transform_lines(name: str, key, lines: list, direction: int = 1):
+    """
+    Encrypts or decrypts each line on its own, keeping its line ending. The Vigenere cipher transforms
+    the lines as one stream instead, since its key position is carried from one line to the next.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher.
+    -   lines (list): The lines, with their line endings.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+
+    Returns:
+    -   bytes: The transformed lines.
+    """
+
+    cipher = get_cipher(name, key)
+
+    if name == "vigenere":
+        data = b"".join(lines)
+        return bytes(cipher.encrypt_buffer(data) if direction == 1 else cipher.decrypt_buffer(data))
+
+    transform = cipher.encrypt if direction == 1 else cipher.decrypt
+    return b"".join(transform(line[:-1].decode()).encode() + b"\n" for line in lines)
+
+
+def read_stream(chunks: list, transform: CipherTransform):
+    """
+    Feeds chunks to a stream reader and reads them back through a CipherStreamReader.
+
+    Args:
+    -   chunks (list): The chunks of bytes.
+    -   transform (CipherTransform): The cipher state of the stream.
+
+    Returns:
+    -   bytes: The transformed stream.
+    """
+
+    async def read():
+        reader = asyncio.StreamReader()
+
+        for chunk in chunks:
+            reader.feed_data(chunk)
+
+        reader.feed_eof()
+        stream = CipherStreamReader(reader, transform)
+
+        return b"".join([data async for data in stream])
+
+    return asyncio.run(read())
+
+
+@pytest.mark.parametrize("name, key", [("additive", 3), ("affine", (5, 8)), ("atbash", None), ("vigenere", "LEMON")])
+def test_byte_streams_match_the_whole_buffer(name, key):
+    for lengths in split_points(len(TEXT), seed=0):
+        chunks = [chunk.encode() for chunk in split_text(TEXT.decode(), lengths)]
+        encrypted = read_stream(chunks, CipherTransform(name, key))
+
+        assert encrypted == bytes(get_cipher(name, key).encrypt_buffer(TEXT))
+        assert read_stream([encrypted], CipherTransform(name, key, -1)) == TEXT
+
+
+@pytest.mark.parametrize("offload_threshold", [1 << 20, 1], ids=["inline", "executor"])
+@pytest.mark.parametrize("name, key", [("hill", "GYBNQKURP"), ("playfair", "MONARCHY"), ("rail_fence", 3)])
+def test_line_streams_transform_each_line(name, key, offload_threshold):
+    transform = CipherTransform(name, key, offload_threshold=offload_threshold)
+
+    assert read_stream([b"".join(LINES)], transform) == transform_lines(name, key, LINES)
+
+
+def test_line_ciphers_are_not_read_in_chunks():
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"HELLO\n")
+        return await CipherStreamReader(reader, CipherTransform("hill", "GYBNQKURP")).read(3)
+
+    with pytest.raises(ValueError, match="whole lines"):
+        asyncio.run(read())
+
+
+@pytest.mark.parametrize("name, key", [("vigenere", "LEMON"), ("hill", "GYBNQKURP"), ("playfair", "MONARCHY")])
+def test_writers_transform_what_is_written(name, key):
+    data = b"".join(LINES) + b"NOLINEEND"
+    pieces = [piece.encode() for piece in split_text(data.decode(), split_points(len(data), seed=0)[2])]
+
+    async def write():
+        writer = RecordingWriter()
+        stream = CipherStreamWriter(writer, CipherTransform(name, key))
+
+        for piece in pieces:
+            stream.write(piece)
+            await stream.drain()
+
+        await stream.write_eof()
+        return writer
+
+    writer = asyncio.run(write())
+
+    # The last line has no line ending, and is transformed by write_eof()
+    assert writer.data == transform_lines(name, key, LINES + [b"NOLINEEND\n"])[:-1]
+    assert writer.eof
+
+
+def run_proxy(name: str, key, lines: list):
+    """
+    Sends lines through a proxy to an echo server, which records what it receives.
+
+    Args:
+    -   name (str): The name of the cipher.
+    -   key: The key of the cipher.
+    -   lines (list): The lines sent by the client.
+
+    Returns:
+    -   tuple: What the upstream server received, and what the client received back.
+    """
+
+    async def proxy():
+        received = bytearray()
+
+        async def echo(reader, writer):
+            received.extend(await reader.read())
+            writer.write(bytes(received))
+            writer.write_eof()
+            await writer.drain()
+            writer.close()
+
+        upstream = await asyncio.start_server(echo, "127.0.0.1", 0)
+        server = await start_proxy(name, key, *upstream.sockets[0].getsockname()[:2])
+
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.writelines(lines)
+        writer.write_eof()
+        await writer.drain()
+        echoed = await reader.read()
+        writer.close()
+
+        # Lets the proxy and the echo server finish their connections before they are closed
+        await asyncio.gather(*asyncio.all_tasks() - {asyncio.current_task()})
+
+        for listening in (server, upstream):
+            listening.close()
+            await listening.wait_closed()
+
+        return bytes(received), echoed
+
+    return asyncio.run(proxy())
+
+
+@pytest.mark.parametrize("name, key", [("vigenere", "LEMON"), ("hill", "GYBNQKURP")])
+def test_proxies_encrypt_upstream_and_decrypt_back(name, key):
+    received, echoed = run_proxy(name, key, LINES)
+
+    assert received == transform_lines(name, key, LINES)
+    assert echoed == transform_lines(name, key, received.splitlines(keepends=True), -1)
+
+
+def test_proxies_reject_invalid_keys():
+    with pytest.raises(ValueError):
+        asyncio.run(start_proxy("hill", "ABC", "127.0.0.1", 1))
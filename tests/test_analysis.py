@@ -0,0 +1,211 @@
+import numpy as np  # Import numpy to build the quadgram table of the Playfair tests
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher
+from classical_ciphers.analysis.additive import crack_additive, crack_additive_stream
+from classical_ciphers.analysis.affine import crack_affine, crack_affine_batch, crack_affine_stream
+from classical_ciphers.analysis.frequency import letter_values
+from classical_ciphers.analysis.hill import crack_hill_2x2, crack_hill_2x2_batch, crack_hill_known_plaintext
+from classical_ciphers.analysis.playfair import (
+    QUADGRAM_COUNT,
+    build_quadgram_table,
+    crack_playfair,
+    load_quadgram_table,
+    save_quadgram_table,
+)
+from classical_ciphers.analysis.vigenere import crack_vigenere
+
+from .corpora import ENGLISH, split_points, split_text
+
+METHODS = ["chi_squared", "log_likelihood"]
+
+# The letters of the English text, for the Hill cipher
+ENGLISH_LETTERS = "".join(char for char in ENGLISH.upper() if char.isalpha())
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("key", [7, 13])
+def test_additive_keys_are_recovered(key, method):
+    cipher_text = get_cipher("additive", key).encrypt(ENGLISH[:300])
+    ranking = crack_additive(cipher_text, method)
+
+    assert ranking[0][0] == key
+    assert sorted(shift for shift, _ in ranking) == list(range(26))
+
+    for lengths in split_points(len(cipher_text), seed=0):
+        assert crack_additive_stream(split_text(cipher_text, lengths), method, top=3) == ranking[:3]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_affine_keys_are_recovered(method):
+    cipher_text = get_cipher("affine", (5, 8)).encrypt(ENGLISH[:400])
+    ranking = crack_affine(cipher_text, method)
+
+    assert ranking[0][0] == (5, 8)
+    assert crack_affine_stream(split_text(cipher_text, split_points(len(cipher_text), seed=0)[2]), method) == ranking
+
+
+def test_affine_batches_match_each_text():
+    keys = [(5, 8), (7, 3), (25, 0), (1, 7)]  # Atbash is (25, 25), and an additive shift is (1, b)
+    cipher_texts = [get_cipher("affine", key).encrypt(ENGLISH[400 * i : 400 * (i + 1)]) for i, key in enumerate(keys)]
+    rankings = crack_affine_batch(cipher_texts, top=2)
+
+    assert [ranking[0][0] for ranking in rankings] == keys
+
+    # The batch scores every text with one matrix product, so only the last bits of the scores can differ
+    for ranking, cipher_text in zip(rankings, cipher_texts):
+        single = crack_affine(cipher_text, top=2)
+
+        assert [key for key, _ in ranking] == [key for key, _ in single]
+        assert [score for _, score in ranking] == pytest.approx([score for _, score in single])
+    assert crack_affine_batch([]) == []
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_vigenere_keys_are_recovered(method):
+    cipher_text = get_cipher("vigenere", "LEMONADE").encrypt(ENGLISH)
+    analysis = crack_vigenere(cipher_text, method=method)
+
+    assert (analysis["key"], analysis["period"]) == ("LEMONADE", 8)
+    assert len(analysis["key_scores"]) == 8
+    # The repeats are a multiple of 8 letters apart, which is also tallied for the divisors of 8
+    kasiski = analysis["kasiski"]
+    assert kasiski[8] > max(kasiski[period] for period in range(5, 16) if period != 8)
+    assert analysis["ioc"][8] > max(analysis["ioc"][period] for period in range(1, 8))
+    assert get_cipher("vigenere", analysis["key"]).decrypt(cipher_text) == ENGLISH.upper()
+
+
+def test_vigenere_keys_are_cut_to_their_repeating_part():
+    # A key that repeats itself, or a multiple of the key length, recovers the shortest key
+    analysis = crack_vigenere(get_cipher("vigenere", "LEMONLEMON").encrypt(ENGLISH))
+    assert (analysis["key"], analysis["period"]) == ("LEMON", 5)
+
+    analysis = crack_vigenere(get_cipher("vigenere", "LEMONADE").encrypt(ENGLISH), period=16)
+    assert (analysis["key"], analysis["period"]) == ("LEMONADE", 8)
+
+    with pytest.raises(ValueError, match="no letters"):
+        crack_vigenere("1234, 5678!")
+
+
+@pytest.mark.parametrize("key, length", [("GYBNQKURP", 9), ("GYBNQKURP", 300), ("HILL", 40)])
+def test_hill_keys_are_recovered_from_known_plain_text(key, length):
+    plain_text = ENGLISH_LETTERS[:length]
+    matrix_size = 3 if len(key) == 9 else 2
+
+    assert crack_hill_known_plaintext(plain_text, get_cipher("hill", key).encrypt(plain_text), matrix_size) == key
+
+
+def test_hill_known_plain_texts_are_solved_together():
+    # The blocks of the pairs are used together, even when no pair determines the key on its own
+    cipher = get_cipher("hill", "GYBNQKURP")
+    plain_texts = [ENGLISH_LETTERS[start : start + 6] for start in (0, 6, 12)]
+
+    assert crack_hill_known_plaintext(plain_texts, [cipher.encrypt(text) for text in plain_texts], 3) == "GYBNQKURP"
+
+    with pytest.raises(ValueError, match="do not determine the key"):
+        crack_hill_known_plaintext("A" * 12, cipher.encrypt("A" * 12), 3)
+
+    with pytest.raises(ValueError, match="the same length"):
+        crack_hill_known_plaintext(plain_texts[0], cipher.encrypt(plain_texts[0] + "ABC"), 3)
+
+    with pytest.raises(ValueError, match="one cipher text for each plain text"):
+        crack_hill_known_plaintext(plain_texts, [cipher.encrypt(plain_texts[0])], 3)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("key", ["HILL", "DDCF"])
+def test_2x2_hill_keys_are_recovered_from_cipher_text_alone(key, method):
+    cipher_text = get_cipher("hill", key).encrypt(ENGLISH_LETTERS[:600])
+    ranking = crack_hill_2x2(cipher_text, method, top=3)
+
+    assert ranking[0][0] == key
+    assert ranking[0][1] > ranking[1][1]  # the bigram log likelihood of the plain text, higher is better
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_2x2_hill_batches_match_each_text(workers, tmp_path):
+    keys = ["HILL", "DDCF", "HILL"]
+    cipher_texts = [get_cipher("hill", key).encrypt(ENGLISH_LETTERS[600 * i : 600 * (i + 1)]) for i, key in enumerate(keys)]
+    key_table_path = str(tmp_path / "keys.npy")
+
+    rankings = crack_hill_2x2_batch(cipher_texts, workers=workers, key_table_path=key_table_path)
+
+    assert [ranking[0][0] for ranking in rankings] == keys
+    assert rankings == [crack_hill_2x2(cipher_text, top=1) for cipher_text in cipher_texts]
+    assert crack_hill_2x2_batch([]) == []
+
+    with pytest.raises(ValueError, match="even number of letters"):
+        crack_hill_2x2(cipher_texts[0][:-1])
+
+
+def bigram_chain_table():
+    """
+    Builds a quadgram table from the bigrams of the English text, P(ab) * P(c | b) * P(d | c).
+
+    The English text is too short for its own quadgrams: most quadgrams of a partly right decryption
+    never appear in it, so every key but the right one scores like random text and the search has nothing
+    to climb. Its bigrams cover English well enough to score the partly right decryptions.
+
+    Returns:
+    -   numpy.ndarray: The float32 log10 probability of each quadgram.
+    """
+
+    values = letter_values(ENGLISH).astype(np.intp)
+    counts = np.bincount(values[:-1] * 26 + values[1:], minlength=26 * 26).reshape(26, 26) + 0.5
+    pairs = np.log10(counts / counts.sum())
+    following = np.log10(counts / counts.sum(axis=1, keepdims=True))
+
+    return (pairs[:, :, None, None] + following[None, :, :, None] + following[None, None]).reshape(-1).astype(np.float32)
+
+
+def test_quadgram_tables_are_saved_and_memory_mapped(tmp_path):
+    table = build_quadgram_table(ENGLISH)
+    path = str(tmp_path / "quadgrams.npy")
+
+    assert table.shape == (QUADGRAM_COUNT,)
+    assert table[(((19 * 26) + 7) * 26 + 4) * 26 + 17] > table.min()  # THER appears in the text
+    assert np.array_equal(build_quadgram_table(split_text(ENGLISH, split_points(len(ENGLISH), seed=0)[2])), table)
+
+    save_quadgram_table(table, path)
+    assert np.array_equal(load_quadgram_table(path), table)
+
+    np.save(path, table[:100])
+
+    with pytest.raises(ValueError, match="quadgram table must have"):
+        load_quadgram_table(path)
+
+    with pytest.raises(ValueError, match="at least four letters"):
+        build_quadgram_table("a b c")
+
+
+def test_playfair_keys_are_recovered(tmp_path):
+    plain_text = ENGLISH_LETTERS.replace("J", "I")[1700:2300]
+    cipher_text = get_cipher("playfair", "MONARCHY").encrypt(plain_text)
+    path = str(tmp_path / "quadgrams.npy")
+    save_quadgram_table(bigram_chain_table(), path)
+    progress = []
+
+    # With so short a text, about one restart in ten reaches the key in 20,000 mutations; the second of
+    # these two fixed seeds does
+    result = crack_playfair(cipher_text, path, restarts=2, iterations=20000, workers=1, seed=3, progress=progress.append)
+
+    # The key is found up to the rotations of the matrix, which encrypt the same way
+    assert get_cipher("playfair", result["key"]).encrypt(plain_text) == cipher_text
+    assert result["plain_text"].startswith("EREGAVETHEIRLIVESTHATXTHATNATION")  # with an X between the doubled T
+    assert (result["restarts"], result["evaluations"]) == (2, 2 * 20001)
+    assert [update["restarts"] for update in progress] == [1, 2]
+    assert progress[-1]["key"] == result["key"]
+
+
+def test_playfair_searches_need_a_bound_and_a_cipher_text():
+    table = bigram_chain_table()
+
+    with pytest.raises(ValueError, match="restarts or the time budget"):
+        crack_playfair("ABCD", table, restarts=None)
+
+    with pytest.raises(ValueError, match="even number of at least four letters"):
+        crack_playfair("ABC", table, restarts=1)
+
+    # A time budget stops the restarts at the deadline
+    result = crack_playfair("TGDLPQ" * 20, table, restarts=None, iterations=10**9, time_budget=0.2, workers=1, seed=0)
+    assert result["restarts"] >= 1 and result["elapsed"] < 5
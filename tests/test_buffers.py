@@ -0,0 +1,79 @@
+import io  # Import io for the binary streams
+
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher
+from classical_ciphers.batch import transform_stream
+
+from .corpora import CORPORA
+
+# The ciphers that transform buffers of bytes, and a key of each
+BYTE_CIPHERS = [("additive", 3), ("affine", (5, 8)), ("atbash", None), ("vigenere", "LEMON"), ("vigenere", "k" * 9000)]
+
+
+@pytest.mark.parametrize("name, key", BYTE_CIPHERS)
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_buffers_match_str(name, key, corpus):
+    cipher = get_cipher(name, key)
+    text = CORPORA[corpus]
+    data = text.encode("ascii")
+
+    for source in (data, bytearray(data), memoryview(data)):
+        assert bytes(cipher.encrypt_buffer(source)) == cipher.encrypt(text).encode("ascii")
+        assert bytes(cipher.decrypt_buffer(source)) == cipher.decrypt(text).encode("ascii")
+
+
+@pytest.mark.parametrize("name, key", BYTE_CIPHERS)
+def test_buffers_write_into_out_and_in_place(name, key):
+    cipher = get_cipher(name, key)
+    text = CORPORA["long"]
+    expected = cipher.encrypt(text).encode("ascii")
+
+    out = bytearray(len(text))
+    assert cipher.encrypt_buffer(text.encode("ascii"), out=out) is out
+    assert out == expected
+
+    data = bytearray(text.encode("ascii"))
+    cipher.encrypt_buffer(data, out=data)
+    assert data == expected
+
+    cipher.decrypt_buffer(memoryview(data), out=data)
+    assert data == cipher.decrypt(cipher.encrypt(text)).encode("ascii")
+
+
+@pytest.mark.parametrize("name, key", BYTE_CIPHERS)
+def test_buffers_accept_numpy_arrays(name, key):
+    np = pytest.importorskip("numpy")
+
+    cipher = get_cipher(name, key)
+    text = CORPORA["long"]
+    values = np.frombuffer(text.encode("ascii"), dtype=np.uint8).copy()
+
+    cipher.encrypt_buffer(values, out=values)
+
+    assert values.tobytes() == cipher.encrypt(text).encode("ascii")
+
+
+@pytest.mark.parametrize("name, key", BYTE_CIPHERS)
+def test_buffers_leave_non_ascii_bytes_unchanged(name, key):
+    cipher = get_cipher(name, key)
+    text = "Ωmega café " * 500
+    data = text.encode("utf-8")
+
+    assert bytes(cipher.encrypt_buffer(data)).decode("utf-8") == cipher.encrypt(text)
+
+
+def test_buffers_reject_an_out_of_the_wrong_length():
+    with pytest.raises(ValueError):
+        get_cipher("additive", 3).encrypt_buffer(b"HELLO", out=bytearray(4))
+
+
+@pytest.mark.parametrize("name, key", BYTE_CIPHERS)
+def test_chunked_buffers_match_str(name, key):
+    cipher = get_cipher(name, key)
+    text = CORPORA["long"] * 3
+    target = io.BytesIO()
+
+    transform_stream(name, key, 1, io.BytesIO(text.encode("ascii")), target, chunk_size=4099)
+
+    assert target.getvalue() == cipher.encrypt(text).encode("ascii")
@@ -0,0 +1,149 @@
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher
+from classical_ciphers.chain import chain_decrypt, chain_encrypt, compile_chain
+
+from .corpora import CORPORA, LETTERS, split_points, split_text
+
+# Chains of byte ciphers, with the number of steps left once they are fused
+BYTE_CHAINS = {
+    "monoalphabetic": ([("additive", 3), ("affine", (5, 8)), "atbash", "rot13"], 1),
+    "vigenere": ([("vigenere", "LEMON"), {"cipher": "vigenere", "key": "PEARS", "direction": -1}, ("additive", 4)], 1),
+    "mixed": (
+        [("vigenere", "LEMON"), {"cipher": "vigenere", "key": "LIME", "direction": -1}, ("affine", [3, 1]), "atbash"],
+        3,
+    ),
+}
+
+# Chains with the ciphers that are not fused, and their letters only text. Playfair comes first, since the
+# other stages can return the J missing from its matrix, and each chain decrypts what it encrypted.
+LETTER_CHAINS = {
+    "hill": [("additive", 3), "atbash", ("hill", "GYBNQKURP"), {"cipher": "rail_fence", "key": 3}],
+    "playfair": [("playfair", "MONARCHY"), ("additive", 3), {"cipher": "rail_fence", "key": 3}],
+}
+LETTER_TEXT = LETTERS["long"].replace("J", "I")[:600]
+
+
+def run_stages(stages: list, text: str, direction: int):
+    """
+    Runs each stage of a chain on its own, one after the other, or undoes them in the reverse order.
+
+    Args:
+    -   stages (list): The stages of the chain, in the forms accepted by compile_chain().
+    -   text (str): The text.
+    -   direction (int): 1 to encrypt, -1 to decrypt.
+
+    Returns:
+    -   str: The transformed text.
+    """
+
+    steps = []
+
+    for stage in stages:
+        if isinstance(stage, str):
+            stage = {"cipher": stage}
+        elif isinstance(stage, tuple):
+            stage = {"cipher": stage[0], "key": stage[1]}
+
+        name, key = stage["cipher"], stage.get("key")
+        name, key = ("additive", 13) if name == "rot13" else (name, tuple(key) if isinstance(key, list) else key)
+        steps.append((get_cipher(name, key), stage.get("direction", 1)))
+
+    if direction == -1:
+        steps = [(cipher, -stage_direction) for cipher, stage_direction in reversed(steps)]
+
+    for cipher, stage_direction in steps:
+        text = cipher.encrypt(text) if stage_direction == 1 else cipher.decrypt(text)
+
+    return text
+
+
+@pytest.mark.parametrize("text_name", CORPORA)
+@pytest.mark.parametrize("chain_name", BYTE_CHAINS)
+def test_fused_chains_match_the_stages(chain_name, text_name):
+    stages, steps = BYTE_CHAINS[chain_name]
+    text = CORPORA[text_name]
+    chain = compile_chain(*stages)
+
+    assert len(chain.plan) == steps
+    assert chain.encrypt(text) == chain_encrypt(text, stages) == run_stages(stages, text, 1)
+    assert chain.decrypt(text) == chain_decrypt(text, stages) == run_stages(stages, text, -1)
+
+
+@pytest.mark.parametrize("chain_name", BYTE_CHAINS)
+def test_fused_buffers_match_the_stages(chain_name):
+    stages, _ = BYTE_CHAINS[chain_name]
+    text = CORPORA["long"]
+    chain = compile_chain(*stages)
+    data = bytearray(text.encode("ascii"))
+
+    assert bytes(chain.encrypt_buffer(data)) == run_stages(stages, text, 1).encode("ascii")
+    assert bytes(chain.decrypt_buffer(data)) == run_stages(stages, text, -1).encode("ascii")
+
+    chain.encrypt_buffer(data, out=data)
+    assert data == run_stages(stages, text, 1).encode("ascii")
+
+
+@pytest.mark.parametrize("chain_name", ["mixed", *LETTER_CHAINS])
+def test_chained_streams_match_the_stages(chain_name):
+    if chain_name in LETTER_CHAINS:
+        stages, text = LETTER_CHAINS[chain_name], LETTER_TEXT
+    else:
+        stages, text = BYTE_CHAINS[chain_name][0], CORPORA["long"]
+
+    chain = compile_chain(*stages)
+    encrypted = run_stages(stages, text, 1)
+
+    # Playfair pads the text, so the cipher text is cut at its own boundaries
+    for lengths in split_points(len(text), seed=3):
+        assert "".join(chain.encrypt_stream(split_text(text, lengths))) == encrypted
+
+    for lengths in split_points(len(encrypted), seed=3):
+        assert "".join(chain.decrypt_stream(split_text(encrypted, lengths))) == run_stages(stages, encrypted, -1)
+
+
+@pytest.mark.parametrize("chain_name", LETTER_CHAINS)
+def test_unfused_stages_match_the_stages(chain_name):
+    stages = LETTER_CHAINS[chain_name]
+    chain = compile_chain(*stages)
+    encrypted = chain.encrypt(LETTER_TEXT)
+
+    assert encrypted == run_stages(stages, LETTER_TEXT, 1)
+    assert chain.decrypt(encrypted) == run_stages(stages, encrypted, -1)
+
+    with pytest.raises(ValueError, match="cannot transform a buffer"):
+        chain.encrypt_buffer(LETTER_TEXT.encode("ascii"))
+
+
+def test_plans_describe_the_fused_stages():
+    chain = compile_chain(*LETTER_CHAINS["hill"])
+
+    # Adding 3 then Atbash is x -> 25 - (x + 3) = 25 * x + 22, which is also its own inverse
+    assert chain.describe().splitlines() == [
+        "1. encrypt affine (25, 22) (stages 0, 1)",
+        "2. encrypt hill 'GYBNQKURP' (stages 2)",
+        "3. encrypt rail_fence 3 (stages 3)",
+    ]
+    assert chain.describe(-1).splitlines() == [
+        "1. decrypt rail_fence 3 (stages 3)",
+        "2. decrypt hill 'GYBNQKURP' (stages 2)",
+        "3. encrypt affine (25, 22) (stages 1, 0)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [[], [("additive",)], [{"cipher": "atbash", "direction": 2}], [("enigma", "KEY")], [("vigenere", "LEMON"), ("hill", "ABC")]],
+)
+def test_invalid_chains_raise_value_errors(stages):
+    with pytest.raises(ValueError):
+        compile_chain(*stages)
+
+
+def test_affine_stages_that_cannot_be_inverted_fail_to_decrypt():
+    chain = compile_chain(("affine", (13, 1)), "atbash")
+
+    assert chain.encrypt("HELLO") == run_stages([("affine", (13, 1)), "atbash"], "HELLO", 1)
+
+    with pytest.raises(ValueError, match="modular inverse"):
+        chain.decrypt("HELLO")
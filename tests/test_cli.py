@@ -0,0 +1,92 @@
+import os  # Import os for the directory of the repository
+import subprocess  # Import subprocess to run the command line interface
+import sys  # Import sys to run the same interpreter
+
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher
+
+from .corpora import CORPORA
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(*args, data: bytes = b""):
+    """
+    Runs python -m classical_ciphers with the given arguments and standard input.
+
+    Args:
+    -   args (str): The arguments.
+    -   data (bytes): The standard input.
+
+    Returns:
+    -   subprocess.CompletedProcess: The exit status, standard output and standard error.
+    """
+
+    return subprocess.run([sys.executable, "-m", "classical_ciphers", *args], cwd=REPO_DIR, input=data, capture_output=True)
+
+
+@pytest.mark.parametrize(
+    "name, key_text, key",
+    [("vigenere", "LEMON", "LEMON"), ("affine", "5,8", (5, 8)), ("atbash", None, None)],
+)
+def test_encrypt_streams_standard_input(name, key_text, key):
+    text = CORPORA["long"]
+    key_arguments = ["--key", key_text] if key_text is not None else []
+    result = run_cli("encrypt", "--algo", name, *key_arguments, "-q", "--chunk-size", "4099", data=text.encode())
+
+    assert result.returncode == 0
+    assert result.stderr == b""
+    assert result.stdout.decode() == get_cipher(name, key).encrypt(text)
+
+
+@pytest.mark.parametrize(
+    "name, key_text, key, lines",
+    [
+        ("playfair", "KEY", "KEY", ["hello", "WORLD", "", "BALLOON"]),
+        ("hill", "GYBNQKURP", "GYBNQKURP", ["ACT", "ACTION", "", "ABCDEFGHI"]),
+        ("rail_fence", "3", 3, ["WE ARE DISCOVERED", "FLEE AT ONCE", ""]),
+    ],
+)
+@pytest.mark.parametrize("direction", ["encrypt", "decrypt"])
+@pytest.mark.parametrize("ending", ["\n", "\r\n"])
+def test_text_ciphers_transform_each_line_of_standard_input(name, key_text, key, lines, direction, ending):
+    cipher = get_cipher(name, key)
+    transform = cipher.encrypt if direction == "encrypt" else cipher.decrypt
+    text = ending.join(lines) + ending
+    result = run_cli(direction, "--algo", name, "--key", key_text, "-q", data=text.encode())
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.decode() == "".join(transform(line) + ending for line in lines)
+
+
+def test_key_file_encrypts_each_record_with_its_key(tmp_path):
+    keys = tmp_path / "keys.txt"
+    keys.write_text("LEMON\nKEY\n")
+    result = run_cli("encrypt", "--algo", "vigenere", "--key-file", str(keys), "-q", data=b"attack at dawn\nhello\n")
+
+    assert result.stdout.decode() == f"{get_cipher('vigenere', 'LEMON').encrypt('attack at dawn')}\n{get_cipher('vigenere', 'KEY').encrypt('hello')}\n"
+
+
+@pytest.mark.parametrize("name, key", [("vigenere", ""), ("hill", ""), ("additive", ""), ("additive", "x")])
+def test_invalid_keys_are_reported_without_a_traceback(name, key):
+    result = run_cli("encrypt", "--algo", name, "--key", key, data=b"hi\n")
+
+    assert result.returncode == 2
+    assert b"Traceback" not in result.stderr
+    assert b"error:" in result.stderr
+
+
+@pytest.mark.parametrize("name", ["vigenere", "atbash", "hill"])
+def test_zigzag_is_rejected_for_other_ciphers(name):
+    result = run_cli("encrypt", "--algo", name, "--key", "GYBNQKURP", "--zigzag", data=b"HELLO\n")
+
+    assert result.returncode == 2
+    assert b"Traceback" not in result.stderr
+    assert b"--zigzag is only for the rail_fence cipher" in result.stderr
+
+
+def test_zigzag_encrypts_with_the_zigzag_rail_fence():
+    result = run_cli("encrypt", "--algo", "rail_fence", "--key", "3", "--zigzag", "-q", data=b"WEAREDISCOVERED\n")
+
+    assert result.stdout.decode() == get_cipher("rail_fence", 3, zigzag=True).encrypt("WEAREDISCOVERED") + "\n"
@@ -0,0 +1,94 @@
+import asyncio  # Import asyncio to run the daemon
+import threading  # Import threading to serve the daemon next to the blocking client
+
+import pytest  # Import pytest for the fixtures
+
+from classical_ciphers import daemon, get_cipher
+from classical_ciphers.daemon import CipherClient, DaemonError, start_daemon
+
+from .corpora import CORPORA
+
+
+@pytest.fixture(params=[1 << 30, 1000], ids=["inline", "executor"])
+def socket_path(request, tmp_path):
+    """
+    Serves a daemon in a thread, flushing the batches inline or in the executor.
+
+    Args:
+    -   request (pytest.FixtureRequest): The batch_threshold of the daemon.
+    -   tmp_path (pathlib.Path): The directory of the socket.
+
+    Returns:
+    -   str: The path of the Unix socket.
+    """
+
+    path = str(tmp_path / "ciphers.sock")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    daemon = asyncio.run_coroutine_threadsafe(start_daemon(path, batch_threshold=request.param), loop).result()
+    serving = asyncio.run_coroutine_threadsafe(daemon.serve_forever(), loop)
+
+    yield path
+
+    serving.cancel()
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result()  # lets the cancelled server close
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_batches_match_the_ciphers(socket_path):
+    text = CORPORA["long"][:300]  # short payloads, batched together, adding up to more than 1000 bytes
+    requests = [("vigenere", "LEMON", 1, text), ("vigenere", "LEMON", -1, text), ("additive", 3, 1, text.encode())]
+
+    with CipherClient(socket_path) as client:
+        results = client.transform_many(requests * 4)
+
+    assert results[:3] == [
+        get_cipher("vigenere", "LEMON").encrypt(text),
+        get_cipher("vigenere", "LEMON").decrypt(text),
+        get_cipher("additive", 3).encrypt(text).encode(),
+    ]
+    assert results == results[:3] * 4
+
+
+def test_invalid_keys_raise_daemon_errors(socket_path):
+    with CipherClient(socket_path) as client:
+        with pytest.raises(DaemonError):
+            client.encrypt("vigenere", "", "HELLO")
+
+        assert client.encrypt("vigenere", "LEMON", "HELLO") == get_cipher("vigenere", "LEMON").encrypt("HELLO")
+
+
+def test_large_payloads_match_the_ciphers(socket_path):
+    text = CORPORA["long"] * 4
+
+    with CipherClient(socket_path) as client:
+        assert client.encrypt("affine", (5, 8), text) == get_cipher("affine", (5, 8)).encrypt(text)
+
+
+def test_zigzag_is_rejected_for_other_ciphers(socket_path):
+    with CipherClient(socket_path, timeout=10) as client:
+        with pytest.raises(DaemonError, match="zigzag"):
+            client.encrypt("vigenere", "KEY", "hello", zigzag=True)
+
+        assert client.encrypt("rail_fence", 3, "HELLOWORLD", zigzag=True) == get_cipher(
+            "rail_fence", 3, zigzag=True
+        ).encrypt("HELLOWORLD")
+
+
+def test_failed_batches_send_an_error_to_each_request(socket_path, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("The batch failed")
+
+    monkeypatch.setattr(daemon, "transform_batch", fail)
+
+    with CipherClient(socket_path, timeout=10) as client:
+        for data in ("hello", CORPORA["long"][:300], CORPORA["long"]):  # inline or batched, and on its own
+            with pytest.raises(DaemonError, match="The batch failed"):
+                client.transform_many([("vigenere", "KEY", 1, data)] * 4)
+
+        with pytest.raises(DaemonError, match="The batch failed"):
+            client.transform_many([("vigenere", "KEY", 1, CORPORA["long"] * 60)])  # in shared memory
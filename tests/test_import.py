@@ -0,0 +1,67 @@
+import json  # Import json to read the results of the child process
+import os  # Import os for the directory of the repository
+import subprocess  # Import subprocess to import the package in a fresh interpreter
+import sys  # Import sys to run the same interpreter
+
+IMPORT_BUDGET = 0.02  # seconds, the same budget as benchmarks/bench_import.py
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the package in a fresh interpreter, uses the ciphers that do not need NumPy on short texts
+# and reports the import time and whether NumPy was loaded
+CHILD_CODE = """
+import json, sys, time
+
+start = time.perf_counter()
+import classical_ciphers
+import_time = time.perf_counter() - start
+
+numpy_after_import = "numpy" in sys.modules
+
+classical_ciphers.get_cipher("atbash").encrypt("Hello World")
+classical_ciphers.get_cipher("additive", 3).encrypt("Hello World")
+classical_ciphers.get_cipher("affine", (5, 8)).encrypt("Hello World")
+classical_ciphers.get_cipher("vigenere", "KEY").encrypt("Hello World")
+classical_ciphers.get_cipher("playfair", "KEY").encrypt("HelloWorld")
+classical_ciphers.get_cipher("rail_fence", 3).encrypt("Hello World")
+
+print(json.dumps({
+    "import_time": import_time,
+    "numpy_after_import": numpy_after_import,
+    "numpy_after_short_texts": "numpy" in sys.modules,
+}))
+"""
+
+
+def measure_import():
+    """
+    Imports the package in a fresh interpreter.
+
+    Returns:
+    -   dict: The import time in seconds and whether NumPy was loaded after the import and after the short texts.
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE], cwd=REPO_DIR, check=True, capture_output=True, text=True
+    ).stdout
+
+    return json.loads(output)
+
+
+def test_cold_import_is_within_budget_and_does_not_load_numpy():
+    results = [measure_import() for _ in range(3)]
+
+    # The fastest of a few interpreters, so a busy machine does not fail the test
+    assert min(result["import_time"] for result in results) < IMPORT_BUDGET
+    assert not any(result["numpy_after_import"] for result in results)
+    assert not any(result["numpy_after_short_texts"] for result in results)
+
+
+def test_cli_starts_without_numpy():
+    code = (
+        "import sys; from classical_ciphers.cli import build_parser; build_parser(); "
+        "print('numpy' in sys.modules)"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, check=True, capture_output=True, text=True)
+
+    assert output.stdout.strip() == "False"
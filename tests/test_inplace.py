@@ -0,0 +1,137 @@
+import mmap  # Import mmap for the allocation granularity of the windows
+import os  # Import os to break copy_file_range()
+
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher, inplace
+from classical_ciphers.inplace import decrypt_file_in_place, encrypt_file_in_place
+
+from .corpora import CORPORA
+
+WINDOW = mmap.ALLOCATIONGRANULARITY
+
+# The ciphers that transform a file in place, and a key of each
+IN_PLACE_CIPHERS = [("additive", 3), ("affine", (5, 8)), ("atbash", None), ("vigenere", "LEMON")]
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    """
+    Writes a text of a few windows and a partial one to a file.
+
+    Returns:
+    -   tuple: The path of the file and its bytes.
+    """
+
+    data = (CORPORA["long"] * (5 * WINDOW // len(CORPORA["long"]) + 1))[: 5 * WINDOW + 123].encode("ascii")
+    path = tmp_path / "data.txt"
+    path.write_bytes(data)
+
+    return path, data
+
+
+def interrupt_window(monkeypatch, number: int):
+    """
+    Makes the given window fail half way through, after changing its first bytes, like a crash would.
+
+    Args:
+    -   monkeypatch (pytest.MonkeyPatch): Replaces the transform of the windows.
+    -   number (int): The number of the window that is interrupted (1 for the first one).
+    """
+
+    transform = inplace.transform_buffer_in_place
+    windows = 0
+
+    def interrupted(cipher, name, direction, window, phase):
+        nonlocal windows
+        windows += 1
+
+        if windows == number:
+            window[:100] = b"#" * 100
+            raise KeyboardInterrupt
+
+        return transform(cipher, name, direction, window, phase)
+
+    monkeypatch.setattr(inplace, "transform_buffer_in_place", interrupted)
+
+
+@pytest.mark.parametrize("name, key", IN_PLACE_CIPHERS)
+def test_files_match_the_whole_buffer(name, key, text_file):
+    path, data = text_file
+    cipher = get_cipher(name, key)
+    offsets = []
+
+    assert encrypt_file_in_place(name, key, str(path), WINDOW, progress=lambda offset, _: offsets.append(offset)) == len(data)
+    assert path.read_bytes() == bytes(cipher.encrypt_buffer(data))
+    assert offsets == [WINDOW * number for number in range(1, 6)] + [len(data)]
+
+    decrypt_file_in_place(name, key, str(path), WINDOW * 2)
+    assert path.read_bytes() == bytes(cipher.decrypt_buffer(cipher.encrypt_buffer(data)))
+
+
+@pytest.mark.parametrize("window", [1, 3, 6])
+def test_resume_after_an_interrupted_window(window, text_file, tmp_path, monkeypatch):
+    path, data = text_file
+    checkpoint = str(tmp_path / "checkpoint")
+
+    with monkeypatch.context() as patch:
+        interrupt_window(patch, window)
+
+        with pytest.raises(KeyboardInterrupt):
+            encrypt_file_in_place("vigenere", "LEMON", str(path), WINDOW, checkpoint_path=checkpoint)
+
+    assert os.path.exists(checkpoint) == (window > 1)
+    assert os.path.exists(f"{checkpoint}.journal")
+
+    resumed = encrypt_file_in_place("vigenere", "LEMON", str(path), WINDOW, checkpoint_path=checkpoint, resume=True)
+
+    assert resumed == len(data) - WINDOW * (window - 1)
+    assert path.read_bytes() == bytes(get_cipher("vigenere", "LEMON").encrypt_buffer(data))
+    assert sorted(os.listdir(tmp_path)) == ["data.txt"]
+
+
+def test_resume_without_copy_file_range(text_file, tmp_path, monkeypatch):
+    path, data = text_file
+    checkpoint = str(tmp_path / "checkpoint")
+
+    def unsupported(*args):
+        raise OSError("copy_file_range is not supported")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported)
+
+    with monkeypatch.context() as patch:
+        interrupt_window(patch, 4)
+
+        with pytest.raises(KeyboardInterrupt):
+            encrypt_file_in_place("additive", 3, str(path), WINDOW, checkpoint_path=checkpoint)
+
+    encrypt_file_in_place("additive", 3, str(path), WINDOW, checkpoint_path=checkpoint, resume=True)
+
+    assert path.read_bytes() == bytes(get_cipher("additive", 3).encrypt_buffer(data))
+
+
+def test_checkpoints_are_not_resumed_by_mistake(text_file, tmp_path, monkeypatch):
+    path, _ = text_file
+    checkpoint = str(tmp_path / "checkpoint")
+
+    with monkeypatch.context() as patch:
+        interrupt_window(patch, 2)
+
+        with pytest.raises(KeyboardInterrupt):
+            encrypt_file_in_place("vigenere", "LEMON", str(path), WINDOW, checkpoint_path=checkpoint)
+
+    with pytest.raises(ValueError, match="already exists"):
+        encrypt_file_in_place("vigenere", "LEMON", str(path), WINDOW, checkpoint_path=checkpoint)
+
+    with pytest.raises(ValueError, match="another cipher, key or direction"):
+        encrypt_file_in_place("vigenere", "LIME", str(path), WINDOW, checkpoint_path=checkpoint, resume=True)
+
+
+@pytest.mark.parametrize("name, key", [("hill", "GYBNQKURP"), ("affine", (13, 1))])
+def test_invalid_transforms_leave_the_file_unchanged(name, key, text_file):
+    path, data = text_file
+
+    with pytest.raises(ValueError):
+        decrypt_file_in_place(name, key, str(path))
+
+    assert path.read_bytes() == data
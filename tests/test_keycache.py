@@ -0,0 +1,160 @@
+import pytest  # Import pytest for the fixtures
+
+from classical_ciphers import get_cipher
+from classical_ciphers.keycache import (
+    KeyScheduleCache,
+    configure_key_cache,
+    estimate_size,
+    key_cache_stats,
+    key_schedule_cache,
+)
+
+from .corpora import CORPORA, LETTERS
+
+
+@pytest.fixture
+def small_cache():
+    """
+    Empties the shared key schedule cache and bounds it to 1 MiB during a test.
+
+    Returns:
+    -   KeyScheduleCache: The shared cache.
+    """
+
+    bounds = (key_schedule_cache.max_entries, key_schedule_cache.max_bytes)
+    key_schedule_cache.clear()
+    configure_key_cache(max_bytes=1 << 20)
+
+    yield key_schedule_cache
+
+    key_schedule_cache.clear()
+    configure_key_cache(*bounds)
+
+
+def test_byte_bound_holds_after_the_ciphers_are_used(small_cache):
+    text = CORPORA["long"][:5000]
+    playfair_text = LETTERS["long"].replace("J", "I")[:5000]
+
+    for number in range(200):
+        key = "".join("KLMNOPQRST"[int(digit)] for digit in f"{number:04d}")
+        cipher = get_cipher("vigenere", key)
+        cipher.decrypt(cipher.encrypt(text))
+
+        cipher = get_cipher("playfair", key)
+        cipher.decrypt(cipher.encrypt(playfair_text))
+
+        cipher = get_cipher("hill", "GYBNQKURP")
+        cipher.decrypt(cipher.encrypt(LETTERS["long"][:999]))
+
+    stats = key_cache_stats()
+
+    assert 0 < stats["bytes"] <= small_cache.max_bytes
+    assert stats["evictions"] > 0
+
+    # The recorded size of each entry is still the size of its schedule, so nothing grew unaccounted
+    for schedule, size, _, _ in list(small_cache.entries.values()):
+        assert estimate_size(schedule) == size
+
+    assert stats["bytes"] == sum(size for _, size, _, _ in small_cache.entries.values())
+
+
+def build_schedule(size: int):
+    """
+    Builds a stand-in schedule, a list holding a buffer of the given size.
+
+    Args:
+    -   size (int): The size of the buffer, in bytes.
+
+    Returns:
+    -   list: The schedule.
+    """
+
+    return [bytes(size)]
+
+
+def test_entry_bound_evicts_the_least_recently_used():
+    cache = KeyScheduleCache(max_entries=3)
+
+    for key in "ABC":
+        cache.get("test", key, build_schedule, 10)
+
+    first = cache.get("test", "A", build_schedule, 10)  # a hit, so B is now the least recently used
+    cache.get("test", "D", build_schedule, 10)
+
+    assert [key for _, key in cache.entries] == ["C", "A", "D"]
+    assert cache.get("test", "A", build_schedule, 10) is first
+
+    stats = cache.stats()
+
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 4, 1, 3)
+    assert stats["namespaces"]["test"]["entries"] == 3
+
+
+def test_byte_bound_evicts_until_the_entries_fit():
+    size = estimate_size(build_schedule(1000))
+    cache = KeyScheduleCache(max_bytes=size * 5 // 2)
+
+    for key in "ABCD":
+        cache.get("test", key, build_schedule, 1000)
+
+    assert [key for _, key in cache.entries] == ["C", "D"]
+    assert cache.stats()["bytes"] == cache.total_bytes == 2 * size
+
+    # A schedule larger than the whole cache is returned, but not kept
+    assert len(cache.get("test", "E", build_schedule, 10000)[0]) == 10000
+    assert [key for _, key in cache.entries] == ["C", "D"]
+    assert cache.stats()["oversized"] == 1
+
+    cache.configure(max_bytes=size)
+
+    assert [key for _, key in cache.entries] == ["D"]
+    assert cache.stats()["evictions"] == 3
+
+
+def test_grown_schedules_are_measured_again():
+    size = estimate_size(build_schedule(1000))
+    cache = KeyScheduleCache(max_bytes=size * 3)
+
+    for key in "ABC":
+        cache.get("test", key, build_schedule, 1000)
+
+    # C builds more state after it was cached, so the least recently used A no longer fits
+    schedule = cache.get("test", "C", build_schedule, 1000)
+    schedule.append(bytes(500))
+    cache.remeasure(schedule)
+
+    assert [key for _, key in cache.entries] == ["B", "C"]
+    assert cache.total_bytes == size + estimate_size(schedule)
+
+    # Once C is larger than the whole cache, it is dropped, and schedules not in the cache are ignored
+    schedule.append(bytes(3 * size))
+    cache.remeasure(schedule)
+    cache.remeasure(build_schedule(1000))
+
+    stats = cache.stats()
+
+    assert [key for _, key in cache.entries] == ["B"]
+    assert (stats["bytes"], stats["oversized"], stats["evictions"]) == (size, 1, 1)
+
+
+def test_failed_builds_and_cleared_entries():
+    cache = KeyScheduleCache(max_entries=0)
+
+    assert cache.get("test", "A", build_schedule, 10) == [bytes(10)]
+    assert not cache.entries  # a cache without entries only counts the misses
+
+    cache.configure(max_entries=10)
+
+    with pytest.raises(ValueError):
+        cache.get("test", "B", build_schedule, -1)
+
+    cache.get("test", "A", build_schedule, 10)
+    cache.get("other", "A", build_schedule, 10)
+    cache.clear("test")
+
+    assert list(cache.entries) == [("other", "A")]
+    assert cache.stats()["misses"] == 3  # the failed build is neither cached nor counted
+    assert cache.stats()["namespaces"]["test"]["entries"] == 0
+
+    with pytest.raises(ValueError):
+        cache.configure(max_bytes=-1)
@@ -0,0 +1,42 @@
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import metrics, vigenere
+
+
+@pytest.fixture
+def recorded():
+    """
+    Records the calls of the cipher modules during a test.
+
+    Returns:
+    -   module: The metrics module, enabled and reset.
+    """
+
+    metrics.enable_metrics()
+    metrics.reset_metrics()
+
+    yield metrics
+
+    metrics.disable_metrics()
+    metrics.reset_metrics()
+
+
+@pytest.mark.parametrize(
+    "size, label",
+    [
+        (0, "0"), (1, "1"), (16, "16"), (17, "17-32"), (32, "17-32"), (33, "33-64"), (1000, "513-1024"),
+        (1 << 20, "524289-1048576"),
+    ],
+)
+def test_key_size_label_buckets_by_powers_of_two(size, label):
+    assert metrics.key_size_label(size) == label
+
+
+def test_long_keys_share_a_bounded_number_of_series(recorded):
+    for length in range(1, 2001):
+        vigenere.vigenere_encrypt("HELLO", "K" * length)
+
+    labels = {call["key_size"] for call in recorded.metrics_snapshot()["calls"]}
+
+    assert len(labels) == metrics.EXACT_KEY_SIZES + 7  # 17-32, 33-64, ..., 1025-2048
+    assert sum(call["calls"] for call in recorded.metrics_snapshot()["calls"]) == 2000
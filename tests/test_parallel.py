@@ -0,0 +1,81 @@
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher, hill
+from classical_ciphers.parallel import (
+    parallel_decrypt,
+    parallel_decrypt_file,
+    parallel_encrypt,
+    parallel_encrypt_file,
+    shard_bounds,
+)
+
+from .corpora import CORPORA, LETTERS
+
+# The ciphers that transform buffers of bytes, and a key of each
+BYTE_CIPHERS = [("additive", 3), ("affine", (5, 8)), ("atbash", None), ("vigenere", "LEMON"), ("vigenere", "k" * 9000)]
+
+
+@pytest.mark.parametrize("name, key", BYTE_CIPHERS)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_shards_match_the_whole_buffer(name, key, workers):
+    cipher = get_cipher(name, key)
+    data = (CORPORA["long"] * 3).encode("ascii")
+
+    encrypted = parallel_encrypt(name, key, data, shard_size=4099, workers=workers)
+
+    assert encrypted == bytes(cipher.encrypt_buffer(data))
+    assert parallel_decrypt(name, key, encrypted, shard_size=4099, workers=workers) == bytes(
+        cipher.decrypt_buffer(encrypted)
+    )
+
+
+@pytest.mark.parametrize("key", ["DDCF", "GYBNQKURP"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_hill_shards_match_hill_encrypt(key, workers):
+    size = round(len(key) ** 0.5)
+    text = LETTERS["long"][: len(LETTERS["long"]) - len(LETTERS["long"]) % size]
+
+    encrypted = parallel_encrypt("hill", key, text.encode("ascii"), shard_size=1000, workers=workers)
+
+    assert encrypted.decode("ascii") == hill.hill_encrypt(key, text)[0]
+    assert parallel_decrypt("hill", key, encrypted, shard_size=1000, workers=workers).decode("ascii") == (
+        hill.hill_decrypt(key, encrypted.decode("ascii"))[0]
+    )
+
+
+def test_files_match_the_whole_buffer(tmp_path):
+    data = (CORPORA["long"] * 2).encode("ascii")
+    plain_path, cipher_path, decrypted_path = tmp_path / "plain", tmp_path / "cipher", tmp_path / "decrypted"
+    plain_path.write_bytes(data)
+
+    parallel_encrypt_file("vigenere", "LEMON", str(plain_path), str(cipher_path), shard_size=5000, workers=2)
+    parallel_decrypt_file("vigenere", "LEMON", str(cipher_path), str(decrypted_path), shard_size=5000, workers=2)
+
+    cipher = get_cipher("vigenere", "LEMON")
+    assert cipher_path.read_bytes() == bytes(cipher.encrypt_buffer(data))
+    assert decrypted_path.read_bytes() == bytes(cipher.decrypt_buffer(cipher.encrypt_buffer(data)))
+
+
+def test_empty_data_and_files(tmp_path):
+    (tmp_path / "empty").write_bytes(b"")
+    parallel_encrypt_file("atbash", None, str(tmp_path / "empty"), str(tmp_path / "out"))
+
+    assert parallel_encrypt("atbash", None, b"") == b""
+    assert (tmp_path / "out").read_bytes() == b""
+
+
+@pytest.mark.parametrize(
+    "name, key, data",
+    [("rail_fence", 3, b"HELLO"), ("hill", "GYBNQKURP", b"ABCD"), ("affine", (13, 1), b"HELLO")],
+)
+def test_invalid_transforms_are_rejected(name, key, data):
+    with pytest.raises(ValueError):
+        parallel_decrypt(name, key, data)
+
+
+def test_hill_shards_start_on_block_boundaries():
+    bounds = shard_bounds(100, 10, alignment=3)
+
+    assert all(start % 3 == 0 for start, _ in bounds)
+    assert bounds[-1][1] == 100
+    assert [stop for _, stop in bounds[:-1]] == [start for start, _ in bounds[1:]]
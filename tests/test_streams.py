@@ -0,0 +1,111 @@
+import io  # Import io to stream from a text file object
+
+import pytest  # Import pytest to parametrize the tests
+
+from classical_ciphers import get_cipher, playfair, rail_fence, vigenere
+from classical_ciphers.playfair import initialize_text, iterate_digraphs
+
+from .corpora import CORPORA, LETTERS, split_points, split_text
+
+# The ciphers whose streams take any text, and a key of each
+TEXT_CIPHERS = [("additive", 3), ("affine", (5, 8)), ("atbash", None), ("vigenere", "LEMON")]
+
+
+@pytest.mark.parametrize("name, key", TEXT_CIPHERS)
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_text_streams_match_one_shot(name, key, corpus):
+    cipher = get_cipher(name, key)
+    text = CORPORA[corpus]
+
+    for lengths in split_points(len(text), seed=len(text)):
+        chunks = split_text(text, lengths)
+
+        assert "".join(cipher.encrypt_stream(chunks)) == cipher.encrypt(text)
+        assert "".join(cipher.decrypt_stream(chunks)) == cipher.decrypt(text)
+
+
+def test_streams_read_text_files():
+    cipher = get_cipher("vigenere", "LEMON")
+    text = CORPORA["long"]
+
+    assert "".join(cipher.encrypt_stream(io.StringIO(text))) == cipher.encrypt(text)
+
+
+def test_vigenere_stream_carries_a_book_length_key():
+    key = CORPORA["long"].replace(" ", "x").replace("\n", "y")
+    text = CORPORA["long"] * 3
+    chunks = split_text(text, [7, 4095, 4097, 30000, 100000])
+
+    assert "".join(vigenere.vigenere_encrypt_stream(chunks, key)) == vigenere.vigenere_encrypt(text, key)
+
+
+@pytest.mark.parametrize("key", ["GYBNQKURP", "DDCF"])
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_hill_streams_match_one_shot(key, corpus):
+    cipher = get_cipher("hill", key)
+    size = cipher.matrix_size
+    text = LETTERS[corpus][: len(LETTERS[corpus]) - len(LETTERS[corpus]) % size]
+
+    if not text:
+        return
+
+    for lengths in split_points(len(text), seed=1):
+        chunks = split_text(text, lengths)
+
+        assert "".join(cipher.encrypt_stream(chunks)) == cipher.encrypt(text)
+        assert "".join(cipher.decrypt_stream(chunks)) == cipher.decrypt(text)
+
+
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_playfair_streams_match_one_shot(corpus):
+    text = LETTERS[corpus].replace("J", "I")
+
+    for lengths in split_points(len(text), seed=2):
+        chunks = split_text(text, lengths)
+
+        assert "".join(playfair.playfair_encrypt_stream(chunks, "MONARCHY")) == playfair.playfair_encrypt(text, "MONARCHY")
+        assert "".join(playfair.playfair_decrypt_stream(chunks, "MONARCHY")) == playfair.playfair_decrypt(text, "MONARCHY")
+
+
+@pytest.mark.parametrize("text", ["BALLOON" * 50, "LL" * 20, "ABBA", "XX", "AABBCC", "A"])
+def test_playfair_digraphs_match_the_original_at_the_end_of_the_text(text):
+    for lengths in split_points(len(text), seed=3):
+        assert list(iterate_digraphs(split_text(text, lengths))) == initialize_text(text)
+
+
+def test_playfair_bounded_memory_inserts_a_filler_in_every_doubled_pair():
+    text = "BALLOON" * 50
+    pairs = list(iterate_digraphs([text], bounded_memory=True))
+
+    assert all(pair[0] != pair[1] for pair in pairs)
+    assert pairs[: len(text) // 4] == initialize_text(text)[: len(text) // 4]
+
+    for lengths in split_points(len(text), seed=4):
+        assert list(iterate_digraphs(split_text(text, lengths), bounded_memory=True)) == pairs
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3, 7])
+@pytest.mark.parametrize("zigzag", [False, True])
+def test_rail_fence_streams_match_one_shot_within_a_frame(depth, zigzag):
+    text = CORPORA["long"]
+    cipher_text = rail_fence.rail_encrypt(text, depth, zigzag)
+
+    for lengths in split_points(len(text), seed=5):
+        chunks = split_text(text, lengths)
+        encrypted = "".join(rail_fence.rail_encrypt_stream(chunks, depth, frame_size=len(text), zigzag=zigzag))
+
+        assert encrypted == cipher_text
+        assert "".join(rail_fence.rail_decrypt_stream([encrypted], depth, len(text), zigzag)) == rail_fence.rail_decrypt(
+            cipher_text, depth, zigzag
+        )
+
+
+def test_rail_fence_streams_encrypt_each_frame():
+    text = CORPORA["long"].replace(" ", "").upper()
+    frames = [text[start : start + 1000] for start in range(0, len(text), 1000)]
+
+    for lengths in split_points(len(text), seed=6):
+        encrypted = "".join(rail_fence.rail_encrypt_stream(split_text(text, lengths), 5, frame_size=1000))
+
+        assert encrypted == "".join(rail_fence.rail_encrypt(frame, 5) for frame in frames)
+        assert "".join(rail_fence.rail_decrypt_stream([encrypted], 5, frame_size=1000)) == text